@@ -0,0 +1,72 @@
+"""
+Frame time of multi-ball arenas as the number of balls grows.
+
+Plays the party preset (1200x675 with 6 obstacles) with N balls and reports
+the time per physics tick with the uniform grid broadphase, the same with
+every pair tested instead, and the time to render a frame offscreen with the
+surface renderer. The last column is a full frame (one tick and one render)
+against the 16.7 ms budget of 60 frames per second. Pair testing grows with
+the square of the ball count, so it is only timed for a few ticks.
+
+Run from the repository root with the package installed (pip install -e .):
+
+    python benchmarks/bench_arena.py [TICKS]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from pongularity.config import PRESETS
+from pongularity.game import PongularityGame
+
+COUNTS = (1, 10, 100, 250, 500, 1000, 2000)
+BRUTE_FORCE_TICKS = 10
+
+
+def tick_time(game, ticks):
+    score = game.score
+    start = time.perf_counter()
+    for _ in range(ticks):
+        # Keep the match going however many balls score
+        score["left"] = score["right"] = 0
+        game.step()
+    return (time.perf_counter() - start) / ticks
+
+
+def measure(balls, ticks):
+    config = PRESETS["party"].replace(balls=balls)
+    game = PongularityGame(surface=pygame.Surface((config.width, config.height)), config=config)
+    game.reset_game()
+    # Let the serves spread out and collide before timing
+    tick_time(game, 120)
+    grid = tick_time(game, ticks)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        game.render(0.5)
+    render = (time.perf_counter() - start) / ticks
+
+    brute = None
+    if game.arena is not None:
+        game.arena.broadphase = False
+        brute = tick_time(game, BRUTE_FORCE_TICKS)
+    return grid, brute, render
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pygame.font.init()
+    print(f"{'balls':>6}{'grid ms':>10}{'pairs ms':>10}{'speedup':>9}{'render ms':>11}{'frame ms':>10}{'of 60 fps':>11}")
+    for balls in COUNTS:
+        grid, brute, render = measure(balls, ticks)
+        frame = grid + render
+        pairs = f"{brute * 1e3:>10.2f}{brute / grid:>8.1f}x" if brute is not None else f"{'classic':>10}{'':>9}"
+        print(f"{balls:>6}{grid * 1e3:>10.3f}{pairs}{render * 1e3:>11.2f}{frame * 1e3:>10.2f}"
+              f"{frame * 60 * 100:>10.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Frames per second of BatchPong against stepping PongularityEngine one by one.
+
+Run from the repository root with the package installed (pip install -e .):
+
+    python benchmarks/bench_batch.py [N]
+"""
+import sys
+import time
+import numpy as np
+from pongularity.batch import BatchPong
+from pongularity.engine import PongularityEngine
+
+
+def bench_engine(ticks=20000):
+    engine = PongularityEngine()
+    engine.reset_game()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        engine.update()
+        if engine.game_state != "playing":
+            engine.reset_game()
+    return ticks / (time.perf_counter() - start)
+
+
+def bench_batch(n, ticks=2000):
+    batch = BatchPong(n)
+    batch.reset_game()
+    rng = np.random.default_rng(0)
+    speed = batch.PADDLE_SPEED
+    left = rng.choice([-speed, 0, speed], size=n).astype(np.float64)
+    right = rng.choice([-speed, 0, speed], size=n).astype(np.float64)
+    start = time.perf_counter()
+    for tick in range(ticks):
+        batch.step(left, right)
+        if tick % 500 == 0:
+            batch.reset_game(batch.game_state != 1)
+    return n * ticks / (time.perf_counter() - start)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    print(f"PongularityEngine.update(): {bench_engine():>14,.0f} frames/s")
+    print(f"BatchPong.step() N={n}: {bench_batch(n):>14,.0f} frames/s")
+
+
+if __name__ == "__main__":
+    main()
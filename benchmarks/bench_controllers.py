@@ -0,0 +1,83 @@
+"""
+Decision cost of the CPU controllers, and CPU-vs-CPU throughput with batched policies.
+
+The first table plays each controller against a tracker on one engine and
+reports its mean and worst time per decision against its budget. The second
+plays N policy-vs-policy matches, once with a PolicyController per paddle per
+engine and once with a BatchPolicyController per side on BatchPong.
+
+Run from the repository root with the package installed (pip install -e .[batch]):
+
+    python benchmarks/bench_controllers.py [N]
+"""
+import sys
+import time
+from pongularity.batch import BatchPong
+from pongularity.controllers import TrackerController, make_controller
+from pongularity.engine import PongularityEngine
+from pongularity.policy import BatchPolicyController, MLPPolicy, PolicyController
+
+
+def decision_costs(ticks=20000):
+    print(f"{'controller':<12}{'mean us':>10}{'max us':>10}{'budget us':>11}{'overruns':>10}")
+    for kind in ("tracker", "predictor", "policy"):
+        controller = make_controller(kind, seed=1)
+        opponent = TrackerController(seed=2)
+        engine = PongularityEngine()
+        engine.reset_game()
+        for _ in range(ticks):
+            if engine.game_state != "playing":
+                engine.reset_game()
+            engine.left_paddle.dy = controller.control(engine, "left")
+            engine.right_paddle.dy = opponent.control(engine, "right")
+            engine.update()
+        stats = controller.stats()
+        print(f"{kind:<12}{stats['mean'] * 1e6:>10.2f}{stats['max'] * 1e6:>10.2f}"
+              f"{stats['budget'] * 1e6:>11.0f}{stats['overruns']:>10}")
+
+
+def scalar_frames(n, policy, ticks):
+    engines = [PongularityEngine() for _ in range(n)]
+    controllers = [(PolicyController(policy, seed=2 * i), PolicyController(policy, seed=2 * i + 1))
+                   for i in range(n)]
+    for engine in engines:
+        engine.reset_game()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for engine, (left, right) in zip(engines, controllers):
+            engine.left_paddle.dy = left.control(engine, "left")
+            engine.right_paddle.dy = right.control(engine, "right")
+            engine.update()
+    return n * ticks / (time.perf_counter() - start)
+
+
+def batch_frames(n, policy, ticks):
+    batch = BatchPong(n)
+    batch.reset_game()
+    left = BatchPolicyController(policy, seed=1)
+    right = BatchPolicyController(policy, seed=2)
+    start = time.perf_counter()
+    for tick in range(ticks):
+        batch.step(left.control(batch, "left"), right.control(batch, "right"))
+        if tick % 500 == 0:
+            batch.reset_game(batch.game_state != 1)
+    elapsed = time.perf_counter() - start
+    return n * ticks / elapsed, left.stats()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    decision_costs()
+
+    policy = MLPPolicy.random(hidden=(32, 32), seed=0)
+    scalar = scalar_frames(64, policy, 200)
+    batched, stats = batch_frames(n, policy, 1000)
+    print(f"\nMLP 6-32-32-1 policy vs itself, frames/s including both decisions:")
+    print(f"one PolicyController per paddle:     {scalar:>14,.0f}")
+    print(f"BatchPolicyController, N={n:<6}    {batched:>14,.0f}  ({batched / scalar:.0f}x)")
+    print(f"batched decision for all {n} games: mean {stats['mean'] * 1e6:.0f} us, "
+          f"max {stats['max'] * 1e6:.0f} us, {stats['overruns']} over the {stats['budget'] * n * 1e6:.0f} us budget")
+
+
+if __name__ == "__main__":
+    main()
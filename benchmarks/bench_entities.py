@@ -0,0 +1,134 @@
+"""
+Per-frame cost, instance size and copy cost of slotted entities against dicts.
+
+The dict numbers come from DictEngine below, a frozen copy of the update loop
+as it was before the paddles and ball moved to pongularity.entities.
+
+Run from the repository root with the package installed (pip install -e .):
+
+    python benchmarks/bench_entities.py
+"""
+import sys
+import timeit
+from pongularity.engine import PongularityEngine
+
+
+class DictEngine(PongularityEngine):
+    """PongularityEngine with the original dict-based game objects."""
+
+    def __init__(self):
+        super().__init__()
+        self.left_paddle = self.left_paddle.as_dict()
+        self.right_paddle = self.right_paddle.as_dict()
+        self.ball = self.ball.as_dict()
+
+    def reset_ball(self):
+        self.ball["resetting"] = False
+        self.ball["x"] = self.WIDTH / 2
+        self.ball["y"] = self.HEIGHT / 2
+        speed_sign_x = 1 if self.ball["dx"] > 0 else -1
+        speed_sign_y = 1 if self.ball["dy"] > 0 else -1
+        self.ball["dx"] = self.BALL_SPEED * speed_sign_x
+        self.ball["dy"] = self.BALL_SPEED * speed_sign_y
+
+    def reset_game(self):
+        self.score["left"] = 0
+        self.score["right"] = 0
+        self.left_paddle["y"] = self.HEIGHT / 2 - self.PADDLE_HEIGHT / 2
+        self.right_paddle["y"] = self.HEIGHT / 2 - self.PADDLE_HEIGHT / 2
+        self.reset_ball()
+        self.game_state = "playing"
+
+    def update(self):
+        self.tick += 1
+        if self.game_state == "playing":
+            self.left_paddle["y"] += self.left_paddle["dy"]
+            self.right_paddle["y"] += self.right_paddle["dy"]
+            if self.left_paddle["y"] < self.GRID:
+                self.left_paddle["y"] = self.GRID
+            elif self.left_paddle["y"] > self.MAX_PADDLE_Y:
+                self.left_paddle["y"] = self.MAX_PADDLE_Y
+            if self.right_paddle["y"] < self.GRID:
+                self.right_paddle["y"] = self.GRID
+            elif self.right_paddle["y"] > self.MAX_PADDLE_Y:
+                self.right_paddle["y"] = self.MAX_PADDLE_Y
+            if not self.ball["resetting"]:
+                self.ball["x"] += self.ball["dx"]
+                self.ball["y"] += self.ball["dy"]
+            if self.ball["y"] < self.GRID:
+                self.ball["y"] = self.GRID
+                self.ball["dy"] *= -1
+            elif self.ball["y"] + self.GRID > self.HEIGHT - self.GRID:
+                self.ball["y"] = self.HEIGHT - self.GRID * 2
+                self.ball["dy"] *= -1
+            if (self.ball["x"] < 0 or self.ball["x"] > self.WIDTH) and not self.ball["resetting"]:
+                self.ball["resetting"] = True
+                self.reset_timer = self.tick
+                if self.ball["x"] < 0:
+                    self.score["right"] += 1
+                else:
+                    self.score["left"] += 1
+                if self.score["left"] >= self.MAX_SCORE or self.score["right"] >= self.MAX_SCORE:
+                    self.game_state = "game_over"
+            if self.ball["resetting"] and self.tick - self.reset_timer >= self.RESET_DELAY_TICKS:
+                self.reset_ball()
+            if self.collides(self.ball, self.left_paddle):
+                self.ball["dx"] *= -1
+                self.ball["x"] = self.left_paddle["x"] + self.left_paddle["width"]
+                self.accelerate_ball()
+            elif self.collides(self.ball, self.right_paddle):
+                self.ball["dx"] *= -1
+                self.ball["x"] = self.right_paddle["x"] - self.ball["width"]
+                self.accelerate_ball()
+
+    def accelerate_ball(self):
+        dx_sign = 1 if self.ball["dx"] > 0 else -1
+        dy_sign = 1 if self.ball["dy"] > 0 else -1
+        dx_abs = min(abs(self.ball["dx"]) + self.BALL_ACCELERATION, self.MAX_BALL_SPEED)
+        dy_abs = min(abs(self.ball["dy"]) + self.BALL_ACCELERATION, self.MAX_BALL_SPEED)
+        self.ball["dx"] = dx_abs * dx_sign
+        self.ball["dy"] = dy_abs * dy_sign
+
+
+def per_call(stmt, number):
+    """Best-of-five time per call, in nanoseconds."""
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def frame_time(engine_class, ticks=50000):
+    engine = engine_class()
+    engine.reset_game()
+
+    def run():
+        for _ in range(ticks):
+            engine.update()
+            if engine.game_state != "playing":
+                engine.reset_game()
+    return per_call(run, 1) / ticks
+
+
+def main():
+    slotted = PongularityEngine()
+    legacy = DictEngine()
+    snapshot = legacy.ball.copy()
+    state = slotted.ball.state()
+
+    rows = [
+        ("update() per frame", frame_time(DictEngine), frame_time(PongularityEngine), "ns"),
+        ("collision check", per_call(lambda: legacy.collides(legacy.ball, legacy.left_paddle), 200000),
+         per_call(lambda: slotted.ball.collides(slotted.left_paddle), 200000), "ns"),
+        ("ball snapshot", per_call(legacy.ball.copy, 200000), per_call(slotted.ball.state, 200000), "ns"),
+        ("ball restore", per_call(lambda: legacy.ball.update(snapshot), 200000),
+         per_call(lambda: slotted.ball.load_state(state), 200000), "ns"),
+        ("ball copy", per_call(legacy.ball.copy, 200000), per_call(slotted.ball.copy, 200000), "ns"),
+        ("ball size", sys.getsizeof(legacy.ball), sys.getsizeof(slotted.ball), "bytes"),
+        ("paddle size", sys.getsizeof(legacy.left_paddle), sys.getsizeof(slotted.left_paddle), "bytes"),
+    ]
+
+    print(f"{'':<20}{'dict':>10}{'slotted':>10}{'speedup':>10}")
+    for name, before, after, unit in rows:
+        print(f"{name:<20}{before:>10.0f}{after:>10.0f}{before / after:>9.2f}x  {unit}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Environment steps per second for each observation mode and for VectorPongEnv.
+
+Actions are random. Pixel modes run offscreen; the reported rate includes
+drawing each frame into the zero-copy observation view.
+
+Run from the repository root with the package installed (pip install -e .[batch]):
+
+    SDL_VIDEODRIVER=dummy python benchmarks/bench_env.py [N]
+"""
+import sys
+import time
+import numpy as np
+from pongularity.env import PongEnv, VectorPongEnv
+
+
+def bench_env(steps=20000, **options):
+    env = PongEnv(**options)
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).integers(0, 3, steps)
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def bench_vector_env(n, steps=2000):
+    env = VectorPongEnv(n)
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).integers(0, 3, (steps, n))
+    start = time.perf_counter()
+    for row in actions:
+        env.step(row)
+    return n * steps / (time.perf_counter() - start)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    rows = [
+        ("PongEnv vector", bench_env(observation="vector")),
+        ("PongEnv pixels 585x750", bench_env(observation="pixels")),
+        ("PongEnv pixels 147x188", bench_env(observation="pixels", downsample=4)),
+        (f"VectorPongEnv N={n}", bench_vector_env(n)),
+    ]
+    for name, rate in rows:
+        print(f"{name:<26}{rate:>14,.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Match throughput of EventSimulator skipping between events against stepping every tick.
+
+Both modes play the same seeded matches between controllers that re-aim at
+every serve and paddle hit, and must finish with the same scores.
+
+Run from the repository root with the package installed (pip install -e .):
+
+    python benchmarks/bench_events.py [MATCHES]
+"""
+import sys
+import time
+from pongularity.trajectory import EventSimulator
+
+MAX_TICKS = 60 * 60 * 10
+
+
+def bench(matches, skip):
+    results = []
+    ticks = steps = 0
+    start = time.perf_counter()
+    for seed in range(matches):
+        simulator = EventSimulator("sloppy", "sloppy", seed=seed)
+        simulator.run(MAX_TICKS, skip=skip)
+        results.append(dict(simulator.engine.score))
+        ticks += simulator.engine.tick
+        steps += simulator.steps
+    return time.perf_counter() - start, ticks, steps, results
+
+
+def main():
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    stepped_time, ticks, stepped_steps, stepped = bench(matches, skip=False)
+    event_time, _, event_steps, events = bench(matches, skip=True)
+    assert events == stepped, "event simulation diverged from stepping"
+
+    print(f"{matches} matches, {ticks:,} ticks of game time")
+    print(f"{'':<10}{'update() calls':>16}{'seconds':>10}{'ticks/s':>14}{'matches/s':>12}")
+    for name, elapsed, steps in (("stepped", stepped_time, stepped_steps), ("events", event_time, event_steps)):
+        print(f"{name:<10}{steps:>16,}{elapsed:>10.3f}{ticks / elapsed:>14,.0f}{matches / elapsed:>12.1f}")
+    print(f"speedup   {stepped_time / event_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
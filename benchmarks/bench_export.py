@@ -0,0 +1,67 @@
+"""
+Offline export speed, as a multiple of real time.
+
+Exports SECONDS of a CPU match at 60 frames per second: to a sink that drops
+the frames (simulation and rendering only), to a PNG sequence in a
+temporary directory, and through ffmpeg to an mp4 when ffmpeg is
+installed. The writer column is the time the simulation spent waiting for
+the writer thread; when it is most of the total, encoding is the limit.
+A 10-minute match exports faster than real time when the speed is above 1.
+
+Run from the repository root with the package installed (pip install -e .):
+
+    python benchmarks/bench_export.py [SECONDS]
+"""
+import os
+import shutil
+import sys
+import tempfile
+from pongularity.controllers import make_controller
+from pongularity.export import FFmpegSink, PngSequenceSink, export, frame_surface
+from pongularity.game import PongularityGame
+
+
+class NullSink:
+    def write(self, data):
+        pass
+
+    def close(self):
+        pass
+
+
+def run(make_sink, seconds):
+    game = PongularityGame(max_fps=0, dirty_rects=True, surface=frame_surface(),
+                           left_controller=make_controller("tracker", seed=0),
+                           right_controller=make_controller("predictor", seed=1))
+    game.reset_game()
+
+    def advance():
+        game.step()
+        if game.game_state != "playing":
+            game.reset_game()
+        return True
+
+    size = (game.WIDTH, game.HEIGHT)
+    return export(game, advance, make_sink(size), round(seconds * game.TICK_RATE))
+
+
+def main(seconds=30.0):
+    with tempfile.TemporaryDirectory() as directory:
+        sinks = [
+            ("render only", lambda size: NullSink()),
+            ("png sequence", lambda size: PngSequenceSink(os.path.join(directory, "%05d.png"), size)),
+        ]
+        if shutil.which("ffmpeg"):
+            sinks.append(("ffmpeg mp4", lambda size: FFmpegSink(os.path.join(directory, "clip.mp4"), size, 60)))
+        else:
+            print("ffmpeg not found, skipping the mp4 export")
+
+        print(f"{'output':<16}{'frames':>8}{'seconds':>10}{'x real time':>13}{'writer s':>10}{'10 min in s':>13}")
+        for name, make_sink in sinks:
+            stats = run(make_sink, seconds)
+            print(f"{name:<16}{stats['frames']:>8}{stats['seconds']:>10.1f}{stats['speed']:>13.1f}"
+                  f"{stats['blocked']:>10.1f}{600 / stats['speed']:>13.0f}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 30.0)
@@ -0,0 +1,60 @@
+"""
+Bandwidth and input latency of networked matches on localhost.
+
+Plays two tracker clients against a MatchServer in real time for each
+network condition, with NetworkShim delaying and dropping what every
+endpoint sends. Bandwidth is the payload both ways for the whole match
+(without UDP/IP headers); input latency runs from a client deciding an input
+to it receiving the first server state that includes it.
+
+Run from the repository root with the package installed (pip install -e .):
+
+    python benchmarks/bench_net.py [SECONDS]
+"""
+import asyncio
+import sys
+from pongularity.controllers import make_controller
+from pongularity.net import MatchClient, MatchServer, NetworkShim
+
+CONDITIONS = [
+    # (name, transport, delta, latency s, jitter s, loss)
+    ("localhost", "udp", True, 0.0, 0.0, 0.0),
+    ("localhost, full states", "udp", False, 0.0, 0.0, 0.0),
+    ("localhost tcp", "tcp", True, 0.0, 0.0, 0.0),
+    ("30 ms", "udp", True, 0.03, 0.005, 0.0),
+    ("30 ms, 5% loss", "udp", True, 0.03, 0.005, 0.05),
+    ("80 ms, 10% loss", "udp", True, 0.08, 0.02, 0.10),
+]
+
+
+async def match(seconds, transport, delta, latency, jitter, loss):
+    shim = NetworkShim(latency, jitter, loss, seed=1) if latency or loss else None
+    server = MatchServer(delta=delta, shim=shim)
+    host, port = await server.listen(transport=transport)
+    clients = [MatchClient(make_controller("tracker", seed=side), shim=shim) for side in range(2)]
+    for client in clients:
+        await client.connect(host, port, transport)
+    stats, *client_stats = await asyncio.gather(
+        server.play(max_ticks=round(seconds * server.engine.TICK_RATE)), *(client.play() for client in clients))
+    server.close()
+    for client in clients:
+        client.close()
+    return stats, client_stats
+
+
+def main(seconds=5.0):
+    print(f"{'network':<24}{'kB/s':>8}{'B/tick':>8}{'latency ms':>12}{'p95 ms':>8}"
+          f"{'rollbacks/s':>13}{'missed':>8}")
+    for name, transport, delta, latency, jitter, loss in CONDITIONS:
+        stats, client_stats = asyncio.run(match(seconds, transport, delta, latency, jitter, loss))
+        total = stats["bytes_sent"] + stats["bytes_received"]
+        mean = sum(c["input_latency"] for c in client_stats) / 2 * 1000
+        p95 = max(c["input_latency_p95"] for c in client_stats) * 1000
+        rollbacks = sum(c["rollbacks"] for c in client_stats) / stats["seconds"]
+        missed = sum(stats["missed_inputs"].values())
+        print(f"{name:<24}{stats['bytes_per_second'] / 1000:>8.1f}{total / stats['ticks']:>8.0f}"
+              f"{mean:>12.1f}{p95:>8.1f}{rollbacks:>13.1f}{missed:>8}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 5.0)
@@ -0,0 +1,62 @@
+"""
+Frame time of full-screen rendering against dirty-rectangle rendering, and
+of the pre-composed start and game over screens.
+
+Runs on SDL's dummy video driver unless SDL_VIDEODRIVER is already set, so it
+works on headless machines. Run from the repository root with the package
+installed (pip install -e .):
+
+    python benchmarks/bench_render.py [frames]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from pongularity.game import PongularityGame
+
+
+def frame_time(dirty_rects, frames):
+    """Mean render() time in microseconds over a scripted rally."""
+    game = PongularityGame(dirty_rects=dirty_rects)
+    game.reset_game()
+    game.render()
+
+    total = 0
+    for frame in range(frames):
+        game.left_paddle.dy = game.PADDLE_SPEED if (frame // 40) % 2 else -game.PADDLE_SPEED
+        game.right_paddle.dy = -game.left_paddle.dy
+        game.step()
+        if game.game_state != "playing":
+            game.reset_game()
+        start = time.perf_counter()
+        game.render(0.5)
+        total += time.perf_counter() - start
+    return total / frames * 1e6
+
+
+def static_frame_time(game_state, frames):
+    """Mean render() time in microseconds for a static screen."""
+    game = PongularityGame()
+    game.game_state = game_state
+    game.render()
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.render()
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    full = frame_time(False, frames)
+    dirty = frame_time(True, frames)
+    print(f"full redraw:   {full:8.1f} us/frame")
+    print(f"dirty rects:   {dirty:8.1f} us/frame  ({full / dirty:.1f}x faster)")
+    print(f"start screen:  {static_frame_time('start_screen', frames):8.1f} us/frame")
+    print(f"game over:     {static_frame_time('game_over', frames):8.1f} us/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Frame time of the surface and texture renderers as the window grows.
+
+Renders FRAMES playing frames of a scripted rally with each backend, at the
+playfield's own size and scaled up to 1080p and 4K windows, and reports the
+mean render() time including presenting the frame. The surface renderer
+scales every frame in software once the window is larger than the
+playfield; the texture renderer leaves that to SDL's renderer.
+
+Runs on SDL's dummy video driver unless SDL_VIDEODRIVER is already set, so it
+works on headless machines. The dummy driver only has SDL's software
+renderer, so the texture numbers there are a CPU-bound upper limit; run with
+a real video driver to measure the GPU. Run from the repository root with the
+package installed (pip install -e .):
+
+    python benchmarks/bench_renderers.py [FRAMES]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from pongularity.game import PongularityGame
+
+SIZES = [None, (1920, 1080), (3840, 2160)]
+
+
+def frame_time(renderer, window_size, frames):
+    """Mean render() time in microseconds over a scripted rally."""
+    game = PongularityGame(renderer=renderer, window_size=window_size)
+    game.reset_game()
+    game.render()
+
+    total = 0
+    for frame in range(frames):
+        game.left_paddle.dy = game.PADDLE_SPEED if (frame // 40) % 2 else -game.PADDLE_SPEED
+        game.right_paddle.dy = -game.left_paddle.dy
+        game.step()
+        if game.game_state != "playing":
+            game.reset_game()
+        start = time.perf_counter()
+        game.render(0.5)
+        total += time.perf_counter() - start
+    backend = game.renderer.name
+    return total / frames * 1e6, backend
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    pygame.display.init()
+    print(f"video driver: {pygame.display.get_driver()}")
+    print(f"{'window':<12}{'surface us':>12}{'texture us':>12}{'speedup':>9}")
+    for size in SIZES:
+        surface, _ = frame_time("surface", size, frames)
+        texture, backend = frame_time("texture", size, frames)
+        if backend != "texture":
+            print("texture renderer unavailable, measured the surface fallback")
+        name = "playfield" if size is None else f"{size[0]}x{size[1]}"
+        print(f"{name:<12}{surface:>12.1f}{texture:>12.1f}{surface / texture:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Per-core room capacity of RoomServer, against one MatchServer per match.
+
+Plays N rooms of still-standing MatchClients over an in-memory link (no
+sockets, so only server work is measured) and reports the server CPU time
+per room per tick and how many rooms one core could tick at 60 Hz. The
+room column is reading input packets and encoding states, room by room, and
+the step column each room's share of the BatchPong step. The MatchServer
+columns run the same matches with one scalar engine per match, like a
+process per game without the processes.
+
+Run from the repository root with the package installed (pip install -e .[batch]):
+
+    python benchmarks/bench_rooms.py [TICKS]
+"""
+import sys
+import time
+from pongularity.net import MatchClient, MatchServer
+from pongularity.rooms import RoomServer
+
+ROOMS = (1, 16, 64, 256, 1024)
+
+
+def connect(server, client, peer, timed, outbox):
+    """Join client to server in memory; time the server spends receiving is added to timed.
+
+    Packets to the client wait in outbox, so the client's work is not timed.
+    """
+    def to_server(data):
+        started = time.perf_counter()
+        server.receive(data, peer)
+        timed[0] += time.perf_counter() - started
+
+    server.add_peer(peer, lambda data: outbox.append((client, data)))
+    client.write = to_server
+    client.hello()
+
+
+def deliver(outbox):
+    for client, data in outbox:
+        client.receive(data)
+    outbox.clear()
+
+
+def room_server(rooms, ticks):
+    server = RoomServer(capacity=rooms)
+    timed = [0.0]
+    outbox = []
+    clients = [MatchClient(lead=2) for _ in range(rooms * 2)]
+    for i, client in enumerate(clients):
+        connect(server, client, i, timed, outbox)
+    deliver(outbox)
+    for _ in range(ticks):
+        server.tick()
+        deliver(outbox)
+        for client in clients:
+            client.clock_tick()
+    stats = server.stats()
+    return stats["room_cpu"], stats["step_time"] / rooms, stats["capacity"]
+
+
+def match_servers(rooms, ticks):
+    servers = [MatchServer() for _ in range(rooms)]
+    timed = [0.0]
+    outbox = []
+    clients = []
+    for server in servers:
+        for side in range(2):
+            client = MatchClient(lead=2)
+            connect(server, client, side, timed, outbox)
+            clients.append(client)
+        deliver(outbox)
+        server.start()
+    deliver(outbox)
+    for _ in range(ticks):
+        started = time.perf_counter()
+        for server in servers:
+            server.tick()
+        timed[0] += time.perf_counter() - started
+        deliver(outbox)
+        for client in clients:
+            client.clock_tick()
+    room_cpu = timed[0] / (rooms * ticks)
+    return room_cpu, int(1 / (room_cpu * 60))
+
+
+def main(ticks=300):
+    print(f"{'':>6}{'RoomServer (us per room per tick)':>44}{'MatchServer':>23}")
+    print(f"{'rooms':>6}{'room':>10}{'step':>10}{'total':>10}{'rooms/core':>14}{'total':>11}{'rooms/core':>12}")
+    for rooms in ROOMS:
+        batched, step, batched_capacity = room_server(rooms, ticks)
+        scalar, scalar_capacity = match_servers(rooms, ticks)
+        print(f"{rooms:>6}{batched * 1e6:>10.1f}{step * 1e6:>10.1f}{(batched + step) * 1e6:>10.1f}"
+              f"{batched_capacity:>14}{scalar * 1e6:>11.1f}{scalar_capacity:>12}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
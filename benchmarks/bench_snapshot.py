@@ -0,0 +1,54 @@
+"""
+Cost of PongularityEngine snapshots, and of a lookahead search built on them.
+
+Run from the repository root with the package installed (pip install -e .):
+
+    python benchmarks/bench_snapshot.py
+"""
+import timeit
+from pongularity.engine import PongularityEngine, pack_snapshot, unpack_snapshot
+
+
+def per_call(stmt, number=200000):
+    """Best-of-five time per call, in nanoseconds."""
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def lookahead(engine, depth=8):
+    """Pick the paddle direction whose rollout keeps the ball closest, restoring after each try."""
+    start = engine.snapshot()
+    best = None
+    for direction in (-1, 0, 1):
+        engine.left_paddle.dy = direction * engine.PADDLE_SPEED
+        for _ in range(depth):
+            engine.update()
+        distance = abs(engine.left_paddle.y - engine.ball.y)
+        if best is None or distance < best[0]:
+            best = (distance, direction)
+        engine.restore(start)
+    return best[1]
+
+
+def main():
+    engine = PongularityEngine()
+    engine.reset_game()
+    for _ in range(300):
+        engine.update()
+    snapshot = engine.snapshot()
+    data = pack_snapshot(snapshot)
+
+    rows = [
+        ("snapshot()", per_call(engine.snapshot)),
+        ("restore()", per_call(lambda: engine.restore(snapshot))),
+        ("pack_snapshot()", per_call(lambda: pack_snapshot(snapshot))),
+        ("unpack_snapshot()", per_call(lambda: unpack_snapshot(data))),
+        ("update()", per_call(engine.update)),
+        ("3 x 8-tick lookahead", per_call(lambda: lookahead(engine), number=20000)),
+    ]
+    for name, ns in rows:
+        print(f"{name:<24}{ns:>10.0f} ns")
+    print(f"{'packed size':<24}{len(data):>10} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Cost and bandwidth of the spectator feed for large audiences.
+
+Publishes a tracker-against-tracker match to SpectatorFeed with N in-memory
+subscribers and reports the encode time per tick (done once, whatever the
+audience), the fan-out time per tick, and the bytes per second for each
+viewer and in total at 60 Hz. The last columns encode a full-precision
+delta state (net.encode_state) for every viewer, as MatchServer does for its
+players, to show what a per-viewer encoding would cost instead.
+
+Run from the repository root with the package installed (pip install -e .):
+
+    python benchmarks/bench_spectate.py [TICKS]
+"""
+import sys
+import time
+from pongularity.controllers import make_controller
+from pongularity.engine import PongularityEngine
+from pongularity.net import encode_state
+from pongularity.spectate import SpectatorFeed
+
+AUDIENCES = (1, 10, 100, 1000)
+
+
+def snapshots(ticks):
+    engine = PongularityEngine()
+    engine.reset_game()
+    controllers = [make_controller("tracker", seed=seed) for seed in range(2)]
+    result = [engine.snapshot()]
+    for _ in range(ticks):
+        engine.left_paddle.dy = controllers[0].control(engine, "left")
+        engine.right_paddle.dy = controllers[1].control(engine, "right")
+        engine.update()
+        result.append(engine.snapshot())
+    return result
+
+
+def feed(states, viewers):
+    feed = SpectatorFeed()
+    received = [0]
+
+    def write(data):
+        received[0] += 1
+
+    for viewer in range(viewers):
+        feed.subscribe(viewer, write)
+    for snapshot in states:
+        feed.publish(snapshot)
+    return feed.stats()
+
+
+def per_viewer(states, viewers):
+    sent = 0
+    started = time.perf_counter()
+    for baseline, snapshot in zip(states, states[1:]):
+        for _ in range(viewers):
+            mask, payload = encode_state(snapshot, baseline)
+            sent += len(payload) + 12  # STATE header
+    return (time.perf_counter() - started) / (len(states) - 1), sent / (len(states) - 1)
+
+
+def main(ticks=3000):
+    states = snapshots(ticks)
+    rate = PongularityEngine.BASE_TICK_RATE
+    print(f"{'':>8}{'SpectatorFeed':>48}{'per-viewer encode_state':>30}")
+    print(f"{'viewers':>8}{'encode us':>11}{'fan-out us':>12}{'B/s/viewer':>12}{'total kB/s':>13}"
+          f"{'us/tick':>12}{'total kB/s':>18}")
+    for viewers in AUDIENCES:
+        stats = feed(states, viewers)
+        scalar_time, scalar_bytes = per_viewer(states, viewers)
+        per_second = stats["bytes_per_frame"] * rate
+        print(f"{viewers:>8}{stats['encode_time'] * 1e6:>11.2f}{stats['fanout_time'] * 1e6:>12.1f}"
+              f"{per_second:>12.0f}{per_second * viewers / 1000:>13.1f}"
+              f"{scalar_time * 1e6:>12.1f}{scalar_bytes * rate / 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
@@ -0,0 +1,76 @@
+"""
+Cost of sweeping rule variants: one scalar engine per variant against one
+BatchPong whose lanes each have their own GameConfig.
+
+Builds a grid of VARIANTS configs (ball speed, paddle height and winning
+score), plays every variant for TICKS ticks with the same held random
+inputs, and reports the setup time and the simulated ticks per second.
+Engine setup copies constants derived once per config, so building engines
+is cheap either way; the batch wins by stepping every variant at once.
+
+Run from the repository root with the package installed (pip install -e .[batch]):
+
+    python benchmarks/bench_sweep.py [VARIANTS] [TICKS]
+"""
+import itertools
+import sys
+import time
+import numpy as np
+from pongularity.batch import BatchPong
+from pongularity.config import DEFAULT_CONFIG
+from pongularity.engine import PongularityEngine
+
+
+def variants(count):
+    grid = itertools.product(np.linspace(3, 9, 16), (45, 60, 75, 90, 105, 120, 150, 180), (1, 3, 5, 7, 10, 15, 21, 30))
+    return [DEFAULT_CONFIG.replace(ball_speed=float(speed), max_ball_speed=max(15.0, float(speed)),
+                                   paddle_height=height, max_score=score)
+            for speed, height, score in itertools.islice(grid, count)]
+
+
+def inputs(count, ticks, seed=0):
+    rng = np.random.default_rng(seed)
+    held = rng.choice((-6.0, 0.0, 6.0), size=(ticks // 5 + 1, 2, count))
+    return np.repeat(held, 5, axis=0)[:ticks]
+
+
+def scalar(configs, moves):
+    started = time.perf_counter()
+    engines = [PongularityEngine(config=config) for config in configs]
+    for engine in engines:
+        engine.reset_game()
+    setup = time.perf_counter() - started
+    started = time.perf_counter()
+    for i, engine in enumerate(engines):
+        left_paddle, right_paddle = engine.left_paddle, engine.right_paddle
+        for left, right in moves[:, :, i].tolist():
+            left_paddle.dy = left
+            right_paddle.dy = right
+            engine.update()
+    return setup, time.perf_counter() - started
+
+
+def batched(configs, moves):
+    started = time.perf_counter()
+    batch = BatchPong(len(configs), config=configs)
+    batch.reset_game()
+    setup = time.perf_counter() - started
+    started = time.perf_counter()
+    for left, right in moves:
+        batch.step(left, right)
+    return setup, time.perf_counter() - started
+
+
+def main(count=1024, ticks=3000):
+    configs = variants(count)
+    moves = inputs(len(configs), ticks)
+    lane_ticks = len(configs) * ticks
+    print(f"{len(configs)} variants, {ticks} ticks each")
+    print(f"{'':<22}{'setup ms':>10}{'run s':>9}{'ticks/s':>14}")
+    for name, run in (("engine per variant", scalar), ("BatchPong lanes", batched)):
+        setup, elapsed = run(configs, moves)
+        print(f"{name:<22}{setup * 1000:>10.1f}{elapsed:>9.2f}{lane_ticks / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,111 @@
+"""
+Physics steps per simulated second needed by discrete and swept collisions.
+
+Each scenario serves the ball from the center at a random angle and speed
+towards paddles parked at random heights, and plays until the first point or
+for three seconds of game time. Ball positions are sampled every 100 ms and
+compared with a swept reference run at a very high tick rate. For each
+collision mode the lowest tick rate whose worst error stays within TOLERANCE
+pixels, with the same side winning the point, is the rate needed for that
+accuracy.
+
+Run from the repository root with the package installed (pip install -e .):
+
+    python benchmarks/bench_swept.py
+"""
+import math
+import random
+import time
+from pongularity.engine import PongularityEngine
+
+TICK_RATES = (10, 20, 30, 60, 120, 240, 480, 960, 1920, 3840)
+REFERENCE_RATE = 7680
+SECONDS = 3
+SAMPLES_PER_SECOND = 10
+TOLERANCE = 1.0  # pixels
+
+
+def scenarios(count, seed=0):
+    """Serve directions, speeds and paddle heights in base-rate pixels per tick."""
+    rng = random.Random(seed)
+    engine = PongularityEngine()
+    low, high = engine.BALL_SPEED, engine.MAX_BALL_SPEED
+    for _ in range(count):
+        yield (rng.choice((-1, 1)) * rng.uniform(low, high), rng.choice((-1, 1)) * rng.uniform(low, high),
+               rng.uniform(engine.GRID, engine.MAX_PADDLE_Y), rng.uniform(engine.GRID, engine.MAX_PADDLE_Y))
+
+
+def play(tick_rate, swept, scenario):
+    """Return the sampled ball positions up to the first point, and the score."""
+    engine = PongularityEngine(tick_rate, swept=swept)
+    engine.reset_game()
+    dx, dy, left_y, right_y = scenario
+    scale = engine.BASE_TICK_RATE / tick_rate
+    engine.ball.dx = dx * scale
+    engine.ball.dy = dy * scale
+    engine.left_paddle.y = left_y
+    engine.right_paddle.y = right_y
+
+    samples = []
+    interval = tick_rate // SAMPLES_PER_SECOND
+    for tick in range(1, tick_rate * SECONDS + 1):
+        engine.update()
+        if engine.ball.resetting:
+            break
+        if tick % interval == 0:
+            samples.append((engine.ball.x, engine.ball.y))
+    return samples, (engine.score["left"], engine.score["right"])
+
+
+def error(result, reference):
+    """Worst distance from the reference, or infinity if a point went the other way."""
+    samples, score = result
+    reference_samples, reference_score = reference
+    if score != reference_score:
+        return math.inf
+    return max((math.dist(sample, expected) for sample, expected in zip(samples, reference_samples)),
+               default=0.0)
+
+
+def step_time(tick_rate, swept, ticks=20000):
+    """Seconds per update() during play."""
+    engine = PongularityEngine(tick_rate, swept=swept)
+    engine.reset_game()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        engine.update()
+        if engine.game_state != "playing":
+            engine.reset_game()
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    cases = list(scenarios(20))
+    references = [play(REFERENCE_RATE, True, case) for case in cases]
+
+    print(f"worst ball position error over {len(cases)} serves (pixels, inf = wrong side scored)")
+    print(f"{'ticks/s':>8}{'discrete':>12}{'swept':>12}")
+    needed = {}
+    for tick_rate in TICK_RATES:
+        row = []
+        for swept in (False, True):
+            worst = max(error(play(tick_rate, swept, case), reference)
+                        for case, reference in zip(cases, references))
+            row.append(worst)
+            if worst <= TOLERANCE:
+                needed.setdefault(swept, tick_rate)
+        print(f"{tick_rate:>8}" + "".join(f"{worst:>12.3f}" for worst in row))
+
+    print(f"\nto stay within {TOLERANCE:g} px:")
+    for swept, name in ((False, "discrete"), (True, "swept")):
+        tick_rate = needed.get(swept)
+        if tick_rate is None:
+            print(f"{name:<10}not reached at {TICK_RATES[-1]} ticks/s")
+            continue
+        per_step = step_time(tick_rate, swept)
+        print(f"{name:<10}{tick_rate:>6} steps per simulated second, {per_step * 1e6:6.2f} us per step, "
+              f"{tick_rate * per_step * 1000:7.2f} ms of CPU per simulated second")
+
+
+if __name__ == "__main__":
+    main()
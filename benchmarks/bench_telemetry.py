@@ -0,0 +1,73 @@
+"""
+Frame-time overhead of match telemetry.
+
+Plays CPU matches (tracker against predictor, restarted when one ends) and
+times TICKS physics ticks with no telemetry, with aggregates only, and with
+every event also written to CSV and to SQLite in a temporary directory.
+Runs alternate and the best of five is kept, so machine noise hits every
+row alike. The added time per tick is then compared with a full frame (a
+tick plus an offscreen render), which is what telemetry has to stay under
+1% of. Frames are timed separately because their noise is larger than the
+cost being measured.
+
+Run from the repository root with the package installed (pip install -e .):
+
+    python benchmarks/bench_telemetry.py [TICKS]
+"""
+import os
+import sys
+import tempfile
+import time
+from pongularity.controllers import make_controller
+from pongularity.export import frame_surface
+from pongularity.game import PongularityGame
+from pongularity.telemetry import Telemetry
+
+REPEATS = 5
+
+
+def run(ticks, path=False, render=False):
+    game = PongularityGame(max_fps=0, surface=frame_surface(),
+                           left_controller=make_controller("tracker", seed=0),
+                           right_controller=make_controller("predictor", seed=1))
+    telemetry = None
+    if path is not False:
+        telemetry = Telemetry(path)
+        telemetry.attach(game)
+    game.reset_game()
+    started = time.perf_counter()
+    for _ in range(ticks):
+        game.step()
+        if game.game_state != "playing":
+            game.reset_game()
+        if render:
+            game.render()
+    seconds = time.perf_counter() - started
+    summary = telemetry.close() if telemetry is not None else {"events": 0, "dropped": 0}
+    return seconds / ticks, summary
+
+
+def main(ticks=30000):
+    frame = min(run(2000, render=True)[0] for _ in range(REPEATS))
+    print(f"frame (tick + render): {frame * 1e6:.1f} us\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        outputs = [("off", False), ("aggregates only", None),
+                   ("csv", os.path.join(directory, "events.csv")),
+                   ("sqlite", os.path.join(directory, "events.db"))]
+        best = {name: float("inf") for name, _ in outputs}
+        summaries = {}
+        for _ in range(REPEATS):
+            for name, path in outputs:
+                seconds, summaries[name] = run(ticks, path)
+                best[name] = min(best[name], seconds)
+
+    print(f"{'telemetry':<18}{'us/tick':>9}{'added us':>10}{'of frame':>10}{'events':>8}{'dropped':>9}")
+    for name, _ in outputs:
+        added = best[name] - best["off"]
+        print(f"{name:<18}{best[name] * 1e6:>9.2f}{added * 1e6:>10.2f}{added / frame * 100:>9.2f}%"
+              f"{summaries[name]['events']:>8}{summaries[name]['dropped']:>9}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 30000)
@@ -0,0 +1,286 @@
+"""
+Benchmark suite for the game loop, with JSON baselines and regression gating.
+
+Measures engine update() steps per second, collides() calls per second,
+render() frame time in each game state, the time from launching Python to
+the first rendered frame, and the memory taken by each engine and each
+(offscreen) game. Results are compared with a baseline file. The run fails
+with exit status 1 when any metric is worse than the baseline by more than
+the threshold, which defaults to 20% and can be set for the whole run or
+for single metrics (--threshold render_playing_us=0.5).
+
+Runs on SDL's dummy video and audio drivers unless SDL_VIDEODRIVER and
+SDL_AUDIODRIVER are already set, so it works on headless machines. Run
+from the repository root with the package installed (pip install -e .):
+
+    python benchmarks/suite.py --save           # record benchmarks/baseline.json
+    python benchmarks/suite.py                  # compare with it
+    python benchmarks/suite.py --only update_steps_per_sec --threshold 0.1
+
+--save with --only updates those metrics in the baseline and keeps the rest.
+
+Timings are best of --repeat runs, and a benchmark that regresses is
+measured again (--retries) before the run fails. Baselines are only
+comparable on the machine that recorded them, so record one on the machine
+that gates.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from pongularity.engine import PongularityEngine
+from pongularity.game import PongularityGame
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+THRESHOLD = 0.20
+
+# Launches a game, renders one frame and exits; the parent times the whole process
+FIRST_FRAME = """
+from pongularity.game import PongularityGame
+PongularityGame().render()
+"""
+
+
+def best(run, repeat):
+    """Best (smallest) seconds taken by run() over repeat calls."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def update_steps(repeat, ticks=50000):
+    engine = PongularityEngine()
+    engine.reset_game()
+
+    def run():
+        for _ in range(ticks):
+            engine.update()
+            if engine.game_state != "playing":
+                engine.reset_game()
+    return ticks / best(run, repeat)
+
+
+def collides(repeat, calls=200000):
+    engine = PongularityEngine()
+    engine.reset_game()
+    ball, paddle, check = engine.ball, engine.left_paddle, engine.collides
+
+    def run():
+        for _ in range(calls):
+            check(ball, paddle)
+    return calls / best(run, repeat)
+
+
+def render_time(game_state, repeat, frames=500):
+    """Mean render() time in microseconds; while playing, over a scripted rally."""
+    game = PongularityGame(max_fps=0)
+    game.reset_game()
+    game.game_state = game_state
+    game.render()
+
+    def run():
+        for frame in range(frames):
+            if game_state == "playing":
+                game.left_paddle.dy = game.PADDLE_SPEED if (frame // 40) % 2 else -game.PADDLE_SPEED
+                game.right_paddle.dy = -game.left_paddle.dy
+                game.step()
+                if game.game_state != "playing":
+                    game.reset_game()
+            game.render(0.5)
+    return best(run, repeat) / frames * 1e6
+
+
+def first_frame(repeat):
+    """Milliseconds from starting a Python process to its first rendered frame (and exit)."""
+    command = [sys.executable, "-c", FIRST_FRAME]
+    return best(lambda: subprocess.run(command, check=True, stdout=subprocess.DEVNULL), repeat) * 1000
+
+
+def engine_memory(count=1000):
+    """Python heap bytes per PongularityEngine."""
+    gc.collect()
+    tracemalloc.start()
+    engines = [PongularityEngine() for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del engines
+    return size / count
+
+
+def resident():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def game_memory(count=50):
+    """Resident bytes per offscreen PongularityGame that has rendered a frame, pixels included."""
+    engine = PongularityEngine()
+    size = (engine.WIDTH, engine.HEIGHT)
+    # The first game loads the fonts, which every later game shares
+    PongularityGame(surface=pygame.Surface(size)).render()
+    gc.collect()
+    before = resident()
+    games = []
+    for _ in range(count):
+        game = PongularityGame(surface=pygame.Surface(size))
+        game.render()
+        games.append(game)
+    gc.collect()
+    return (resident() - before) / count
+
+
+# name: (unit, "higher" or "lower" is better, measure(repeat))
+BENCHMARKS = {
+    "update_steps_per_sec": ("steps/s", "higher", update_steps),
+    "collides_per_sec": ("calls/s", "higher", collides),
+    "render_start_screen_us": ("us", "lower", lambda repeat: render_time("start_screen", repeat)),
+    "render_playing_us": ("us", "lower", lambda repeat: render_time("playing", repeat)),
+    "render_game_over_us": ("us", "lower", lambda repeat: render_time("game_over", repeat)),
+    "first_frame_ms": ("ms", "lower", first_frame),
+    "engine_memory_bytes": ("bytes", "lower", lambda repeat: engine_memory()),
+    "game_memory_bytes": ("bytes", "lower", lambda repeat: game_memory()),
+}
+
+
+def run(names, repeat):
+    """Measure the named benchmarks and return {name: {"value", "unit", "better"}}."""
+    results = {}
+    for name in names:
+        unit, better, measure = BENCHMARKS[name]
+        results[name] = {"value": measure(repeat), "unit": unit, "better": better}
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(map(str, pygame.get_sdl_version())),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "video_driver": os.environ["SDL_VIDEODRIVER"],
+    }
+
+
+def compare(baseline, results, threshold=THRESHOLD, thresholds=None):
+    """Return (name, baseline value, value, change) for each result worse than baseline by more than its threshold.
+
+    change is the fraction by which the metric got worse.
+    """
+    thresholds = thresholds or {}
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, value = baseline[name]["value"], result["value"]
+        if result["better"] == "higher":
+            change = (before - value) / before if before else 0.0
+        else:
+            change = (value - before) / before if before else 0.0
+        if change > thresholds.get(name, threshold):
+            regressions.append((name, before, value, change))
+    return regressions
+
+
+def parse_threshold(option):
+    """Parse 0.2 or name=0.2 from --threshold."""
+    name, _, value = option.rpartition("=")
+    if name and name not in BENCHMARKS:
+        raise argparse.ArgumentTypeError(f"Unknown benchmark {name!r}")
+    if float(value) < 0:
+        raise argparse.ArgumentTypeError("Thresholds cannot be negative")
+    return name, float(value)
+
+
+def better_of(first, second):
+    if first["better"] == "higher":
+        return first if first["value"] >= second["value"] else second
+    return first if first["value"] <= second["value"] else second
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the game loop and compare with a baseline.")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON file (default: %(default)s)")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--threshold", type=parse_threshold, action="append", default=[],
+                        help="allowed fraction worse than baseline, for all metrics or as name=fraction "
+                             f"(default: {THRESHOLD})")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per timing, best is kept (default: %(default)s)")
+    parser.add_argument("--retries", type=int, default=1,
+                        help="times to measure a regressed benchmark again before failing (default: %(default)s)")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    args = parser.parse_args(argv)
+
+    threshold = THRESHOLD
+    thresholds = {}
+    for name, value in args.threshold:
+        if name:
+            thresholds[name] = value
+        else:
+            threshold = value
+
+    saved = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            saved = json.load(f)["results"]
+    baseline = {} if args.save else saved
+
+    results = run(args.only or list(BENCHMARKS), args.repeat)
+    # A busy machine slows a whole run down now and then, so a regression
+    # has to show up again before it counts
+    for _ in range(args.retries):
+        regressed = [name for name, *_ in compare(baseline, results, threshold, thresholds)]
+        if not regressed:
+            break
+        for name, result in run(regressed, args.repeat).items():
+            results[name] = better_of(results[name], result)
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"{'benchmark':<26}{'baseline':>14}{'result':>14}{'change':>9}  unit")
+    for name, result in results.items():
+        value = result["value"]
+        if name in baseline:
+            before = baseline[name]["value"]
+            change = f"{(value - before) / before * 100:+8.1f}%" if before else f"{'':>9}"
+            print(f"{name:<26}{before:>14.1f}{value:>14.1f}{change}  {result['unit']}")
+        else:
+            print(f"{name:<26}{'-':>14}{value:>14.1f}{'':>9}  {result['unit']}")
+
+    if args.save:
+        # Metrics left out with --only keep their saved values
+        with open(args.baseline, "w") as f:
+            json.dump(dict(report, results=dict(saved, **results)), f, indent=2)
+            f.write("\n")
+        print(f"saved baseline to {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"no baseline at {args.baseline}; record one with --save")
+        return 0
+
+    regressions = compare(baseline, results, threshold, thresholds)
+    for name, before, value, change in regressions:
+        print(f"REGRESSION {name}: {before:.1f} -> {value:.1f} {results[name]['unit']} "
+              f"({change * 100:.1f}% worse, allowed {thresholds.get(name, threshold) * 100:.0f}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,113 @@
 """
 Main entry point for the Pongularity game.
 """
-from .game import PongularityGame
+import argparse
+import time
+from .config import add_config_arguments, config_from_args
+from .controllers import CONTROLLERS, DIFFICULTIES, make_controller
+from .engine import PongularityEngine
 
-def main():
+PLAYERS = ["human"] + sorted(CONTROLLERS) + ["policy"]
+
+def window_size(text):
+    """Parse WIDTHxHEIGHT for --window-size."""
+    width, separator, height = text.lower().partition("x")
+    try:
+        size = (int(width), int(height))
+    except ValueError:
+        size = None
+    if not separator or size is None or min(size) < 1:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, e.g. 1920x1080, got {text!r}")
+    return size
+
+def profile_startup(options):
+    """Start the game, draw one frame and report where the time went."""
+    phases = []
+    started = last = time.perf_counter()
+
+    def mark(phase):
+        nonlocal last
+        now = time.perf_counter()
+        phases.append((phase, now - last))
+        last = now
+
+    from .game import PongularityGame
+    import pygame
+    mark("import pygame and game")
+
+    game = PongularityGame(**options)
+    mark("init display and font, open window")
+
+    game.fonts.path
+    mark(f"resolve font file ({game.fonts.path or 'pygame default'})")
+
+    game.handle_input()
+    game.render()
+    mark("first frame (load fonts, compose screen)")
+
+    for phase, seconds in phases:
+        print(f"{phase:<50}{seconds * 1000:9.2f} ms")
+    print(f"{'time to first frame':<50}{(last - started) * 1000:9.2f} ms")
+    pygame.quit()
+
+def main(argv=None):
     """Main entry point function for the game."""
-    game = PongularityGame()
+    parser = argparse.ArgumentParser(description="Play Pongularity.")
+    parser.add_argument("--tick-rate", type=int, default=PongularityEngine.BASE_TICK_RATE,
+                        help="physics ticks per second (default: %(default)s)")
+    parser.add_argument("--max-fps", type=int, default=144,
+                        help="rendered frames per second, 0 for uncapped (default: %(default)s)")
+    parser.add_argument("--left", choices=PLAYERS, default="human",
+                        help="who plays the left paddle (default: %(default)s)")
+    parser.add_argument("--right", choices=PLAYERS, default="human",
+                        help="who plays the right paddle (default: %(default)s)")
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTIES), default="normal",
+                        help="reaction time and aim of CPU paddles (default: %(default)s)")
+    parser.add_argument("--swept", action="store_true",
+                        help="resolve ball collisions at their exact time of impact (safe at low tick rates)")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="redraw only the regions that changed each frame")
+    parser.add_argument("--renderer", choices=["surface", "texture"], default="surface",
+                        help="draw in software onto a surface, or from GPU textures with SDL's renderer, "
+                             "falling back to surface where unavailable (default: %(default)s)")
+    parser.add_argument("--window-size", metavar="WxH", type=window_size, default=None,
+                        help="window size; the playfield is scaled to fit (default: the playfield size)")
+    parser.add_argument("--fullscreen", action="store_true",
+                        help="fill the screen, scaling the playfield to fit")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="record paddle inputs to PATH for replay with python -m pongularity.replay")
+    parser.add_argument("--profile-frames", metavar="PATH", default=None,
+                        help="time each frame phase and write the last frames to PATH on exit "
+                             "(.json for a Chrome trace, otherwise CSV); F3 shows the overlay")
+    parser.add_argument("--telemetry", metavar="PATH", default=None,
+                        help="log paddle hits, wall bounces, points and results to PATH "
+                             "(.db or .sqlite for SQLite, otherwise CSV)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="report time to first frame by startup phase, then exit")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.tick_rate < 1:
+        parser.error("--tick-rate must be at least 1")
+
+    try:
+        config = config_from_args(args)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    options = dict(tick_rate=args.tick_rate, max_fps=args.max_fps, dirty_rects=args.dirty_rects,
+                   record_path=args.record, profile_path=args.profile_frames, swept=args.swept,
+                   config=config, telemetry_path=args.telemetry, renderer=args.renderer,
+                   window_size=args.window_size, fullscreen=args.fullscreen)
+    for side in ("left", "right"):
+        player = getattr(args, side)
+        if player != "human":
+            options[f"{side}_controller"] = make_controller(player, difficulty=args.difficulty)
+    if args.profile_startup:
+        profile_startup(options)
+        return
+
+    from .game import PongularityGame
+    game = PongularityGame(**options)
     game.run()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,340 @@
+"""
+Multi-ball arenas: many balls, the paddles and static obstacles in one field.
+
+A GameConfig with balls > 1 or obstacles > 0 makes PongularityEngine hand
+its ball physics to an Arena. Every ball moves, bounces off the top and
+bottom walls, scores when it leaves the field and is served again after
+the usual delay, on its own. Balls bounce off paddles (speeding up, as in
+the classic game), off obstacles and off each other.
+
+Collision candidates come from a uniform grid broadphase. Each tick the
+balls are bucketed by the cell under their top-left corner, and a ball is
+only tested against solids registered in that cell and against balls in its
+own and neighbouring cells. The cost follows how crowded each part of the
+field is, not the number of balls times the number of objects. With
+broadphase=False every pair is tested instead, which is what the grid is
+checked and benchmarked against.
+
+Serves are placed and aimed by a fixed sequence, so arenas are as
+deterministic as the classic game.
+"""
+import math
+from .engine import Serve, WallBounce
+from .entities import Ball, Obstacle
+
+# Grid cells are keyed by column + row * ROW
+ROW = 1 << 16
+
+# Low-discrepancy sequence (R2) that spreads serve positions over the field
+_R2_X = 0.7548776662466927
+_R2_Y = 0.5698402909980532
+
+
+class UniformGrid:
+    """Spatial hash of square cells, each listing the items whose rectangle overlaps it."""
+
+    __slots__ = ("cell_size", "cells")
+
+    def __init__(self, cell_size):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def key(self, x, y):
+        """Return the key of the cell containing point (x, y)."""
+        size = self.cell_size
+        return math.floor(x / size) + math.floor(y / size) * ROW
+
+    def keys(self, x, y, width, height):
+        """Return the keys of every cell a rectangle overlaps."""
+        size = self.cell_size
+        left, right = math.floor(x / size), math.floor((x + width) / size)
+        top, bottom = math.floor(y / size), math.floor((y + height) / size)
+        return [column + row * ROW for row in range(top, bottom + 1) for column in range(left, right + 1)]
+
+    def insert(self, item, x, y, width, height):
+        """Add item to every cell its rectangle overlaps."""
+        cells = self.cells
+        for key in self.keys(x, y, width, height):
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [item]
+            else:
+                bucket.append(item)
+
+    def query(self, x, y, width, height):
+        """Return the items in the cells a rectangle overlaps, each once."""
+        found = {}
+        cells = self.cells
+        for key in self.keys(x, y, width, height):
+            for item in cells.get(key, ()):
+                found[id(item)] = item
+        return list(found.values())
+
+    def clear(self):
+        self.cells.clear()
+
+
+def obstacle_layout(count, width, height, grid):
+    """Return (x, y, width, height) for count obstacles spread over the middle of the field.
+
+    Obstacles are 2 by 4 grid cells, on an even lattice between the two
+    paddle zones. Raises ValueError when they do not fit without touching.
+    """
+    if count == 0:
+        return []
+    block_width, block_height = grid * 2, grid * 4
+    left, right = width / 4, width * 3 / 4
+    top, bottom = grid * 3, height - grid * 3
+    columns = math.ceil(math.sqrt(count * (right - left) / (bottom - top)))
+    rows = math.ceil(count / columns)
+    step_x = (right - left) / columns
+    step_y = (bottom - top) / rows
+    if step_x < block_width + grid or step_y < block_height + grid:
+        raise ValueError(f"{count} obstacles do not fit in a {width}x{height} field")
+    return [(left + step_x * (i % columns + 0.5) - block_width / 2,
+             top + step_y * (i // columns + 0.5) - block_height / 2,
+             block_width, block_height)
+            for i in range(count)]
+
+
+class Arena:
+    """Ball physics of an engine with many balls and obstacles."""
+
+    def __init__(self, engine, cell_size=None, broadphase=True):
+        self.engine = engine
+        grid = engine.GRID
+        # Two balls wide: big enough that a ball only reaches the cells next
+        # to the one under its corner, small enough to keep buckets short
+        self.cell_size = cell_size or grid * 2
+        if self.cell_size < grid:
+            raise ValueError("cell_size must be at least the ball size")
+        self.broadphase = broadphase
+
+        config = engine.config
+        engine.balls[1:] = [Ball(engine.WIDTH / 2, engine.HEIGHT / 2, grid, grid, engine.BALL_SPEED,
+                                 -engine.BALL_SPEED) for _ in range(config.balls - 1)]
+        engine.obstacles[:] = [Obstacle(*rect) for rect in
+                               obstacle_layout(config.obstacles, engine.WIDTH, engine.HEIGHT, grid)]
+        self.reset_ticks = [0] * config.balls
+        self.serves = 0
+
+        # Obstacles never move, so they are registered once. Each solid is
+        # stretched up and left by a ball's size: a ball can only overlap the
+        # solids registered in the cell under its top-left corner
+        self.static = UniformGrid(self.cell_size)
+        for obstacle in engine.obstacles:
+            self.register(self.static, obstacle)
+        self.moving = UniformGrid(self.cell_size)
+
+    def register(self, grid, solid):
+        ball = self.engine.ball
+        grid.insert(solid, solid.x - ball.width, solid.y - ball.height,
+                    solid.width + ball.width, solid.height + ball.height)
+
+    def reset(self):
+        """Serve every ball, as at the start of a match."""
+        self.serves = 0
+        for index in range(len(self.engine.balls)):
+            self.serve(index)
+
+    def serve(self, index):
+        """Put ball index back into play at the next point of the serve sequence."""
+        engine = self.engine
+        ball = engine.balls[index]
+        n = self.serves = self.serves + 1
+        ball.resetting = False
+        ball.x = engine.WIDTH * (0.25 + 0.5 * ((n * _R2_X) % 1))
+        ball.y = engine.GRID + (engine.HEIGHT - engine.GRID * 3) * ((n * _R2_Y) % 1)
+        ball.dx = engine.BALL_SPEED * (1 if n % 2 else -1)
+        ball.dy = engine.BALL_SPEED * (1 if n % 4 < 2 else -1)
+        if engine.on_event is not None:
+            engine.on_event(Serve(engine.tick, math.hypot(ball.dx, ball.dy) * engine.TICK_RATE))
+
+    def step(self):
+        """Advance the balls and extra paddles by one tick and resolve their collisions."""
+        self.move()
+        solids, pairs = self.contacts()
+        for ball, solid in solids:
+            # An earlier bounce may already have moved the ball clear
+            if ball.collides(solid):
+                self.bounce(ball, solid)
+        for a, b in pairs:
+            if a.collides(b):
+                self.collide(a, b)
+
+    def move(self):
+        engine = self.engine
+        tick = engine.tick
+        on_event = engine.on_event
+        top = engine.GRID
+        bottom = engine.HEIGHT - engine.GRID - engine.ball.height
+        width = engine.WIDTH
+        delay = engine.RESET_DELAY_TICKS
+        reset_ticks = self.reset_ticks
+
+        for paddle in engine.paddles[2:]:
+            paddle.y = min(max(paddle.y + paddle.dy, top), engine.MAX_PADDLE_Y)
+
+        for index, ball in enumerate(engine.balls):
+            if ball.resetting:
+                if tick - reset_ticks[index] >= delay:
+                    self.serve(index)
+                continue
+            x = ball.x + ball.dx
+            y = ball.y + ball.dy
+            if y < top:
+                y = top
+                ball.dy = -ball.dy
+                if on_event is not None:
+                    on_event(WallBounce(tick, "top", x))
+            elif y > bottom:
+                y = bottom
+                ball.dy = -ball.dy
+                if on_event is not None:
+                    on_event(WallBounce(tick, "bottom", x))
+            ball.x = x
+            ball.y = y
+            if x < 0 or x > width:
+                ball.resetting = True
+                reset_ticks[index] = tick
+                self.score("right" if x < 0 else "left")
+                if engine.game_state != "playing":
+                    # The match is over: later balls neither move nor score
+                    break
+
+    def score(self, scorer):
+        engine = self.engine
+        engine.score[scorer] += 1
+        if engine.score[scorer] >= engine.MAX_SCORE:
+            engine.game_state = "game_over"
+        if engine.on_event is not None:
+            engine.emit_point(scorer)
+
+    def contacts(self):
+        """Return the (ball, solid) and (ball, ball) pairs that overlap, in a fixed order."""
+        if not self.broadphase:
+            return self.contacts_brute_force()
+        engine = self.engine
+        inverse = 1 / self.cell_size
+        moving = self.moving
+        moving.clear()
+        for paddle in engine.paddles:
+            self.register(moving, paddle)
+        static_cells = self.static.cells
+        moving_cells = moving.cells
+
+        buckets = {}
+        for ball in engine.balls:
+            if ball.resetting:
+                continue
+            # Live balls are inside the field, so truncating is flooring
+            key = int(ball.x * inverse) + int(ball.y * inverse) * ROW
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [ball]
+            else:
+                bucket.append(ball)
+
+        solids = []
+        pairs = []
+        for key, bucket in buckets.items():
+            for cells in (moving_cells, static_cells):
+                candidates = cells.get(key)
+                if candidates is not None:
+                    for ball in bucket:
+                        for solid in candidates:
+                            if ball.collides(solid):
+                                solids.append((ball, solid))
+
+            # Balls in this cell, then against the cells right, below-left,
+            # below and below-right, so every neighbouring pair is seen once
+            count = len(bucket)
+            for i in range(count):
+                a = bucket[i]
+                for j in range(i + 1, count):
+                    b = bucket[j]
+                    if a.collides(b):
+                        pairs.append((a, b))
+            for offset in (1, ROW - 1, ROW, ROW + 1):
+                others = buckets.get(key + offset)
+                if others is not None:
+                    for a in bucket:
+                        for b in others:
+                            if a.collides(b):
+                                pairs.append((a, b))
+        return solids, pairs
+
+    def contacts_brute_force(self):
+        """Return the same contacts as contacts() by testing every pair."""
+        engine = self.engine
+        balls = [ball for ball in engine.balls if not ball.resetting]
+        everything = engine.paddles + engine.obstacles
+        solids = [(ball, solid) for ball in balls for solid in everything if ball.collides(solid)]
+        pairs = [(a, b) for i, a in enumerate(balls) for b in balls[i + 1:] if a.collides(b)]
+        return solids, pairs
+
+    def bounce(self, ball, solid):
+        """Push ball out of solid along the shallower overlap and reflect it."""
+        overlap_x = min(ball.x + ball.width - solid.x, solid.x + solid.width - ball.x)
+        overlap_y = min(ball.y + ball.height - solid.y, solid.y + solid.height - ball.y)
+        if overlap_x <= overlap_y:
+            if ball.x + ball.width / 2 < solid.x + solid.width / 2:
+                ball.x = solid.x - ball.width
+                ball.dx = -abs(ball.dx)
+            else:
+                ball.x = solid.x + solid.width
+                ball.dx = abs(ball.dx)
+            engine = self.engine
+            # Entities compare by value, so look paddles up by identity
+            if any(solid is paddle for paddle in engine.paddles):
+                ball.dx, ball.dy = engine.accelerated(ball.dx, ball.dy)
+                if engine.on_event is not None:
+                    engine.emit_paddle_hit(solid, ball)
+        else:
+            if ball.y + ball.height / 2 < solid.y + solid.height / 2:
+                ball.y = solid.y - ball.height
+                ball.dy = -abs(ball.dy)
+            else:
+                ball.y = solid.y + solid.height
+                ball.dy = abs(ball.dy)
+
+    def collide(self, a, b):
+        """Separate two overlapping balls and swap their velocities along the contact axis."""
+        overlap_x = a.width - abs(a.x - b.x)
+        overlap_y = a.height - abs(a.y - b.y)
+        if overlap_x <= overlap_y:
+            push = overlap_x / 2 if a.x < b.x else -overlap_x / 2
+            a.x -= push
+            b.x += push
+            if (b.x - a.x) * (a.dx - b.dx) > 0:
+                a.dx, b.dx = b.dx, a.dx
+        else:
+            push = overlap_y / 2 if a.y < b.y else -overlap_y / 2
+            a.y -= push
+            b.y += push
+            if (b.y - a.y) * (a.dy - b.dy) > 0:
+                a.dy, b.dy = b.dy, a.dy
+            # Don't push either ball into a wall
+            top = self.engine.GRID
+            bottom = self.engine.HEIGHT - top - a.height
+            a.y = min(max(a.y, top), bottom)
+            b.y = min(max(b.y, top), bottom)
+
+    def snapshot(self):
+        """Return the state of every ball and extra paddle, for restore()."""
+        engine = self.engine
+        return (tuple(ball.state() for ball in engine.balls),
+                tuple(paddle.state() for paddle in engine.paddles[2:]),
+                tuple(self.reset_ticks), self.serves)
+
+    def restore(self, snapshot):
+        """Return to the state of a snapshot()."""
+        engine = self.engine
+        balls, paddles, reset_ticks, self.serves = snapshot
+        for ball, state in zip(engine.balls, balls):
+            ball.load_state(state)
+        for paddle, state in zip(engine.paddles[2:], paddles):
+            paddle.load_state(state)
+        self.reset_ticks = list(reset_ticks)
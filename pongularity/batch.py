@@ -0,0 +1,205 @@
+"""
+Vectorized simulation of many Pongularity matches at once.
+
+BatchPong keeps the state of N matches in struct-of-arrays NumPy buffers and
+advances all of them with a handful of array operations per tick. Each lane
+follows PongularityEngine.update() exactly, including the order of the wall,
+scoring, serve and paddle checks.
+"""
+import numpy as np
+from .config import DEFAULT_CONFIG, GameConfig
+from .engine import PongularityEngine
+
+# Values of the game_state array
+START_SCREEN = 0
+PLAYING = 1
+GAME_OVER = 2
+
+
+def _select(value, mask):
+    """The lanes of a per-lane constant picked by mask; a shared constant as is."""
+    return value[mask] if isinstance(value, np.ndarray) else value
+
+
+class BatchPong:
+    """N independent matches stepped together with one vectorized call."""
+
+    def __init__(self, n, tick_rate=PongularityEngine.BASE_TICK_RATE, config=None):
+        if n < 1:
+            raise ValueError("BatchPong needs at least one match")
+        self.n = n
+
+        # Constants, taken from scalar engines so both stay in sync. config is
+        # one GameConfig for every lane or a sequence of n, one per lane; a
+        # constant that differs between lanes becomes an array of n values
+        if config is None or isinstance(config, GameConfig):
+            configs = [config or DEFAULT_CONFIG]
+        else:
+            configs = list(config)
+            if len(configs) != n:
+                raise ValueError(f"Expected one config per match ({n}), got {len(configs)}")
+        if any(c.balls > 1 or c.obstacles for c in configs):
+            raise ValueError("BatchPong plays one ball and no obstacles per match; "
+                             "use PongularityEngine for arenas")
+        engines = {c: PongularityEngine(tick_rate, config=c) for c in configs}
+        engines = [engines[c] for c in configs]
+        self.config = configs[0] if len(engines) == 1 else configs
+
+        def lanes(value):
+            values = [value(engine) for engine in engines]
+            first = values[0]
+            if all(v == first for v in values):
+                return first
+            return np.array(values, dtype=np.float64)
+
+        for name in ("WIDTH", "HEIGHT", "GRID", "PADDLE_HEIGHT", "MAX_PADDLE_Y",
+                     "PADDLE_SPEED", "BALL_SPEED", "BALL_ACCELERATION",
+                     "MAX_BALL_SPEED", "MAX_SCORE", "TICK_RATE", "RESET_DELAY_TICKS"):
+            setattr(self, name, lanes(lambda engine: getattr(engine, name)))
+        self.LEFT_X = lanes(lambda engine: engine.left_paddle.x)
+        self.RIGHT_X = lanes(lambda engine: engine.right_paddle.x)
+
+        # Game state
+        self.game_state = np.full(n, START_SCREEN, dtype=np.int8)
+
+        # Paddles
+        self.left_y = np.full(n, lanes(lambda engine: engine.left_paddle.y), dtype=np.float64)
+        self.left_dy = np.zeros(n, dtype=np.float64)
+        self.right_y = np.full(n, lanes(lambda engine: engine.right_paddle.y), dtype=np.float64)
+        self.right_dy = np.zeros(n, dtype=np.float64)
+
+        # Ball
+        self.ball_x = np.full(n, lanes(lambda engine: engine.ball.x), dtype=np.float64)
+        self.ball_y = np.full(n, lanes(lambda engine: engine.ball.y), dtype=np.float64)
+        self.ball_dx = np.full(n, lanes(lambda engine: engine.ball.dx), dtype=np.float64)
+        self.ball_dy = np.full(n, lanes(lambda engine: engine.ball.dy), dtype=np.float64)
+        self.resetting = np.zeros(n, dtype=bool)
+
+        # Score
+        self.left_score = np.zeros(n, dtype=np.int64)
+        self.right_score = np.zeros(n, dtype=np.int64)
+
+        self.tick = 0
+        self.reset_timer = np.zeros(n, dtype=np.int64)
+
+        # Scratch buffers reused by step() to avoid per-tick allocation
+        self._a = np.empty(n, dtype=bool)
+        self._b = np.empty(n, dtype=bool)
+        self._c = np.empty(n, dtype=bool)
+        self._f = np.empty(n, dtype=np.float64)
+
+    def reset_ball(self, mask=None):
+        """Reset the ball to the center in the selected matches."""
+        if mask is None:
+            mask = np.ones(self.n, dtype=bool)
+        self.resetting[mask] = False
+        self.ball_x[mask] = _select(self.WIDTH, mask) / 2
+        self.ball_y[mask] = _select(self.HEIGHT, mask) / 2
+        # Reset ball speed to initial value, keeping direction
+        speed = _select(self.BALL_SPEED, mask)
+        self.ball_dx[mask] = np.where(self.ball_dx[mask] > 0, speed, -speed)
+        self.ball_dy[mask] = np.where(self.ball_dy[mask] > 0, speed, -speed)
+
+    def reset_game(self, mask=None):
+        """Start a fresh match in the selected lanes (all lanes by default)."""
+        if mask is None:
+            mask = np.ones(self.n, dtype=bool)
+        self.left_score[mask] = 0
+        self.right_score[mask] = 0
+        paddle_y = _select(self.HEIGHT, mask) / 2 - _select(self.PADDLE_HEIGHT, mask) / 2
+        self.left_y[mask] = paddle_y
+        self.right_y[mask] = paddle_y
+        self.reset_ball(mask)
+        self.game_state[mask] = PLAYING
+
+    def step(self, left_dy=None, right_dy=None):
+        """Advance every match by one tick, optionally setting paddle inputs first."""
+        if left_dy is not None:
+            self.left_dy[:] = left_dy
+        if right_dy is not None:
+            self.right_dy[:] = right_dy
+
+        self.tick += 1
+        playing = self.game_state == PLAYING
+        a, b, c, f = self._a, self._b, self._c, self._f
+        G = self.GRID
+
+        # Update paddle positions and keep them within bounds
+        for y, dy in ((self.left_y, self.left_dy), (self.right_y, self.right_dy)):
+            np.add(y, dy, out=f)
+            np.clip(f, G, self.MAX_PADDLE_Y, out=f)
+            np.copyto(y, f, where=playing)
+
+        x, by = self.ball_x, self.ball_y
+        dx, bdy = self.ball_dx, self.ball_dy
+        resetting = self.resetting
+
+        # Update ball position
+        np.logical_not(resetting, out=a)
+        a &= playing
+        np.add(x, dx, out=x, where=a)
+        np.add(by, bdy, out=by, where=a)
+
+        # Ball collision with top and bottom
+        np.less(by, G, out=a)
+        a &= playing
+        np.add(by, G, out=f)
+        np.greater(f, self.HEIGHT - G, out=b)
+        b &= playing
+        b &= ~a
+        np.copyto(by, G, where=a)
+        np.copyto(by, self.HEIGHT - G * 2, where=b)
+        a |= b
+        np.negative(bdy, out=bdy, where=a)
+
+        # Ball out of bounds (scoring)
+        np.less(x, 0, out=a)
+        np.greater(x, self.WIDTH, out=b)
+        b |= a
+        b &= playing
+        b &= ~resetting
+        if b.any():
+            resetting |= b
+            self.reset_timer[b] = self.tick
+            a &= b
+            self.right_score += a
+            b &= ~a
+            self.left_score += b
+            a |= b
+            np.greater_equal(self.left_score, self.MAX_SCORE, out=b)
+            np.greater_equal(self.right_score, self.MAX_SCORE, out=c)
+            b |= c
+            b &= a
+            self.game_state[b] = GAME_OVER
+
+        # Reset ball after delay
+        np.logical_and(resetting, playing, out=a)
+        if a.any():
+            a &= (self.tick - self.reset_timer) >= self.RESET_DELAY_TICKS
+            if a.any():
+                self.reset_ball(a)
+
+        # Ball collision with paddles
+        a[:] = playing
+        a &= x < self.LEFT_X + G
+        a &= x + G > self.LEFT_X
+        b[:] = playing
+        b &= x < self.RIGHT_X + G
+        b &= x + G > self.RIGHT_X
+        if a.any() or b.any():
+            a &= by < self.left_y + self.PADDLE_HEIGHT
+            a &= by + G > self.left_y
+            b &= by < self.right_y + self.PADDLE_HEIGHT
+            b &= by + G > self.right_y
+            b &= ~a
+            np.copyto(x, self.LEFT_X + G, where=a)
+            np.copyto(x, self.RIGHT_X - G, where=b)
+            a |= b
+            np.negative(dx, out=dx, where=a)
+            self._accelerate_ball(a)
+
+    def _accelerate_ball(self, mask):
+        """Increase ball speed after a paddle hit in the selected lanes."""
+        for v in (self.ball_dx, self.ball_dy):
+            speed = np.minimum(np.abs(v) + self.BALL_ACCELERATION, self.MAX_BALL_SPEED)
+            np.copyto(v, np.where(v > 0, speed, -speed), where=mask)
@@ -0,0 +1,210 @@
+"""
+Match rules as immutable, validated values, with presets and file loading.
+
+A GameConfig holds the tunables of a match: field size, paddle and ball
+speeds, the winning score, the serve delay, the colors, and how many balls
+and obstacles are in play (see pongularity.arena). Speeds are in
+pixels per tick at BASE_TICK_RATE, the rate they are tuned for. Configs
+are hashable and checked when they are created, so a bad value fails
+before any match is played.
+
+The engine constants derived from a config (MAX_PADDLE_Y, speeds scaled to
+the tick rate, the serve delay in ticks) are computed once per config and
+tick rate and shared by every engine built from them. To sweep rule
+variants, give BatchPong one config per lane.
+
+Configs load from TOML or JSON files whose keys are GameConfig fields, plus
+an optional preset to start from::
+
+    preset = "fast"
+    max_score = 5
+    background = [0, 0, 64]
+"""
+import functools
+import json
+import os
+from collections import namedtuple
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+BASE_TICK_RATE = 60
+
+_DEFAULTS = {
+    "width": 750,
+    "height": 585,
+    "grid": 15,
+    "paddle_height": 75,
+    "paddle_speed": 6.0,
+    "ball_speed": 5.0,
+    "ball_acceleration": 0.25,
+    "max_ball_speed": 15.0,
+    "max_score": 10,
+    "serve_delay": 0.4,
+    "background": (0, 0, 0),
+    "foreground": (255, 255, 255),
+    "accent": (211, 211, 211),
+    "balls": 1,
+    "obstacles": 0,
+}
+
+COLOR_FIELDS = ("background", "foreground", "accent")
+
+
+class GameConfig(namedtuple("GameConfig", _DEFAULTS)):
+    """Immutable match rules; every field is checked on creation."""
+
+    __slots__ = ()
+
+    def __new__(cls, *args, **fields):
+        if len(args) > len(_DEFAULTS):
+            raise ValueError(f"GameConfig takes at most {len(_DEFAULTS)} fields")
+        fields = dict(zip(_DEFAULTS, args), **fields)
+        unknown = set(fields) - set(_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown config fields {sorted(unknown)}, expected some of {list(_DEFAULTS)}")
+        values = dict(_DEFAULTS, **fields)
+        for name in ("width", "height", "grid", "paddle_height", "max_score", "balls", "obstacles"):
+            value = values[name]
+            lowest = 0 if name == "obstacles" else 1
+            if not isinstance(value, int) or isinstance(value, bool) or value < lowest:
+                raise ValueError(f"{name} must be an integer of at least {lowest}, got {value!r}")
+        for name in ("paddle_speed", "ball_speed", "ball_acceleration", "max_ball_speed", "serve_delay"):
+            value = values[name]
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+                raise ValueError(f"{name} must be a number of at least 0, got {value!r}")
+            values[name] = float(value)
+        for name in COLOR_FIELDS:
+            try:
+                color = tuple(values[name])
+            except TypeError:
+                color = ()
+            if len(color) != 3 or not all(isinstance(c, int) and 0 <= c <= 255 for c in color):
+                raise ValueError(f"{name} must be three integers from 0 to 255, got {values[name]!r}")
+            values[name] = color
+
+        grid = values["grid"]
+        if values["width"] < grid * 8:
+            raise ValueError(f"width must be at least 8 grid cells ({grid * 8}) to fit both paddles")
+        if values["paddle_height"] > values["height"] - grid * 2:
+            raise ValueError("paddle_height must fit between the top and bottom walls")
+        if values["ball_speed"] <= 0 or values["paddle_speed"] <= 0:
+            raise ValueError("ball_speed and paddle_speed must be positive")
+        if values["max_ball_speed"] < values["ball_speed"]:
+            raise ValueError("max_ball_speed must be at least ball_speed")
+        return super().__new__(cls, **values)
+
+    def replace(self, **changes):
+        """Return a copy with some fields changed, validated like a new config."""
+        return GameConfig(**dict(self._asdict(), **changes))
+
+    def to_dict(self):
+        """Return the fields as JSON-friendly values."""
+        return {name: list(value) if name in COLOR_FIELDS else value for name, value in self._asdict().items()}
+
+    def constants(self, tick_rate=BASE_TICK_RATE):
+        """Return the engine constants for this config at tick_rate, computed once and shared."""
+        return _constants(self, tick_rate)
+
+    @classmethod
+    def from_dict(cls, data, base=None):
+        """Build a config from a mapping of fields on top of data["preset"], base or the defaults."""
+        data = dict(data)
+        if "preset" in data:
+            base = get_preset(data.pop("preset"))
+        return (base or DEFAULT_CONFIG).replace(**data)
+
+    @classmethod
+    def load(cls, path, base=None):
+        """Read a config from a .toml or .json file; see from_dict()."""
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".toml":
+            if tomllib is None:
+                raise ValueError("TOML configs need Python 3.11 or later; use JSON instead")
+            with open(path, "rb") as f:
+                return cls.from_dict(tomllib.load(f), base)
+        if extension == ".json":
+            with open(path) as f:
+                return cls.from_dict(json.load(f), base)
+        raise ValueError(f"Unknown config format {extension!r}, expected .toml or .json")
+
+
+@functools.lru_cache(maxsize=4096)
+def _constants(config, tick_rate):
+    if tick_rate <= 0:
+        raise ValueError("tick_rate must be positive")
+    # Speeds in pixels per tick, scaled so game time runs at the same pace
+    # for any tick rate
+    scale = BASE_TICK_RATE / tick_rate
+    grid = config.grid
+    return {
+        "WIDTH": config.width,
+        "HEIGHT": config.height,
+        "GRID": grid,
+        "PADDLE_HEIGHT": config.paddle_height,
+        "MAX_PADDLE_Y": config.height - grid - config.paddle_height,
+        "MAX_SCORE": config.max_score,
+        "TICK_RATE": tick_rate,
+        "RESET_DELAY_TICKS": round(config.serve_delay * tick_rate),
+        "PADDLE_SPEED": config.paddle_speed * scale,
+        "BALL_SPEED": config.ball_speed * scale,
+        "BALL_ACCELERATION": config.ball_acceleration * scale,
+        "MAX_BALL_SPEED": config.max_ball_speed * scale,
+    }
+
+
+DEFAULT_CONFIG = GameConfig()
+
+PRESETS = {
+    "classic": DEFAULT_CONFIG,
+    "fast": DEFAULT_CONFIG.replace(paddle_speed=9, ball_speed=8, ball_acceleration=0.5, max_ball_speed=20),
+    "marathon": DEFAULT_CONFIG.replace(max_score=21),
+    "sudden_death": DEFAULT_CONFIG.replace(max_score=1, serve_delay=0.2),
+    "big_paddles": DEFAULT_CONFIG.replace(paddle_height=150),
+    "wide": DEFAULT_CONFIG.replace(width=1200, height=675),
+    "amber": DEFAULT_CONFIG.replace(foreground=(255, 176, 0), accent=(160, 110, 0)),
+    "party": DEFAULT_CONFIG.replace(width=1200, height=675, balls=50, obstacles=6, max_score=100),
+}
+
+
+def get_preset(name):
+    """Return the preset config called name."""
+    try:
+        return PRESETS[name]
+    except KeyError:
+        raise ValueError(f"Unknown preset {name!r}, expected one of {sorted(PRESETS)}") from None
+
+
+def parse_override(option):
+    """Parse NAME=VALUE from --set into (name, value), with VALUE as JSON when it parses."""
+    name, separator, text = option.partition("=")
+    if not separator or name not in _DEFAULTS:
+        raise ValueError(f"Expected NAME=VALUE with NAME one of {list(_DEFAULTS)}, got {option!r}")
+    try:
+        value = json.loads(text)
+    except ValueError:
+        value = text
+    return name, value
+
+
+def add_config_arguments(parser):
+    """Add --preset, --config and --set to an argparse parser."""
+    group = parser.add_argument_group("rules")
+    group.add_argument("--preset", choices=sorted(PRESETS), default=None,
+                       help="start from a preset (default: classic)")
+    group.add_argument("--config", metavar="PATH", default=None,
+                       help="read rules from a .toml or .json file, applied after --preset")
+    group.add_argument("--set", metavar="NAME=VALUE", action="append", default=[], dest="overrides",
+                       help="change one rule, e.g. --set max_score=5 --set 'accent=[255,0,0]'")
+
+
+def config_from_args(args):
+    """Build the GameConfig selected by the arguments from add_config_arguments()."""
+    config = get_preset(args.preset or "classic")
+    if args.config:
+        config = GameConfig.load(args.config, base=config)
+    if args.overrides:
+        config = config.replace(**dict(parse_override(option) for option in args.overrides))
+    return config
@@ -0,0 +1,166 @@
+"""
+CPU paddle controllers with a reaction delay, an aim error and a per-tick time budget.
+
+A controller is asked for its paddle's speed once per tick with
+control(world, side). Built-in opponents see the ball as it was
+reaction_time seconds ago, aim off by up to error pixels, and only ever
+answer up, down or still at PADDLE_SPEED, like a player on the keyboard, so
+recordings of CPU games replay exactly.
+
+Every decision is timed against the controller's budget and the overruns
+are counted. Late answers are still played, so seeded matches come out the
+same however busy the machine is. With drop_late=True an answer that arrives
+late is dropped instead and the paddle keeps doing what it did on the
+previous tick, the way a player's reaction lags.
+"""
+import random
+import time
+from collections import deque
+from .trajectory import predict
+
+# Reaction time in seconds and aim error in pixels for each difficulty
+DIFFICULTIES = {
+    "easy": {"reaction_time": 0.25, "error": 30},
+    "normal": {"reaction_time": 0.12, "error": 15},
+    "hard": {"reaction_time": 0.05, "error": 6},
+    "perfect": {"reaction_time": 0.0, "error": 0},
+}
+
+# Seconds a controller may spend deciding one tick
+DEFAULT_BUDGET = 0.001
+
+
+class Controller:
+    """Base class for paddle controllers, which implement observe() and decide()."""
+
+    def __init__(self, difficulty="normal", reaction_time=None, error=None, budget=DEFAULT_BUDGET,
+                 drop_late=False, seed=None, clock=time.perf_counter):
+        try:
+            settings = DIFFICULTIES[difficulty]
+        except KeyError:
+            raise ValueError(f"Unknown difficulty {difficulty!r}, expected one of {sorted(DIFFICULTIES)}") from None
+        self.difficulty = difficulty
+        self.reaction_time = settings["reaction_time"] if reaction_time is None else reaction_time
+        self.error = settings["error"] if error is None else error
+        self.budget = budget
+        self.drop_late = drop_late
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.direction = 0
+        self.ticks = 0
+        self.overruns = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def control(self, world, side):
+        """Return the paddle speed for this tick, timing the decision against the budget."""
+        start = self.clock()
+        observation = self.observe(world, side)
+        direction = self.decide(world, side, observation)
+        elapsed = self.clock() - start
+
+        self.ticks += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        if self.budget is not None and elapsed > self.tick_budget(world):
+            self.overruns += 1
+            if self.drop_late:
+                return self.direction * world.PADDLE_SPEED
+        self.direction = direction
+        return self.direction * world.PADDLE_SPEED
+
+    def tick_budget(self, world):
+        """Return the seconds one decision for world may take."""
+        return self.budget
+
+    def observe(self, world, side):
+        """Record this tick's state and return what the controller gets to see."""
+        raise NotImplementedError
+
+    def decide(self, world, side, observation):
+        """Return -1 to move up, 1 to move down or 0 to stay."""
+        raise NotImplementedError
+
+    def stats(self):
+        """Return decision counts and timings in seconds."""
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "mean": self.total_time / self.ticks if self.ticks else 0.0,
+            "max": self.max_time,
+            "budget": self.budget,
+        }
+
+
+class EngineController(Controller):
+    """Controller for one PongularityEngine, deciding from a delayed copy of the ball."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.offset = 0.0
+        self.view = None
+        self._history = None
+
+    def observe(self, engine, side):
+        if self._history is None:
+            delay = round(self.reaction_time * engine.TICK_RATE)
+            self._history = deque(maxlen=delay + 1)
+            self.view = engine.ball.copy()
+        self._history.append(engine.ball.state())
+
+        view = self.view
+        heading, resetting = view.dx > 0, view.resetting
+        view.load_state(self._history[0])
+        # Aim somewhere new for every serve and every return
+        if (view.dx > 0) != heading or (resetting and not view.resetting):
+            self.offset = self.rng.uniform(-self.error, self.error)
+        return view
+
+    def steer(self, engine, side, target):
+        """Return the direction that brings side's paddle center to target, give or take the aim error."""
+        paddle = engine.left_paddle if side == "left" else engine.right_paddle
+        center = paddle.y + paddle.height / 2
+        target += self.offset
+        if target < center - engine.PADDLE_SPEED:
+            return -1
+        if target > center + engine.PADDLE_SPEED:
+            return 1
+        return 0
+
+
+class TrackerController(EngineController):
+    """Reactive opponent that follows the ball's height."""
+
+    def decide(self, engine, side, ball):
+        if ball.resetting:
+            return self.steer(engine, side, engine.HEIGHT / 2)
+        return self.steer(engine, side, ball.y + ball.height / 2)
+
+
+class PredictiveController(EngineController):
+    """Opponent that moves to where the ball will reach its paddle."""
+
+    def decide(self, engine, side, ball):
+        intercept = predict(engine, side, ball)
+        if intercept is None:
+            return self.steer(engine, side, engine.HEIGHT / 2)
+        return self.steer(engine, side, intercept.y + ball.height / 2)
+
+
+CONTROLLERS = {
+    "tracker": TrackerController,
+    "predictor": PredictiveController,
+}
+
+
+def make_controller(kind, **options):
+    """Create a controller by name; 'policy' needs NumPy."""
+    if kind == "policy":
+        from .policy import PolicyController
+        return PolicyController(**options)
+    try:
+        controller_class = CONTROLLERS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown controller {kind!r}, expected one of {sorted(CONTROLLERS) + ['policy']}") from None
+    return controller_class(**options)
@@ -0,0 +1,347 @@
+"""
+Display-free simulation core for Pongularity.
+
+Nothing in this module touches pygame, so matches can be stepped on machines
+without SDL or a display.
+"""
+import math
+import struct
+from collections import namedtuple
+from .config import BASE_TICK_RATE, DEFAULT_CONFIG
+from .entities import Ball, Paddle
+
+GAME_STATES = ("start_screen", "playing", "game_over")
+
+# Fields of PongularityEngine.snapshot(), in order
+SNAPSHOT_FIELDS = ("left_y", "left_dy", "right_y", "right_dy", "ball_x", "ball_y", "ball_dx", "ball_dy",
+                   "resetting", "left_score", "right_score", "game_state", "tick", "reset_timer")
+
+_SNAPSHOT = struct.Struct("<8d?HHBqq")
+SNAPSHOT_SIZE = _SNAPSHOT.size
+
+# Events passed to PongularityEngine.on_event as they happen. offset is where
+# the ball met the paddle, from -1 (top edge) to 1 (bottom edge), and speeds
+# are in pixels per second
+Serve = namedtuple("Serve", "tick speed")
+PaddleHit = namedtuple("PaddleHit", "tick side offset speed")
+WallBounce = namedtuple("WallBounce", "tick wall x")
+Point = namedtuple("Point", "tick scorer left_score right_score")
+GameOver = namedtuple("GameOver", "tick winner left_score right_score")
+
+
+def pack_snapshot(snapshot):
+    """Serialize a snapshot to SNAPSHOT_SIZE bytes."""
+    fields = list(snapshot)
+    fields[11] = GAME_STATES.index(fields[11])
+    return _SNAPSHOT.pack(*fields)
+
+
+def unpack_snapshot(data):
+    """Turn bytes from pack_snapshot() back into a snapshot."""
+    fields = list(_SNAPSHOT.unpack(data))
+    fields[11] = GAME_STATES[fields[11]]
+    return tuple(fields)
+
+
+class PongularityEngine:
+    """Paddles, ball and score for one match, advanced one tick per update()."""
+
+    # Tick rate the speeds in GameConfig are tuned for
+    BASE_TICK_RATE = BASE_TICK_RATE
+
+    def __init__(self, tick_rate=BASE_TICK_RATE, swept=False, config=None):
+        if tick_rate <= 0:
+            raise ValueError("tick_rate must be positive")
+
+        # Constants, derived once per config and tick rate and shared by
+        # every engine with the same rules
+        self.config = config or DEFAULT_CONFIG
+        self.__dict__.update(self.config.constants(tick_rate))
+        # Resolve wall and paddle hits at their exact time of impact instead
+        # of testing for overlap after each move
+        self.SWEPT = swept
+
+        # Game state
+        self.game_state = "start_screen"  # Can be "start_screen", "playing", or "game_over"
+
+        # Game objects
+        self.left_paddle = Paddle(
+            self.GRID * 2,
+            self.HEIGHT / 2 - self.PADDLE_HEIGHT / 2,
+            self.GRID,
+            self.PADDLE_HEIGHT
+        )
+
+        self.right_paddle = Paddle(
+            self.WIDTH - self.GRID * 3,
+            self.HEIGHT / 2 - self.PADDLE_HEIGHT / 2,
+            self.GRID,
+            self.PADDLE_HEIGHT
+        )
+
+        self.ball = Ball(
+            self.WIDTH / 2,
+            self.HEIGHT / 2,
+            self.GRID,
+            self.GRID,
+            self.BALL_SPEED,
+            -self.BALL_SPEED
+        )
+
+        self.score = {
+            "left": 0,
+            "right": 0
+        }
+
+        # Every ball, paddle and obstacle. The classic match has one ball and
+        # two paddles; a config with more balls or any obstacles adds them
+        # and hands ball physics to an Arena (see pongularity.arena)
+        self.balls = [self.ball]
+        self.paddles = [self.left_paddle, self.right_paddle]
+        self.obstacles = []
+        self.arena = None
+        if self.config.balls > 1 or self.config.obstacles:
+            from .arena import Arena
+            self.arena = Arena(self)
+
+        # Simulation clock, in ticks since the engine was created
+        self.tick = 0
+        self.reset_timer = 0
+
+        # Called with each Serve, PaddleHit, WallBounce, Point and GameOver
+        # event; None costs one check per event site, only when one happens
+        self.on_event = None
+
+    def collides(self, obj1, obj2):
+        """Check collision between two rectangular objects (entities or dicts)."""
+        return (obj1["x"] < obj2["x"] + obj2["width"] and
+                obj1["x"] + obj1["width"] > obj2["x"] and
+                obj1["y"] < obj2["y"] + obj2["height"] and
+                obj1["y"] + obj1["height"] > obj2["y"])
+
+    def snapshot(self):
+        """Return everything update() depends on as a flat tuple, in SNAPSHOT_FIELDS order.
+
+        Constants such as the tick rate are not included, so restore a
+        snapshot into an engine created with the same arguments.
+        """
+        left = self.left_paddle
+        right = self.right_paddle
+        ball = self.ball
+        score = self.score
+        return (left.y, left.dy, right.y, right.dy, ball.x, ball.y, ball.dx, ball.dy, ball.resetting,
+                score["left"], score["right"], self.game_state, self.tick, self.reset_timer)
+
+    def restore(self, snapshot):
+        """Return to the state of a snapshot; updates from there replay exactly."""
+        left = self.left_paddle
+        right = self.right_paddle
+        ball = self.ball
+        score = self.score
+        (left.y, left.dy, right.y, right.dy, ball.x, ball.y, ball.dx, ball.dy, ball.resetting,
+         score["left"], score["right"], self.game_state, self.tick, self.reset_timer) = snapshot
+
+    def reset_ball(self):
+        """Reset the ball to the center after scoring."""
+        ball = self.ball
+        ball.resetting = False
+        ball.x = self.WIDTH / 2
+        ball.y = self.HEIGHT / 2
+        # Reset ball speed to initial value
+        speed_sign_x = 1 if ball.dx > 0 else -1
+        speed_sign_y = 1 if ball.dy > 0 else -1
+        ball.dx = self.BALL_SPEED * speed_sign_x
+        ball.dy = self.BALL_SPEED * speed_sign_y
+        if self.on_event is not None:
+            self.on_event(Serve(self.tick, math.hypot(ball.dx, ball.dy) * self.TICK_RATE))
+
+    def reset_game(self):
+        """Reset the entire game state."""
+        self.score["left"] = 0
+        self.score["right"] = 0
+        self.left_paddle.y = self.HEIGHT / 2 - self.PADDLE_HEIGHT / 2
+        self.right_paddle.y = self.HEIGHT / 2 - self.PADDLE_HEIGHT / 2
+        if self.arena is None:
+            self.reset_ball()
+        else:
+            # Serves every ball, the first one included
+            self.arena.reset()
+        self.game_state = "playing"
+
+    def update(self):
+        """Advance the simulation by one tick."""
+        self.tick += 1
+
+        if self.game_state == "playing":
+            left_paddle = self.left_paddle
+            right_paddle = self.right_paddle
+            ball = self.ball
+            GRID = self.GRID
+
+            # Update paddle positions
+            left_paddle.y += left_paddle.dy
+            right_paddle.y += right_paddle.dy
+
+            # Keep paddles within bounds
+            if left_paddle.y < GRID:
+                left_paddle.y = GRID
+            elif left_paddle.y > self.MAX_PADDLE_Y:
+                left_paddle.y = self.MAX_PADDLE_Y
+
+            if right_paddle.y < GRID:
+                right_paddle.y = GRID
+            elif right_paddle.y > self.MAX_PADDLE_Y:
+                right_paddle.y = self.MAX_PADDLE_Y
+
+            if self.arena is not None:
+                self.arena.step()
+                return
+
+            if self.SWEPT:
+                # Moves the ball and bounces it off walls and paddles in one go
+                if not ball.resetting:
+                    self.sweep_ball()
+            else:
+                # Update ball position
+                if not ball.resetting:
+                    ball.x += ball.dx
+                    ball.y += ball.dy
+
+                # Ball collision with top and bottom
+                if ball.y < GRID:
+                    ball.y = GRID
+                    ball.dy *= -1
+                    if self.on_event is not None:
+                        self.on_event(WallBounce(self.tick, "top", ball.x))
+                elif ball.y + GRID > self.HEIGHT - GRID:
+                    ball.y = self.HEIGHT - GRID * 2
+                    ball.dy *= -1
+                    if self.on_event is not None:
+                        self.on_event(WallBounce(self.tick, "bottom", ball.x))
+
+            # Ball out of bounds (scoring)
+            if (ball.x < 0 or ball.x > self.WIDTH) and not ball.resetting:
+                ball.resetting = True
+                self.reset_timer = self.tick
+
+                if ball.x < 0:
+                    self.score["right"] += 1
+                else:
+                    self.score["left"] += 1
+
+                if self.score["left"] >= self.MAX_SCORE or self.score["right"] >= self.MAX_SCORE:
+                    self.game_state = "game_over"
+
+                if self.on_event is not None:
+                    self.emit_point("right" if ball.x < 0 else "left")
+
+            # Reset ball after delay
+            if ball.resetting and self.tick - self.reset_timer >= self.RESET_DELAY_TICKS:
+                self.reset_ball()
+
+            # Ball collision with paddles (sweep_ball has already handled them)
+            if not self.SWEPT:
+                if ball.collides(left_paddle):
+                    ball.dx *= -1
+                    ball.x = left_paddle.x + left_paddle.width
+                    # Speed up ball after paddle hit
+                    self.accelerate_ball()
+                    if self.on_event is not None:
+                        self.emit_paddle_hit(left_paddle)
+                elif ball.collides(right_paddle):
+                    ball.dx *= -1
+                    ball.x = right_paddle.x - ball.width
+                    # Speed up ball after paddle hit
+                    self.accelerate_ball()
+                    if self.on_event is not None:
+                        self.emit_paddle_hit(right_paddle)
+
+    def sweep_ball(self, time=1.0):
+        """Move the ball for time ticks, bouncing at the exact moment it meets a wall or paddle.
+
+        A paddle hit follows the same rule as the overlap check: the ball turns
+        around and is put against the paddle face, then the rest of the step
+        continues with the new velocity. The ball cannot skip past a paddle
+        however far it travels per tick.
+        """
+        ball = self.ball
+        top = self.GRID
+        bottom = self.HEIGHT - self.GRID * 2
+
+        while True:
+            dx = ball.dx
+            dy = ball.dy
+            hit_time = time
+            hit = None
+
+            if dy < 0 and ball.y + dy * time < top:
+                hit_time = (top - ball.y) / dy
+                hit = "wall"
+            elif dy > 0 and ball.y + dy * time > bottom:
+                hit_time = (bottom - ball.y) / dy
+                hit = "wall"
+
+            for paddle in (self.left_paddle, self.right_paddle):
+                t = ball.time_of_impact(paddle, dx, dy, hit_time)
+                if t is not None:
+                    hit_time = t
+                    hit = paddle
+
+            ball.x += dx * hit_time
+            ball.y += dy * hit_time
+            if hit is None:
+                return
+            time -= hit_time
+            if hit == "wall":
+                ball.y = top if dy < 0 else bottom
+                ball.dy = -dy
+                if self.on_event is not None:
+                    self.on_event(WallBounce(self.tick, "top" if dy < 0 else "bottom", ball.x))
+            else:
+                ball.dx = -dx
+                if hit is self.left_paddle:
+                    ball.x = hit.x + hit.width
+                else:
+                    ball.x = hit.x - ball.width
+                # Speed up ball after paddle hit
+                self.accelerate_ball()
+                if self.on_event is not None:
+                    self.emit_paddle_hit(hit)
+
+    def emit_paddle_hit(self, paddle, ball=None):
+        """Send on_event a PaddleHit for ball (by default the ball) having just bounced off paddle."""
+        if ball is None:
+            ball = self.ball
+        reach = (paddle.height + ball.height) / 2
+        offset = (ball.y + ball.height / 2 - paddle.y - paddle.height / 2) / reach
+        side = "left" if paddle.x < self.WIDTH / 2 else "right"
+        self.on_event(PaddleHit(self.tick, side, max(-1.0, min(1.0, offset)),
+                                math.hypot(ball.dx, ball.dy) * self.TICK_RATE))
+
+    def emit_point(self, scorer):
+        """Send on_event a Point, and a GameOver if the point ended the match."""
+        left, right = self.score["left"], self.score["right"]
+        self.on_event(Point(self.tick, scorer, left, right))
+        if self.game_state == "game_over":
+            # The same rule render_game_over() uses to name the winner
+            self.on_event(GameOver(self.tick, "left" if left >= self.MAX_SCORE else "right", left, right))
+
+    def accelerate_ball(self):
+        """Increase ball speed after paddle hit."""
+        ball = self.ball
+        ball.dx, ball.dy = self.accelerated(ball.dx, ball.dy)
+
+    def accelerated(self, dx, dy):
+        """Return the ball velocity (dx, dy) after one paddle-hit speed-up."""
+        # Increase speed while preserving direction
+        dx_sign = 1 if dx > 0 else -1
+        dy_sign = 1 if dy > 0 else -1
+
+        dx_abs = abs(dx) + self.BALL_ACCELERATION
+        dy_abs = abs(dy) + self.BALL_ACCELERATION
+
+        # Cap maximum speed
+        dx_abs = min(dx_abs, self.MAX_BALL_SPEED)
+        dy_abs = min(dy_abs, self.MAX_BALL_SPEED)
+
+        return dx_abs * dx_sign, dy_abs * dy_sign
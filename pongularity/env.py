@@ -0,0 +1,212 @@
+"""
+Gymnasium-style reinforcement learning environments.
+
+The agent plays the left paddle against a CPU controller. reset() returns
+(observation, info) and step(action) returns (observation, reward,
+terminated, truncated, info), as in Gymnasium, without depending on it.
+Actions are 0 = stay, 1 = up, 2 = down, the same codes recordings use.
+The reward is +1 when the agent scores and -1 when the opponent does.
+
+Vector observations are OBSERVATION_FIELDS scaled to roughly [-1, 1]. Pixel
+observations come from PongularityGame drawing onto an offscreen 8-bit
+grayscale surface, and are a pygame.surfarray.pixels2d view of it,
+transposed to (height, width) and optionally strided down. Nothing is copied
+per step: the array returned by reset() is redrawn in place by every step(),
+so copy it to keep a frame. The pixel frames show the borders, paddles and
+ball but not the score, which is in info.
+
+VectorPongEnv runs n vector-observation environments on BatchPong, with the
+opponent decided for all of them by a BatchPolicyController.
+
+Opponents get no time budget by default (budget=None), so an episode
+depends only on the seed passed to reset() and the agent's actions.
+"""
+import random
+import numpy as np
+from .batch import BatchPong, PLAYING
+from .config import DEFAULT_CONFIG
+from .controllers import make_controller
+from .engine import PongularityEngine
+from .policy import BatchPolicyController
+
+OBSERVATION_FIELDS = ("ball_x", "ball_y", "ball_dx", "ball_dy", "left_y", "right_y", "resetting")
+
+# Paddle direction for each action
+ACTIONS = (0, -1, 1)
+
+
+def fill_observation(out, world, ball_x, ball_y, ball_dx, ball_dy, left_y, right_y, resetting):
+    """Write OBSERVATION_FIELDS for scalars or arrays of state into the last axis of out."""
+    out[..., 0] = np.multiply(ball_x, 2 / world.WIDTH) - 1
+    out[..., 1] = np.multiply(ball_y, 2 / world.HEIGHT) - 1
+    out[..., 2] = np.multiply(ball_dx, 1 / world.MAX_BALL_SPEED)
+    out[..., 3] = np.multiply(ball_dy, 1 / world.MAX_BALL_SPEED)
+    out[..., 4] = np.multiply(left_y, 2 / world.HEIGHT) - 1
+    out[..., 5] = np.multiply(right_y, 2 / world.HEIGHT) - 1
+    out[..., 6] = resetting
+    return out
+
+
+class PongEnv:
+    """One match, with the agent on the left paddle."""
+
+    def __init__(self, observation="vector", opponent="tracker", difficulty="normal", downsample=1,
+                 frame_skip=1, max_steps=None, tick_rate=PongularityEngine.BASE_TICK_RATE, swept=False,
+                 budget=None):
+        if observation not in ("vector", "pixels"):
+            raise ValueError(f"Unknown observation type {observation!r}, expected 'vector' or 'pixels'")
+        self.observation_type = observation
+        self.opponent_kind = opponent
+        self.difficulty = difficulty
+        self.budget = budget
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.steps = 0
+        self.rng = random.Random()
+
+        if observation == "pixels":
+            import pygame
+            from .game import PongularityGame
+            constants = DEFAULT_CONFIG.constants(tick_rate)
+            surface = pygame.Surface((constants["WIDTH"], constants["HEIGHT"]), depth=8)
+            surface.set_palette([(i, i, i) for i in range(256)])
+            self.game = PongularityGame(tick_rate, max_fps=0, swept=swept, surface=surface)
+            # Locks the surface for as long as the environment lives
+            self._drawn = None
+            self._pixels = pygame.surfarray.pixels2d(surface).T[::downsample, ::downsample]
+            self.observation_shape = self._pixels.shape
+            self.observation_dtype = np.uint8
+        else:
+            self.game = PongularityEngine(tick_rate, swept=swept)
+            self.observation_shape = (len(OBSERVATION_FIELDS),)
+            self.observation_dtype = np.float32
+        self.opponent = None
+
+    def reset(self, seed=None, options=None):
+        """Start a new match and return (observation, info)."""
+        if seed is not None:
+            self.rng.seed(seed)
+        game = self.game
+        game.reset_game()
+        # Serve in a random direction
+        game.ball.dx *= self.rng.choice((-1, 1))
+        game.ball.dy *= self.rng.choice((-1, 1))
+        self.opponent = make_controller(self.opponent_kind, difficulty=self.difficulty, budget=self.budget,
+                                        seed=self.rng.getrandbits(64))
+        self.steps = 0
+        if self.observation_type == "pixels":
+            self._drawn = None
+        return self.observation(), self.info()
+
+    def step(self, action):
+        """Apply action for frame_skip ticks; return (observation, reward, terminated, truncated, info)."""
+        game = self.game
+        speed = ACTIONS[action] * game.PADDLE_SPEED
+        before = game.score["left"] - game.score["right"]
+        for _ in range(self.frame_skip):
+            game.left_paddle.dy = speed
+            game.right_paddle.dy = self.opponent.control(game, "right")
+            game.update()
+            if game.game_state != "playing":
+                break
+        self.steps += 1
+
+        reward = float(game.score["left"] - game.score["right"] - before)
+        terminated = game.game_state == "game_over"
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return self.observation(), reward, terminated, truncated, self.info()
+
+    def observation(self):
+        """Return the current observation; pixel observations are a live view, not a copy."""
+        game = self.game
+        if self.observation_type == "pixels":
+            # Clearing the whole surface costs more than the rest of a step, so
+            # after the first frame only the paddles and ball are erased and redrawn
+            if self._drawn is None:
+                self._drawn = game.draw_playfield(1.0)
+            else:
+                for rect in self._drawn:
+                    game.screen.fill(game.BLACK, rect)
+                self._drawn = game.draw_objects(1.0)
+            return self._pixels
+        ball = game.ball
+        return fill_observation(np.empty(len(OBSERVATION_FIELDS), dtype=np.float32), game,
+                                ball.x, ball.y, ball.dx, ball.dy, game.left_paddle.y, game.right_paddle.y,
+                                ball.resetting)
+
+    def info(self):
+        return {"score": dict(self.game.score), "tick": self.game.tick}
+
+
+class VectorPongEnv:
+    """n vector-observation matches stepped together on BatchPong, resetting each as it ends.
+
+    When a match ends, step() reports its final observation in
+    info["final_observation"] and returns the first observation of the next
+    match in its place.
+    """
+
+    def __init__(self, n, opponent_policy=None, difficulty="normal", frame_skip=1, max_steps=None,
+                 tick_rate=PongularityEngine.BASE_TICK_RATE, budget=None):
+        self.n = n
+        self.batch = BatchPong(n, tick_rate)
+        self.opponent_policy = opponent_policy
+        self.difficulty = difficulty
+        self.budget = budget
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.observation_shape = (n, len(OBSERVATION_FIELDS))
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.rng = np.random.default_rng()
+        self.opponent = None
+        self._speeds = np.array(ACTIONS, dtype=np.float64) * self.batch.PADDLE_SPEED
+
+    def _serve(self, mask):
+        """Reset the matches in mask and serve each in a random direction."""
+        batch = self.batch
+        batch.reset_game(mask)
+        count = np.count_nonzero(mask)
+        batch.ball_dx[mask] *= self.rng.choice((-1.0, 1.0), count)
+        batch.ball_dy[mask] *= self.rng.choice((-1.0, 1.0), count)
+        self.steps[mask] = 0
+
+    def reset(self, seed=None, options=None):
+        """Start n new matches and return (observations, info)."""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.opponent = BatchPolicyController(self.opponent_policy, difficulty=self.difficulty,
+                                              budget=self.budget, seed=int(self.rng.integers(2 ** 63)))
+        self._serve(np.ones(self.n, dtype=bool))
+        return self.observation(), {}
+
+    def step(self, actions):
+        """Apply one action per match; return arrays of (observations, rewards, terminated, truncated) and info."""
+        batch = self.batch
+        left_dy = self._speeds[np.asarray(actions)]
+        before = batch.left_score - batch.right_score
+        for _ in range(self.frame_skip):
+            batch.step(left_dy, self.opponent.control(batch, "right"))
+        self.steps += 1
+
+        rewards = (batch.left_score - batch.right_score - before).astype(np.float32)
+        terminated = batch.game_state != PLAYING
+        if self.max_steps is None:
+            truncated = np.zeros(self.n, dtype=bool)
+        else:
+            truncated = ~terminated & (self.steps >= self.max_steps)
+        observations = self.observation()
+
+        info = {}
+        done = terminated | truncated
+        if done.any():
+            info["final_observation"] = observations.copy()
+            self._serve(done)
+            observations[done] = self.observation()[done]
+        return observations, rewards, terminated, truncated, info
+
+    def observation(self):
+        """Return an (n, len(OBSERVATION_FIELDS)) array of the current observations."""
+        batch = self.batch
+        return fill_observation(np.empty(self.observation_shape, dtype=np.float32), batch,
+                                batch.ball_x, batch.ball_y, batch.ball_dx, batch.ball_dy,
+                                batch.left_y, batch.right_y, batch.resetting)
@@ -0,0 +1,279 @@
+"""
+Offline video export: render matches offscreen as fast as possible.
+
+The game draws into a plain Surface instead of the window, one frame per
+tick (or fewer with fps), with no frame cap. The main thread copies each
+frame's pixels and puts them on a bounded queue; a writer thread converts
+and encodes them, so encoding overlaps simulation and rendering, and a full
+queue holds the simulation back rather than buffering the whole match.
+
+Frames go to an ffmpeg subprocess through a pipe (any output ffmpeg can
+write, such as clip.mp4), or to a numbered PNG sequence for paths with a
+printf-style pattern (frames/%05d.png), which needs nothing but the
+standard library.
+"""
+import argparse
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import time
+import zlib
+import pygame
+from .config import DEFAULT_CONFIG, add_config_arguments, config_from_args
+from .engine import PongularityEngine
+
+# In memory, a surface with these masks stores each pixel as B, G, R, X on
+# little endian machines and X, R, G, B on big endian ones
+MASKS = (0xFF0000, 0x00FF00, 0x0000FF, 0)
+PIXEL_FORMAT = "bgr0" if sys.byteorder == "little" else "0rgb"
+
+# Encoder options for containers whose usual codecs want even sizes and 4:2:0 chroma
+YUV420_OPTIONS = ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p"]
+YUV420_FORMATS = (".mp4", ".mkv", ".mov")
+
+
+def frame_surface(config=None):
+    """Return a Surface the size of config's screen whose raw pixels are in PIXEL_FORMAT."""
+    config = config or DEFAULT_CONFIG
+    return pygame.Surface((config.width, config.height), 0, 32, MASKS)
+
+
+class FFmpegSink:
+    """Pipes raw frames into an ffmpeg process that encodes them to path."""
+
+    def __init__(self, path, size, fps, ffmpeg="ffmpeg", options=None):
+        executable = shutil.which(ffmpeg)
+        if executable is None:
+            raise RuntimeError(f"{ffmpeg} not found; export a PNG sequence (frames/%05d.png) instead")
+        if options is None:
+            options = YUV420_OPTIONS if os.path.splitext(path)[1].lower() in YUV420_FORMATS else []
+        width, height = size
+        self.command = [executable, "-y", "-loglevel", "error",
+                        "-f", "rawvideo", "-pix_fmt", PIXEL_FORMAT, "-s", f"{width}x{height}",
+                        "-r", str(fps), "-i", "-", *options, path]
+        self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE)
+
+    def write(self, data):
+        self.process.stdin.write(data)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait():
+            raise RuntimeError(f"ffmpeg exited with status {self.process.returncode}")
+
+
+class PngSequenceSink:
+    """Writes each frame to pattern % index as an RGB PNG, starting from index 0."""
+
+    def __init__(self, pattern, size, level=1):
+        self.pattern = pattern
+        self.size = size
+        self.level = level
+        self.index = 0
+        directory = os.path.dirname(pattern)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, data):
+        width, height = self.size
+        with open(self.pattern % self.index, "wb") as f:
+            f.write(encode_png(width, height, to_rgb(data), self.level))
+        self.index += 1
+
+    def close(self):
+        pass
+
+
+def to_rgb(data):
+    """Reorder raw PIXEL_FORMAT pixels into packed RGB."""
+    rgb = bytearray(len(data) // 4 * 3)
+    red, green, blue = (2, 1, 0) if PIXEL_FORMAT == "bgr0" else (1, 2, 3)
+    rgb[0::3] = data[red::4]
+    rgb[1::3] = data[green::4]
+    rgb[2::3] = data[blue::4]
+    return rgb
+
+
+def _chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def encode_png(width, height, rgb, level=1):
+    """Encode packed 8-bit RGB rows as a PNG file, unfiltered; zlib runs without the GIL."""
+    stride = width * 3
+    compressor = zlib.compressobj(level)
+    chunks = []
+    for start in range(0, height * stride, stride):
+        chunks.append(compressor.compress(b"\0"))
+        chunks.append(compressor.compress(rgb[start:start + stride]))
+    chunks.append(compressor.flush())
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", header) + _chunk(b"IDAT", b"".join(chunks)) +
+            _chunk(b"IEND", b""))
+
+
+def open_sink(path, size, fps, **options):
+    """Return a PngSequenceSink for a path with a % pattern, otherwise an FFmpegSink."""
+    if "%" in path:
+        return PngSequenceSink(path, size)
+    return FFmpegSink(path, size, fps, **options)
+
+
+class FrameWriter:
+    """Hands frames to a sink on a writer thread, through a queue of at most queue_size frames."""
+
+    def __init__(self, sink, queue_size=32):
+        self.sink = sink
+        self.frames = 0
+        self.blocked = 0.0
+        self.error = None
+        self._queue = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._run, name="frame-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            data = self._queue.get()
+            if data is None:
+                break
+            if self.error is None:
+                try:
+                    self.sink.write(data)
+                except Exception as error:
+                    # Keep draining so write() never blocks on a dead writer
+                    self.error = error
+        try:
+            self.sink.close()
+        except Exception as error:
+            self.error = self.error or error
+
+    def write(self, surface):
+        """Queue a copy of surface's pixels, waiting while the queue is full."""
+        if self.error is not None:
+            raise self.error
+        data = surface.get_buffer().raw
+        started = time.perf_counter()
+        self._queue.put(data)
+        self.blocked += time.perf_counter() - started
+        self.frames += 1
+
+    def close(self):
+        """Wait for every queued frame to be written, then close the sink."""
+        self._queue.put(None)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def export(game, advance, sink, ticks, fps=None, queue_size=32):
+    """Render game into sink while advance() steps it, for at most ticks ticks.
+
+    advance() returns a false value when there is nothing more to play. One
+    frame is written for the starting state and then fps times per second of
+    game time (every tick by default). fps cannot exceed the tick rate, as
+    frames between ticks would repeat the last one. Returns export
+    statistics.
+    """
+    tick_rate = game.TICK_RATE
+    fps = fps or tick_rate
+    if not 1 <= fps <= tick_rate:
+        raise ValueError(f"fps must be from 1 to the tick rate ({tick_rate}), got {fps}")
+    started = time.perf_counter()
+    with FrameWriter(sink, queue_size) as writer:
+        game.render()
+        writer.write(game.screen)
+        played = 0
+        while played < ticks:
+            more = advance()
+            played += 1
+            if played * fps // tick_rate != (played - 1) * fps // tick_rate:
+                game.render()
+                writer.write(game.screen)
+            if not more:
+                break
+    elapsed = time.perf_counter() - started
+    return {
+        "ticks": played,
+        "frames": writer.frames,
+        "seconds": elapsed,
+        "speed": played / tick_rate / elapsed,
+        "blocked": writer.blocked,
+    }
+
+
+def main(argv=None):
+    """Command line entry point: export a recording or a CPU match as video."""
+    from .controllers import DIFFICULTIES, make_controller
+    from .game import PongularityGame
+    from .replay import Replay, ReplayPlayer
+    parser = argparse.ArgumentParser(description="Export a Pongularity match as video or PNG frames.")
+    parser.add_argument("output", help="video file for ffmpeg (clip.mp4) or PNG pattern (frames/%%05d.png)")
+    parser.add_argument("--replay", metavar="PATH", help="recording to export (default: a CPU match)")
+    parser.add_argument("--left", default="tracker", help="left CPU controller (default: %(default)s)")
+    parser.add_argument("--right", default="predictor", help="right CPU controller (default: %(default)s)")
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTIES), default="normal")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tick-rate", type=int, default=PongularityEngine.BASE_TICK_RATE,
+                        help="physics ticks per second of a CPU match (default: %(default)s)")
+    parser.add_argument("--start", type=float, default=0.0, help="seconds into the recording to start at")
+    parser.add_argument("--duration", type=float, default=None, help="seconds to export (default: to the end)")
+    parser.add_argument("--fps", type=int, default=None,
+                        help="frames per second, at most the tick rate (default: the tick rate)")
+    parser.add_argument("--queue", type=int, default=32, help="frames buffered for the writer (default: %(default)s)")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.tick_rate < 1:
+        parser.error("--tick-rate must be at least 1")
+
+    if args.replay:
+        # A recording brings its own rules
+        replay = Replay.load(args.replay)
+        options = replay.engine_options()
+        surface = frame_surface(options["config"])
+        game = PongularityGame(**options, max_fps=0, dirty_rects=True, surface=surface)
+        player = ReplayPlayer(replay, engine=game)
+        player.seek(round(args.start * game.TICK_RATE))
+        remaining = len(replay) - player.position
+
+        def advance():
+            return player.step(1)
+    else:
+        try:
+            config = config_from_args(args)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+        surface = frame_surface(config)
+        game = PongularityGame(args.tick_rate, max_fps=0, dirty_rects=True, surface=surface, config=config,
+                               left_controller=make_controller(args.left, difficulty=args.difficulty,
+                                                               seed=args.seed),
+                               right_controller=make_controller(args.right, difficulty=args.difficulty,
+                                                                seed=args.seed + 1))
+        game.reset_game()
+        remaining = float("inf")
+
+        def advance():
+            game.step()
+            return game.game_state == "playing"
+
+    if args.fps is not None and not 1 <= args.fps <= game.TICK_RATE:
+        parser.error(f"--fps must be from 1 to the tick rate ({game.TICK_RATE})")
+    ticks = remaining if args.duration is None else min(remaining, round(args.duration * game.TICK_RATE))
+    sink = open_sink(args.output, (game.WIDTH, game.HEIGHT), args.fps or game.TICK_RATE)
+    stats = export(game, advance, sink, ticks, args.fps, args.queue)
+    print(f"{stats['frames']} frames ({stats['ticks'] / game.TICK_RATE:.1f} s of play) in "
+          f"{stats['seconds']:.1f} s, {stats['speed']:.1f}x real time, "
+          f"{stats['blocked']:.1f} s waiting for the writer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Font file resolution cached on disk, and font sizes loaded on first use.
+
+pygame.font.SysFont() scans every installed font (through fc-list on Linux)
+each time it is called. FontLoader resolves the font file once, remembers the
+path in a small JSON file under the user cache directory, and opens each size
+only when something first asks for it.
+"""
+import json
+import os
+
+import pygame
+
+
+def default_cache_file():
+    """Return the path of the font cache, honouring XDG_CACHE_HOME."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "pongularity", "fonts.json")
+
+
+def _read_cache(cache_file):
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_cache(cache_file, cache):
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        # A read-only home directory only costs us the scan on the next launch
+        pass
+
+
+def resolve_font_file(name, cache_file=None):
+    """Return the file for a system font name, or None for pygame's default font.
+
+    A cached path is reused as long as the file still exists; otherwise the
+    system fonts are scanned once and the result is written back to the cache.
+    """
+    if cache_file is None:
+        cache_file = default_cache_file()
+
+    cache = _read_cache(cache_file)
+    if name in cache:
+        path = cache[name]
+        if path is None or os.path.exists(path):
+            return path
+
+    path = pygame.font.match_font(name)
+    cache[name] = path
+    _write_cache(cache_file, cache)
+    return path
+
+
+class FontLoader:
+    """Loads sizes of one font lazily, resolving its file at most once.
+
+    A name of None uses pygame's built-in font without looking at system fonts.
+    """
+
+    _UNRESOLVED = object()
+
+    def __init__(self, name, cache_file=None):
+        self.name = name
+        self.cache_file = cache_file
+        self._path = self._UNRESOLVED if name is not None else None
+        self._fonts = {}
+
+    @property
+    def path(self):
+        """The resolved font file, or None for pygame's default font."""
+        if self._path is self._UNRESOLVED:
+            self._path = resolve_font_file(self.name, self.cache_file)
+        return self._path
+
+    def load(self, size):
+        """Return the font at size, opening it on first request."""
+        font = self._fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(self.path, size)
+            self._fonts[size] = font
+        return font
+
+
+class LazyFont:
+    """Class attribute that loads its font size the first time an instance reads it.
+
+    The loaded font is stored on the instance, so later reads are plain
+    attribute lookups and assigning a different font still works.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        font = instance.fonts.load(self.size)
+        instance.__dict__[self.name] = font
+        return font
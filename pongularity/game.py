@@ -3,280 +3,363 @@ Pongularity game implemented with Pygame.
 """
 import pygame
 import sys
+import time
+from .engine import PongularityEngine
+from .fonts import FontLoader, LazyFont
+from .profiler import FrameProfiler
+from .renderers import make_renderer
+from .replay import InputRecorder
+from .text import DigitGlyphs, TextCache
+from .timestep import FixedTimestep
 
-class PongularityGame:
-    def __init__(self):
-        pygame.init()
-        
-        # Constants
-        self.WIDTH = 750
-        self.HEIGHT = 585
-        self.GRID = 15
-        self.PADDLE_HEIGHT = self.GRID * 5
-        self.MAX_PADDLE_Y = self.HEIGHT - self.GRID - self.PADDLE_HEIGHT
-        self.PADDLE_SPEED = 6
-        self.BALL_SPEED = 5
-        self.BALL_ACCELERATION = 0.25
-        self.MAX_BALL_SPEED = 15
-        self.MAX_SCORE = 10
+class PongularityGame(PongularityEngine):
+    """Pygame front end that renders and drives a PongularityEngine."""
+
+    # Fonts are opened the first time a screen draws with them
+    score_font = LazyFont(32)
+    game_over_font = LazyFont(60)
+    winner_font = LazyFont(30)
+    title_font = LazyFont(72)
+    instruction_font = LazyFont(20)
+
+    def __init__(self, tick_rate=PongularityEngine.BASE_TICK_RATE, max_fps=144, dirty_rects=False,
+                 record_path=None, profile=False, profile_path=None, swept=False,
+                 left_controller=None, right_controller=None, surface=None, config=None,
+                 telemetry_path=None, renderer="surface", window_size=None, fullscreen=False):
+        # Only the subsystems the game uses; audio and joystick stay off. With
+        # a surface to draw on, no window is opened at all
+        if surface is None:
+            pygame.display.init()
+        pygame.font.init()
+        super().__init__(tick_rate, swept, config)
+        
+        # Rendering runs independently of the physics tick rate; 0 means uncapped
+        self.max_fps = max_fps
+        self.previous_positions = self.positions()
+        self.previous_balls = [(ball.x, ball.y) for ball in self.balls]
+        
+        # Dirty-rectangle rendering: while playing, only erase and redraw what
+        # moved and push those regions with pygame.display.update()
+        self.dirty_rects = dirty_rects
+        self.drawn_rects = None
+        self.score_rects = []
+        self.drawn_score = None
+        
+        # CPU controllers from pongularity.controllers; a side without one is
+        # played from the keyboard
+        self.controllers = {"left": left_controller, "right": right_controller}
+        
+        # Input recording, written to record_path when the game exits
+        self.record_path = record_path
+        self.recorder = InputRecorder.for_engine(self) if record_path else None
+        
+        # Frame profiling costs nothing until enabled here or with F3, which
+        # also toggles the overlay; timings are exported to profile_path on exit
+        self.profiler = None
+        self.profile_path = profile_path
+        self.show_profiler = False
+        self.profiler_lines = []
+        self.profiler_texts = []
+        if profile or profile_path:
+            self.enable_profiler()
+        
+        # Match events streamed to telemetry_path by a background writer
+        self.telemetry = None
+        if telemetry_path:
+            from .telemetry import Telemetry
+            self.telemetry = Telemetry(telemetry_path)
+            self.telemetry.attach(self)
         
         # Colors
-        self.BLACK = (0, 0, 0)
-        self.WHITE = (255, 255, 255)
-        self.LIGHT_GREY = (211, 211, 211)
-        
-        # Game state
-        self.game_state = "start_screen"  # Can be "start_screen", "playing", or "game_over"
-        
-        # Game objects
-        self.left_paddle = {
-            "x": self.GRID * 2,
-            "y": self.HEIGHT / 2 - self.PADDLE_HEIGHT / 2,
-            "width": self.GRID,
-            "height": self.PADDLE_HEIGHT,
-            "dy": 0
-        }
-        
-        self.right_paddle = {
-            "x": self.WIDTH - self.GRID * 3,
-            "y": self.HEIGHT / 2 - self.PADDLE_HEIGHT / 2,
-            "width": self.GRID,
-            "height": self.PADDLE_HEIGHT,
-            "dy": 0
-        }
-        
-        self.ball = {
-            "x": self.WIDTH / 2,
-            "y": self.HEIGHT / 2,
-            "width": self.GRID,
-            "height": self.GRID,
-            "resetting": False,
-            "dx": self.BALL_SPEED,
-            "dy": -self.BALL_SPEED
-        }
-        
-        self.score = {
-            "left": 0,
-            "right": 0
-        }
-        
-        self.reset_timer = 0
-        
-        # Set up display
-        self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
-        pygame.display.set_caption("Pongularity")
-        self.clock = pygame.time.Clock()
+        self.BLACK = self.config.background
+        self.WHITE = self.config.foreground
+        self.LIGHT_GREY = self.config.accent
         
         # Font setup
-        self.score_font = pygame.font.SysFont('Arial', 32)
-        self.game_over_font = pygame.font.SysFont('Arial', 60)
-        self.winner_font = pygame.font.SysFont('Arial', 30)
-        self.title_font = pygame.font.SysFont('Arial', 72)
-        self.instruction_font = pygame.font.SysFont('Arial', 20)
-    
-    def collides(self, obj1, obj2):
-        """Check collision between two rectangular objects."""
-        return (obj1["x"] < obj2["x"] + obj2["width"] and
-                obj1["x"] + obj1["width"] > obj2["x"] and
-                obj1["y"] < obj2["y"] + obj2["height"] and
-                obj1["y"] + obj1["height"] > obj2["y"])
-    
-    def reset_ball(self):
-        """Reset the ball to the center after scoring."""
-        self.ball["resetting"] = False
-        self.ball["x"] = self.WIDTH / 2
-        self.ball["y"] = self.HEIGHT / 2
-        # Reset ball speed to initial value
-        speed_sign_x = 1 if self.ball["dx"] > 0 else -1
-        speed_sign_y = 1 if self.ball["dy"] > 0 else -1
-        self.ball["dx"] = self.BALL_SPEED * speed_sign_x
-        self.ball["dy"] = self.BALL_SPEED * speed_sign_y
+        self.fonts = FontLoader('Arial')
+        
+        # Text is rasterized once: scores from digit glyphs, static screens
+        # from pre-composed backgrounds
+        self.text_cache = TextCache()
+        self.score_glyphs = None
+        self.static_screens = {}
+        
+        # Set up display: the renderer opens the window (or draws onto
+        # surface) and sets self.screen, the playfield-sized surface that
+        # draw_frame() draws onto
+        self.renderer = make_renderer(renderer, self, surface=surface, window_size=window_size,
+                                      fullscreen=fullscreen)
+        self.clock = pygame.time.Clock()
     
-    def reset_game(self):
-        """Reset the entire game state."""
-        self.score["left"] = 0
-        self.score["right"] = 0
-        self.left_paddle["y"] = self.HEIGHT / 2 - self.PADDLE_HEIGHT / 2
-        self.right_paddle["y"] = self.HEIGHT / 2 - self.PADDLE_HEIGHT / 2
-        self.reset_ball()
-        self.game_state = "playing"
+    def positions(self):
+        """Return the moving coordinates: (left paddle y, right paddle y, ball x, ball y)."""
+        return (self.left_paddle.y, self.right_paddle.y, self.ball.x, self.ball.y)
     
-    def update(self):
-        """Update game state for one frame."""
+    def step(self):
+        """Run one physics tick, remembering the previous positions for interpolation."""
+        self.previous_positions = self.positions()
+        if self.arena is not None:
+            self.previous_balls = [(ball.x, ball.y) for ball in self.balls]
         if self.game_state == "playing":
-            # Update paddle positions
-            self.left_paddle["y"] += self.left_paddle["dy"]
-            self.right_paddle["y"] += self.right_paddle["dy"]
-            
-            # Keep paddles within bounds
-            if self.left_paddle["y"] < self.GRID:
-                self.left_paddle["y"] = self.GRID
-            elif self.left_paddle["y"] > self.MAX_PADDLE_Y:
-                self.left_paddle["y"] = self.MAX_PADDLE_Y
-                
-            if self.right_paddle["y"] < self.GRID:
-                self.right_paddle["y"] = self.GRID
-            elif self.right_paddle["y"] > self.MAX_PADDLE_Y:
-                self.right_paddle["y"] = self.MAX_PADDLE_Y
-            
-            # Update ball position
-            if not self.ball["resetting"]:
-                self.ball["x"] += self.ball["dx"]
-                self.ball["y"] += self.ball["dy"]
-            
-            # Ball collision with top and bottom
-            if self.ball["y"] < self.GRID:
-                self.ball["y"] = self.GRID
-                self.ball["dy"] *= -1
-            elif self.ball["y"] + self.GRID > self.HEIGHT - self.GRID:
-                self.ball["y"] = self.HEIGHT - self.GRID * 2
-                self.ball["dy"] *= -1
-            
-            # Ball out of bounds (scoring)
-            if (self.ball["x"] < 0 or self.ball["x"] > self.WIDTH) and not self.ball["resetting"]:
-                self.ball["resetting"] = True
-                self.reset_timer = pygame.time.get_ticks()
-                
-                if self.ball["x"] < 0:
-                    self.score["right"] += 1
-                else:
-                    self.score["left"] += 1
-                
-                if self.score["left"] >= self.MAX_SCORE or self.score["right"] >= self.MAX_SCORE:
-                    self.game_state = "game_over"
-            
-            # Reset ball after delay
-            if self.ball["resetting"] and pygame.time.get_ticks() - self.reset_timer >= 400:
-                self.reset_ball()
-            
-            # Ball collision with paddles
-            if self.collides(self.ball, self.left_paddle):
-                self.ball["dx"] *= -1
-                self.ball["x"] = self.left_paddle["x"] + self.left_paddle["width"]
-                # Speed up ball after paddle hit
-                self.accelerate_ball()
-            elif self.collides(self.ball, self.right_paddle):
-                self.ball["dx"] *= -1
-                self.ball["x"] = self.right_paddle["x"] - self.ball["width"]
-                # Speed up ball after paddle hit
-                self.accelerate_ball()
+            for side, paddle in (("left", self.left_paddle), ("right", self.right_paddle)):
+                controller = self.controllers[side]
+                if controller is not None:
+                    paddle.dy = controller.control(self, side)
+        if self.recorder is not None:
+            self.recorder.record(self.left_paddle.dy, self.right_paddle.dy)
+        self.update()
     
-    def accelerate_ball(self):
-        """Increase ball speed after paddle hit."""
-        # Increase speed while preserving direction
-        dx_sign = 1 if self.ball["dx"] > 0 else -1
-        dy_sign = 1 if self.ball["dy"] > 0 else -1
-        
-        dx_abs = abs(self.ball["dx"]) + self.BALL_ACCELERATION
-        dy_abs = abs(self.ball["dy"]) + self.BALL_ACCELERATION
+    def interpolated_positions(self, alpha):
+        """Blend the previous and current positions by alpha (0 = previous, 1 = current)."""
+        left_y, right_y, ball_x, ball_y = self.positions()
+        if alpha >= 1:
+            return left_y, right_y, ball_x, ball_y
         
-        # Cap maximum speed
-        dx_abs = min(dx_abs, self.MAX_BALL_SPEED)
-        dy_abs = min(dy_abs, self.MAX_BALL_SPEED)
-        
-        self.ball["dx"] = dx_abs * dx_sign
-        self.ball["dy"] = dy_abs * dy_sign
+        prev_left_y, prev_right_y, prev_ball_x, prev_ball_y = self.previous_positions
+        left_y = prev_left_y + (left_y - prev_left_y) * alpha
+        right_y = prev_right_y + (right_y - prev_right_y) * alpha
+        # Don't smear the ball across the field when it is served from the center
+        if abs(ball_x - prev_ball_x) <= self.WIDTH / 4:
+            ball_x = prev_ball_x + (ball_x - prev_ball_x) * alpha
+            ball_y = prev_ball_y + (ball_y - prev_ball_y) * alpha
+        return left_y, right_y, ball_x, ball_y
+    
+    def interpolated_balls(self, alpha):
+        """Return (x, y) for every arena ball after the first, blended like interpolated_positions()."""
+        if alpha >= 1:
+            return [(ball.x, ball.y) for ball in self.balls[1:]]
+        positions = []
+        jump = self.WIDTH / 4
+        for ball, (x, y) in zip(self.balls[1:], self.previous_balls[1:]):
+            if abs(ball.x - x) <= jump:
+                positions.append((x + (ball.x - x) * alpha, y + (ball.y - y) * alpha))
+            else:
+                positions.append((ball.x, ball.y))
+        return positions
     
     def render_start_screen(self):
-        """Render the start screen."""
+        """Render the start screen from its pre-composed background."""
+        self.screen.blit(self.static_screen("start_screen"), (0, 0))
+    
+    def render_game_over(self):
+        """Render the game over screen from its pre-composed background."""
+        winner = "LEFT" if self.score["left"] >= self.MAX_SCORE else "RIGHT"
+        self.screen.blit(self.static_screen("game_over", winner), (0, 0))
+    
+    def static_screen(self, name, winner=None):
+        """Return the full-screen background for a static screen, composing it on first use."""
+        key = (name, winner)
+        surface = self.static_screens.get(key)
+        if surface is None:
+            surface = pygame.Surface((self.WIDTH, self.HEIGHT), 0, self.screen)
+            surface.fill(self.BLACK)
+            if name == "start_screen":
+                self.compose_start_screen(surface)
+            else:
+                self.compose_game_over(surface, winner)
+            self.static_screens[key] = surface
+        return surface
+    
+    def compose_start_screen(self, surface):
+        """Draw the start screen text onto surface."""
         # Title
-        title_text = self.title_font.render("PONGULARITY", True, self.WHITE)
-        self.screen.blit(title_text, (self.WIDTH // 2 - title_text.get_width() // 2, self.HEIGHT // 4))
+        title_text = self.text_cache.render(self.title_font, "PONGULARITY", self.WHITE)
+        surface.blit(title_text, (self.WIDTH // 2 - title_text.get_width() // 2, self.HEIGHT // 4))
         
         # Centered instructions
         centered_instructions = [
             "Press SPACE to start",
-            "First to 10 points wins!"
+            f"First to {self.MAX_SCORE} point{'s' if self.MAX_SCORE != 1 else ''} wins!"
         ]
         
         y_offset = self.HEIGHT // 2
         for instruction in centered_instructions:
-            instruction_text = self.instruction_font.render(instruction, True, self.LIGHT_GREY)
-            self.screen.blit(instruction_text, (self.WIDTH // 2 - instruction_text.get_width() // 2, y_offset))
+            instruction_text = self.text_cache.render(self.instruction_font, instruction, self.LIGHT_GREY)
+            surface.blit(instruction_text, (self.WIDTH // 2 - instruction_text.get_width() // 2, y_offset))
             y_offset += 35
         
         # Left paddle controls (left side)
-        left_header = self.instruction_font.render("Left Controls", True, self.WHITE)
-        self.screen.blit(left_header, (self.WIDTH // 4 - left_header.get_width() // 2, y_offset))
+        left_header = self.text_cache.render(self.instruction_font, "Left Controls", self.WHITE)
+        surface.blit(left_header, (self.WIDTH // 4 - left_header.get_width() // 2, y_offset))
         
-        left_up = self.instruction_font.render("W (up)", True, self.LIGHT_GREY)
-        self.screen.blit(left_up, (self.WIDTH // 4 - left_up.get_width() // 2, y_offset + 35))
+        left_up = self.text_cache.render(self.instruction_font, "W (up)", self.LIGHT_GREY)
+        surface.blit(left_up, (self.WIDTH // 4 - left_up.get_width() // 2, y_offset + 35))
         
-        left_down = self.instruction_font.render("S (down)", True, self.LIGHT_GREY)
-        self.screen.blit(left_down, (self.WIDTH // 4 - left_down.get_width() // 2, y_offset + 70))
+        left_down = self.text_cache.render(self.instruction_font, "S (down)", self.LIGHT_GREY)
+        surface.blit(left_down, (self.WIDTH // 4 - left_down.get_width() // 2, y_offset + 70))
         
         # Right paddle controls (right side)
-        right_header = self.instruction_font.render("Right Controls", True, self.WHITE)
-        self.screen.blit(right_header, (3 * self.WIDTH // 4 - right_header.get_width() // 2, y_offset))
+        right_header = self.text_cache.render(self.instruction_font, "Right Controls", self.WHITE)
+        surface.blit(right_header, (3 * self.WIDTH // 4 - right_header.get_width() // 2, y_offset))
         
-        right_up = self.instruction_font.render("Up Arrow (up)", True, self.LIGHT_GREY)
-        self.screen.blit(right_up, (3 * self.WIDTH // 4 - right_up.get_width() // 2, y_offset + 35))
+        right_up = self.text_cache.render(self.instruction_font, "Up Arrow (up)", self.LIGHT_GREY)
+        surface.blit(right_up, (3 * self.WIDTH // 4 - right_up.get_width() // 2, y_offset + 35))
         
-        right_down = self.instruction_font.render("Down Arrow (down)", True, self.LIGHT_GREY)
-        self.screen.blit(right_down, (3 * self.WIDTH // 4 - right_down.get_width() // 2, y_offset + 70))
+        right_down = self.text_cache.render(self.instruction_font, "Down Arrow (down)", self.LIGHT_GREY)
+        surface.blit(right_down, (3 * self.WIDTH // 4 - right_down.get_width() // 2, y_offset + 70))
     
-    def render_game_over(self):
-        """Render the game over screen."""
-        game_over_text = self.game_over_font.render("GAME OVER", True, self.WHITE)
+    def compose_game_over(self, surface, winner):
+        """Draw the game over text for winner onto surface."""
+        game_over_text = self.text_cache.render(self.game_over_font, "GAME OVER", self.WHITE)
         
-        winner = "LEFT" if self.score["left"] >= self.MAX_SCORE else "RIGHT"
-        winner_text = self.winner_font.render(f"{winner} PLAYER WINS!", True, self.WHITE)
+        winner_text = self.text_cache.render(self.winner_font, f"{winner} PLAYER WINS!", self.WHITE)
         
-        restart_text = self.instruction_font.render("Press SPACE to play again", True, self.WHITE)
+        restart_text = self.text_cache.render(self.instruction_font, "Press SPACE to play again", self.WHITE)
         
-        self.screen.blit(game_over_text, (self.WIDTH // 2 - game_over_text.get_width() // 2, 
-                                         self.HEIGHT // 2 - game_over_text.get_height() // 2 - 50))
-        self.screen.blit(winner_text, (self.WIDTH // 2 - winner_text.get_width() // 2, 
-                                      self.HEIGHT // 2))
-        self.screen.blit(restart_text, (self.WIDTH // 2 - restart_text.get_width() // 2, 
-                                      self.HEIGHT // 2 + 80))
+        surface.blit(game_over_text, (self.WIDTH // 2 - game_over_text.get_width() // 2, 
+                                    self.HEIGHT // 2 - game_over_text.get_height() // 2 - 50))
+        surface.blit(winner_text, (self.WIDTH // 2 - winner_text.get_width() // 2, 
+                                 self.HEIGHT // 2))
+        surface.blit(restart_text, (self.WIDTH // 2 - restart_text.get_width() // 2, 
+                                  self.HEIGHT // 2 + 80))
     
-    def render(self):
-        """Draw the game state to the screen."""
-        # Clear screen
-        self.screen.fill(self.BLACK)
+    def render(self, alpha=1.0):
+        """Draw the game state and show it, interpolated alpha of the way into the next tick."""
+        self.renderer.render(alpha)
+    
+    def draw_frame(self, alpha=1.0):
+        """Draw the game state onto self.screen.
+        
+        Returns the rectangles that changed, or None when the whole screen was
+        redrawn.
+        """
+        if (self.dirty_rects and self.game_state == "playing" and self.drawn_rects is not None
+                and not self.show_profiler and self.arena is None):
+            return self.render_changes(alpha)
+        
+        self.drawn_rects = None
         
         if self.game_state == "start_screen":
             self.render_start_screen()
         elif self.game_state == "playing":
-            # Draw paddles
-            pygame.draw.rect(self.screen, self.WHITE, (
-                self.left_paddle["x"], 
-                self.left_paddle["y"], 
-                self.left_paddle["width"], 
-                self.left_paddle["height"]
-            ))
-            
-            pygame.draw.rect(self.screen, self.WHITE, (
-                self.right_paddle["x"], 
-                self.right_paddle["y"], 
-                self.right_paddle["width"], 
-                self.right_paddle["height"]
-            ))
-            
-            # Draw ball
-            pygame.draw.rect(self.screen, self.WHITE, (
-                self.ball["x"], 
-                self.ball["y"], 
-                self.ball["width"], 
-                self.ball["height"]
-            ))
-            
-            # Draw top and bottom borders
-            pygame.draw.rect(self.screen, self.LIGHT_GREY, (0, 0, self.WIDTH, self.GRID))
-            pygame.draw.rect(self.screen, self.LIGHT_GREY, (0, self.HEIGHT - self.GRID, self.WIDTH, self.GRID))
-            
-            # Draw scores
-            left_score_text = self.score_font.render(str(self.score["left"]), True, self.WHITE)
-            right_score_text = self.score_font.render(str(self.score["right"]), True, self.WHITE)
-            
-            self.screen.blit(left_score_text, (self.WIDTH // 4, self.GRID * 4))
-            self.screen.blit(right_score_text, (3 * self.WIDTH // 4, self.GRID * 4))
+            self.drawn_rects = self.draw_playfield(alpha)
+            self.score_rects = self.draw_scores()
         elif self.game_state == "game_over":
             self.render_game_over()
         
-        # Update display
-        pygame.display.flip()
+        if self.show_profiler:
+            self.render_profiler_overlay()
+            # The overlay covers whatever was under it, so redraw in full next frame
+            self.drawn_rects = None
+        return None
+    
+    def enable_profiler(self):
+        """Start recording per-phase frame timings."""
+        if self.profiler is None:
+            budget = 1 / self.max_fps if self.max_fps else 1 / self.BASE_TICK_RATE
+            self.profiler = FrameProfiler(budget=budget)
+    
+    def profiler_overlay(self):
+        """Return the frame-time summary as (text surface, top-left) pairs.
+        
+        The list is rebuilt only when the numbers change, so renderers can
+        cache what they make from it.
+        """
+        profiler = self.profiler
+        # Refresh the numbers a few times a second so they stay readable
+        if not self.profiler_lines or profiler.frames % 15 == 0:
+            lines = profiler.overlay_lines()
+            if lines != self.profiler_lines or not self.profiler_texts:
+                self.profiler_lines = lines
+                self.profiler_texts = []
+                y = self.GRID * 2
+                for line in lines:
+                    text = self.text_cache.render(self.instruction_font, line, self.LIGHT_GREY)
+                    self.profiler_texts.append((text, (self.GRID, y)))
+                    y += text.get_height()
+        return self.profiler_texts
+    
+    def render_profiler_overlay(self):
+        """Draw the frame-time summary in the top-left corner."""
+        for text, position in self.profiler_overlay():
+            self.screen.fill(self.BLACK, text.get_rect(topleft=position))
+            self.screen.blit(text, position)
+    
+    def draw_playfield(self, alpha):
+        """Clear the screen and draw borders, paddles and ball, returning the object rectangles.
+        
+        Only fills and rectangles are drawn, so this also works on a surface
+        locked by a pygame.surfarray view, where blitting text would fail.
+        """
+        # Clear screen
+        self.screen.fill(self.BLACK)
+        
+        rects = self.draw_objects(alpha)
+        
+        # Draw top and bottom borders
+        pygame.draw.rect(self.screen, self.LIGHT_GREY, (0, 0, self.WIDTH, self.GRID))
+        pygame.draw.rect(self.screen, self.LIGHT_GREY, (0, self.HEIGHT - self.GRID, self.WIDTH, self.GRID))
+        
+        return rects
+    
+    def draw_objects(self, alpha):
+        """Draw the paddles and ball and return the rectangles they cover."""
+        left_y, right_y, ball_x, ball_y = self.interpolated_positions(alpha)
+        
+        # Draw paddles
+        left_rect = pygame.draw.rect(self.screen, self.WHITE, (
+            self.left_paddle.x, left_y, self.left_paddle.width, self.left_paddle.height))
+        right_rect = pygame.draw.rect(self.screen, self.WHITE, (
+            self.right_paddle.x, right_y, self.right_paddle.width, self.right_paddle.height))
+        
+        # Draw ball
+        ball_rect = pygame.draw.rect(self.screen, self.WHITE, (ball_x, ball_y, self.ball.width, self.ball.height))
+        
+        rects = [left_rect, right_rect, ball_rect]
+        if self.arena is not None:
+            # The rest of the balls, and obstacles, in multi-ball arenas
+            size = (self.ball.width, self.ball.height)
+            rects.extend(pygame.draw.rect(self.screen, self.WHITE, (position, size))
+                         for position in self.interpolated_balls(alpha))
+            rects.extend(pygame.draw.rect(self.screen, self.LIGHT_GREY, obstacle.rect())
+                         for obstacle in self.obstacles)
+        return rects
+    
+    def draw_scores(self):
+        """Draw both scores and return the rectangles they cover."""
+        self.drawn_score = (self.score["left"], self.score["right"])
+        if self.score_glyphs is None:
+            self.score_glyphs = DigitGlyphs(self.text_cache, self.score_font, self.WHITE)
+        
+        return [
+            self.score_glyphs.draw(self.screen, self.score["left"], (self.WIDTH // 4, self.GRID * 4)),
+            self.score_glyphs.draw(self.screen, self.score["right"], (3 * self.WIDTH // 4, self.GRID * 4)),
+        ]
+    
+    def render_changes(self, alpha):
+        """Redraw only what changed since the last frame and return the dirty rectangles."""
+        old_rects = self.drawn_rects
+        dirty = list(old_rects)
+        
+        # Erase the paddles and ball where they were
+        for rect in old_rects:
+            self.screen.fill(self.BLACK, rect)
+        
+        left_y, right_y, ball_x, ball_y = self.interpolated_positions(alpha)
+        new_rects = [
+            pygame.Rect(self.left_paddle.x, left_y, self.left_paddle.width, self.left_paddle.height),
+            pygame.Rect(self.right_paddle.x, right_y, self.right_paddle.width, self.right_paddle.height),
+            pygame.Rect(ball_x, ball_y, self.ball.width, self.ball.height),
+        ]
+        
+        # Scores sit on top of everything, so redraw them whenever they changed
+        # or something moving touched them
+        redraw_scores = (self.drawn_score != (self.score["left"], self.score["right"]) or
+                         any(rect.collidelist(old_rects) != -1 or rect.collidelist(new_rects) != -1
+                             for rect in self.score_rects))
+        if redraw_scores:
+            for rect in self.score_rects:
+                self.screen.fill(self.BLACK, rect)
+            dirty.extend(self.score_rects)
+        
+        self.drawn_rects = self.draw_objects(alpha)
+        dirty.extend(self.drawn_rects)
+        
+        if redraw_scores:
+            self.score_rects = self.draw_scores()
+            dirty.extend(self.score_rects)
+        
+        return dirty
     
     def handle_input(self):
         """Process user input."""
@@ -284,40 +367,84 @@ class PongularityGame:
             if event.type == pygame.QUIT:
                 return False
             
+            # The window contents were lost, so the next frame must be drawn in full
+            if event.type == pygame.WINDOWEXPOSED:
+                self.drawn_rects = None
+            
+            # F3 toggles the frame-time overlay, turning profiling on if needed
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.enable_profiler()
+                self.show_profiler = not self.show_profiler
+                self.drawn_rects = None
+            
             # Check for space bar press on start screen or game over screen
             if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
                 if self.game_state == "start_screen" or self.game_state == "game_over":
                     self.reset_game()
+                    if self.recorder is not None:
+                        self.recorder.record_start()
         
         if self.game_state == "playing":
             # Get the current state of all keys
             keys = pygame.key.get_pressed()
             
             # Update paddle movement based on current key states
-            self.right_paddle["dy"] = 0
-            self.left_paddle["dy"] = 0
+            self.right_paddle.dy = 0
+            self.left_paddle.dy = 0
             
             if keys[pygame.K_UP]:
-                self.right_paddle["dy"] = -self.PADDLE_SPEED
+                self.right_paddle.dy = -self.PADDLE_SPEED
             elif keys[pygame.K_DOWN]:
-                self.right_paddle["dy"] = self.PADDLE_SPEED
+                self.right_paddle.dy = self.PADDLE_SPEED
                 
             if keys[pygame.K_w]:
-                self.left_paddle["dy"] = -self.PADDLE_SPEED
+                self.left_paddle.dy = -self.PADDLE_SPEED
             elif keys[pygame.K_s]:
-                self.left_paddle["dy"] = self.PADDLE_SPEED
+                self.left_paddle.dy = self.PADDLE_SPEED
         
         return True
     
     def run(self):
-        """Main game loop."""
+        """Main game loop: fixed-rate physics ticks, rendering as often as max_fps allows."""
         running = True
+        timestep = FixedTimestep(self.TICK_RATE)
+        last_frame = time.perf_counter_ns()
         
         while running:
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_frame()
+            
+            now = time.perf_counter_ns()
+            ticks = timestep.advance(now - last_frame)
+            last_frame = now
+            
             running = self.handle_input()
-            self.update()
-            self.render()
-            self.clock.tick(60)
+            if profiler is not None:
+                profiler.mark("input")
+            
+            for _ in range(ticks):
+                self.step()
+            if profiler is not None:
+                profiler.mark("update")
+            
+            self.render(timestep.alpha)
+            if profiler is not None:
+                profiler.mark("render")
+            
+            self.clock.tick(self.max_fps)
+            if profiler is not None:
+                profiler.mark("sleep")
+                profiler.end_frame()
         
-        pygame.quit()
+        if self.recorder is not None:
+            self.recorder.save(self.record_path)
+        if self.profiler is not None and self.profile_path:
+            self.profiler.export(self.profile_path)
+        try:
+            if self.telemetry is not None:
+                # Raises the writer's error, if any, once the window is closed
+                self.telemetry.close()
+        finally:
+            pygame.quit()
         sys.exit() 
\ No newline at end of file
@@ -0,0 +1,792 @@
+"""
+Networked two-player matches over asyncio, with client-side prediction.
+
+MatchServer owns the only authoritative PongularityEngine. Clients send the
+input code (as in recordings: 0 = still, 1 = up, 2 = down) for every tick
+they simulate, and the server answers every tick with the match state.
+
+States are delta compressed: each one only carries the snapshot fields that
+changed since the last state the client acknowledged, so a ball in flight
+costs two doubles a tick. Values are sent at full precision, which keeps the
+client's re-simulation bit-exact.
+
+MatchClient runs its own engine ahead of the server by about a round trip,
+moving its paddle the moment it decides to and assuming the opponent keeps
+pressing what they last pressed. When a state arrives that disagrees with
+what the client predicted for that tick, the client restores it with
+PongularityEngine.restore() and replays its own inputs since (rollback).
+The server reports how early each client's inputs arrive, and clients add
+or skip a tick now and then to keep that margin.
+
+UDP is the default transport; clients resend the last few inputs in every
+packet so lost ones rarely matter. transport="tcp" sends the same messages
+length-prefixed over a stream. NetworkShim adds latency, jitter and loss to
+everything an endpoint sends, to try bad networks on localhost.
+
+Messages (little endian), all starting with a type byte::
+
+    HELLO    time:f64 room:u32                          client -> server
+    WELCOME  side:u8 time:f64 tick_rate:u16 swept:u8    server -> client
+    INPUT    tick:u32 ack:u32 count:u8 codes:2 bits each   client -> server
+    STATE    tick:u32 age:u8 input_ack:u32 mask:u16 fields  server -> client
+    BYE      snapshot:pack_snapshot()                   server -> client
+
+HELLO asks for a room by number (0 for any) on servers that host several,
+see pongularity.rooms. INPUT carries the codes of ticks tick - count + 1 to tick and acknowledges
+the latest STATE received. A STATE is a delta from the state age ticks
+earlier (age 0 means every field is present); input_ack is the latest
+input tick the server has from that client. Packets too short for their
+type, or whose fields do not fit their lengths, are dropped.
+"""
+import argparse
+import asyncio
+import math
+import random
+import struct
+import time
+from collections import deque
+from .engine import (GAME_STATES, SNAPSHOT_FIELDS, SNAPSHOT_SIZE, PongularityEngine, pack_snapshot,
+                     unpack_snapshot)
+from .replay import input_code
+
+HELLO, WELCOME, INPUT, STATE, BYE = range(1, 6)
+SIDES = ("left", "right")
+
+# Inputs repeated in each INPUT packet, and states kept as delta baselines
+INPUT_REDUNDANCY = 16
+HISTORY_TICKS = 255
+
+_HELLO = struct.Struct("<BdI")
+_WELCOME = struct.Struct("<BBdH?")
+_INPUT = struct.Struct("<BIIB")
+_STATE = struct.Struct("<BIBIH")
+_FRAME = struct.Struct("<H")
+
+# Smallest well-formed packet of each type
+_SIZES = {HELLO: _HELLO.size, WELCOME: _WELCOME.size, INPUT: _INPUT.size, STATE: _STATE.size,
+          BYE: 1 + SNAPSHOT_SIZE}
+
+# Snapshot fields other than the tick, which is in the STATE header
+_TICK = SNAPSHOT_FIELDS.index("tick")
+_GAME_STATE = SNAPSHOT_FIELDS.index("game_state")
+_FIELD_STRUCTS = [(i, struct.Struct("<" + code)) for i, code in enumerate("dddddddd?HHBqq") if i != _TICK]
+_ALL_FIELDS = sum(1 << i for i, _ in _FIELD_STRUCTS)
+
+
+def packet_type(data):
+    """Return the type byte of a packet, or None when it is too short for its type or unknown."""
+    if not data:
+        return None
+    kind = data[0]
+    size = _SIZES.get(kind)
+    if size is None or len(data) < size:
+        return None
+    return kind
+
+
+def encode_state(snapshot, baseline=None):
+    """Return (mask, payload) holding the fields of snapshot that differ from baseline."""
+    mask = 0
+    payload = bytearray()
+    for i, field in _FIELD_STRUCTS:
+        value = snapshot[i]
+        if baseline is None or value != baseline[i]:
+            mask |= 1 << i
+            payload += field.pack(GAME_STATES.index(value) if i == _GAME_STATE else value)
+    return mask, bytes(payload)
+
+
+def decode_state(tick, mask, payload, baseline=None):
+    """Rebuild the snapshot for tick from encode_state() output and the same baseline.
+
+    Returns None when payload does not hold exactly the fields in mask, or
+    when a state without a baseline lacks some.
+    """
+    if len(payload) != sum(field.size for i, field in _FIELD_STRUCTS if mask >> i & 1):
+        return None
+    if baseline is None and mask & _ALL_FIELDS != _ALL_FIELDS:
+        return None
+    fields = list(baseline) if baseline is not None else [None] * len(SNAPSHOT_FIELDS)
+    offset = 0
+    for i, field in _FIELD_STRUCTS:
+        if mask >> i & 1:
+            fields[i], = field.unpack_from(payload, offset)
+            offset += field.size
+    if mask >> _GAME_STATE & 1:
+        if fields[_GAME_STATE] >= len(GAME_STATES):
+            return None
+        fields[_GAME_STATE] = GAME_STATES[fields[_GAME_STATE]]
+    fields[_TICK] = tick
+    return tuple(fields)
+
+
+def parse_hello(data):
+    """Return the (client time, room) of a HELLO packet."""
+    _, sent, room = _HELLO.unpack_from(data)
+    return sent, room
+
+
+def welcome_packet(side, sent, tick_rate, swept=False):
+    """The WELCOME answer to a HELLO sent at client time sent."""
+    return _WELCOME.pack(WELCOME, SIDES.index(side), sent, tick_rate, swept)
+
+
+def bye_packet(snapshot):
+    return bytes((BYE,)) + pack_snapshot(snapshot)
+
+
+def pack_codes(codes):
+    """Pack 2-bit input codes four to a byte."""
+    out = bytearray((len(codes) + 3) // 4)
+    for i, code in enumerate(codes):
+        out[i >> 2] |= code << ((i & 3) * 2)
+    return bytes(out)
+
+
+def unpack_codes(data, count):
+    """Inverse of pack_codes()."""
+    return [data[i >> 2] >> ((i & 3) * 2) & 3 for i in range(count)]
+
+
+class NetworkShim:
+    """Delays, jitters and drops what an endpoint sends, to imitate a poor network.
+
+    Latency and jitter are in seconds and loss is a probability. Streams
+    (ordered=True) are never dropped or reordered, like TCP.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, loss=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.dropped = 0
+
+    def wrap(self, write, ordered=False):
+        """Return a function that sends data through write after the shim's delay, or drops it."""
+        loop = asyncio.get_running_loop()
+        last = 0.0
+
+        def send(data):
+            nonlocal last
+            if not ordered and self.loss and self.rng.random() < self.loss:
+                self.dropped += 1
+                return
+            due = loop.time() + self.latency + self.rng.uniform(0, self.jitter)
+            if ordered:
+                due = last = max(due, last)
+            loop.call_at(due, write, data)
+
+        return send
+
+
+class _Datagrams(asyncio.DatagramProtocol):
+    """Hands received datagrams to a callback."""
+
+    def __init__(self, received):
+        self.received = received
+
+    def datagram_received(self, data, address):
+        self.received(data, address)
+
+
+async def _read_frames(reader, received):
+    """Call received with each length-prefixed frame until the stream ends or is closed."""
+    try:
+        while True:
+            length, = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+            received(await reader.readexactly(length))
+    except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError):
+        pass
+
+
+def _frame_writer(writer):
+    def write(data):
+        if not writer.is_closing():
+            writer.write(_FRAME.pack(len(data)) + data)
+    return write
+
+
+def _datagram_writer(transport, address=None):
+    # Shimmed packets can fall due after the endpoint has closed
+    def write(data):
+        if not transport.is_closing():
+            transport.sendto(data, address)
+    return write
+
+
+async def _run_ticks(tick_rate, tick):
+    """Call tick() tick_rate times a second until it returns False, catching up after stalls."""
+    loop = asyncio.get_running_loop()
+    period = 1 / tick_rate
+    deadline = loop.time()
+    while tick() is not False:
+        deadline += period
+        delay = deadline - loop.time()
+        if delay < -8 * period:
+            # Fall behind gracefully instead of spiralling after a long stall
+            deadline = loop.time()
+        await asyncio.sleep(max(delay, 0))
+
+
+async def open_connection(host, port, transport, received):
+    """Connect to a server; return (write, ordered, close), calling received with each packet."""
+    loop = asyncio.get_running_loop()
+    if transport == "udp":
+        datagrams, _ = await loop.create_datagram_endpoint(
+            lambda: _Datagrams(lambda data, address: received(data)), remote_addr=(host, port))
+        return _datagram_writer(datagrams), False, datagrams.close
+    if transport == "tcp":
+        reader, writer = await asyncio.open_connection(host, port)
+        reading = loop.create_task(_read_frames(reader, received))
+
+        def close():
+            reading.cancel()
+            writer.close()
+        return _frame_writer(writer), True, close
+    raise ValueError(f"Unknown transport {transport!r}, expected 'udp' or 'tcp'")
+
+
+class Player:
+    """What the server knows about one connected client."""
+
+    def __init__(self, side, write):
+        self.side = side
+        self.write = write
+        self.inputs = {}
+        self.code = 0
+        self.latest_input = 0
+        self.ack = None
+        self.missed_inputs = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def receive_input(self, data, tick, history):
+        """Take the inputs for ticks after tick from an INPUT packet, and its state acknowledgement.
+
+        Packets too short for their codes are dropped, and inputs more than
+        HISTORY_TICKS ahead of tick are ignored.
+        """
+        _, last, ack, count = _INPUT.unpack_from(data)
+        if len(data) < _INPUT.size + (count + 3) // 4:
+            return
+        first = last - count + 1
+        last = min(last, tick + HISTORY_TICKS)
+        inputs = self.inputs
+        # Only decode the codes for ticks still to come
+        for t in range(max(first, tick + 1), last + 1):
+            if t not in inputs:
+                i = t - first
+                inputs[t] = data[_INPUT.size + (i >> 2)] >> ((i & 3) * 2) & 3
+        self.latest_input = max(self.latest_input, last)
+        if ack in history and (self.ack is None or ack > self.ack):
+            self.ack = ack
+
+    def next_code(self, tick):
+        """Return the input code to apply on tick."""
+        code = self.inputs.pop(tick, None)
+        if code is None:
+            # Late or lost: keep doing what the client last did
+            self.missed_inputs += 1
+        else:
+            self.code = code
+        return self.code
+
+    def baseline(self, history, delta):
+        """Return the tick of the state to encode the next one against, or None for a full state."""
+        if delta and self.ack is not None and self.ack in history:
+            return self.ack
+        return None
+
+    def state_packet(self, tick, age, mask, payload):
+        return _STATE.pack(STATE, tick, age, self.latest_input, mask) + payload
+
+
+class ServerEndpoint:
+    """Sockets and peer bookkeeping shared by the servers; subclasses implement receive()."""
+
+    def __init__(self, shim=None):
+        self.shim = shim
+        self.peers = {}
+        self._closers = []
+
+    async def listen(self, host="127.0.0.1", port=0, transport="udp"):
+        """Start accepting clients and return the (host, port) listened on."""
+        loop = asyncio.get_running_loop()
+        if transport == "udp":
+            datagrams, _ = await loop.create_datagram_endpoint(
+                lambda: _Datagrams(self._datagram_received), local_addr=(host, port))
+            self._datagrams = datagrams
+            self._closers.append(datagrams.close)
+            return datagrams.get_extra_info("sockname")[:2]
+        if transport == "tcp":
+            server = await asyncio.start_server(self._stream_connected, host, port)
+            self._closers.append(server.close)
+            return server.sockets[0].getsockname()[:2]
+        raise ValueError(f"Unknown transport {transport!r}, expected 'udp' or 'tcp'")
+
+    def _datagram_received(self, data, address):
+        if address not in self.peers:
+            self.add_peer(address, _datagram_writer(self._datagrams, address))
+        self.receive(data, address)
+
+    async def _stream_connected(self, reader, writer):
+        self.add_peer(writer, _frame_writer(writer), ordered=True)
+        self._closers.append(writer.close)
+        await _read_frames(reader, lambda data: self.receive(data, writer))
+
+    def add_peer(self, peer, write, ordered=False):
+        """Register a function that sends packets to peer."""
+        self.peers[peer] = self.shim.wrap(write, ordered) if self.shim is not None else write
+
+    def send(self, player, data):
+        player.bytes_sent += len(data)
+        player.write(data)
+
+    def receive(self, data, peer):
+        """Handle one packet from peer."""
+        raise NotImplementedError
+
+    def close(self):
+        for close in self._closers:
+            close()
+
+
+class MatchServer(ServerEndpoint):
+    """Authoritative server for one match between two clients.
+
+    spectators is anything with a publish(snapshot) method, such as a
+    spectate.SpectatorServer; it is given the state of every tick.
+    """
+
+    def __init__(self, tick_rate=PongularityEngine.BASE_TICK_RATE, swept=False, delta=True, shim=None,
+                 linger=0.25, spectators=None):
+        super().__init__(shim)
+        self.engine = PongularityEngine(tick_rate, swept)
+        self.delta = delta
+        self.linger = linger
+        self.spectators = spectators
+        self.players = {}
+        self.history = {}
+        self.ticks = 0
+        self.started_at = None
+        self.finished_at = None
+        self.joined = asyncio.Event()
+        speed = self.engine.PADDLE_SPEED
+        self._speeds = (0, -speed, speed)
+
+    def receive(self, data, peer):
+        kind = packet_type(data)
+        player = self.players.get(peer)
+        if player is not None:
+            player.bytes_received += len(data)
+
+        if kind == HELLO:
+            sent, _ = parse_hello(data)
+            if player is None:
+                if len(self.players) == len(SIDES):
+                    return
+                player = self.players[peer] = Player(SIDES[len(self.players)], self.peers[peer])
+                player.bytes_received += len(data)
+                if len(self.players) == len(SIDES):
+                    self.joined.set()
+            engine = self.engine
+            self.send(player, welcome_packet(player.side, sent, engine.TICK_RATE, engine.SWEPT))
+
+        elif kind == INPUT and player is not None:
+            player.receive_input(data, self.engine.tick, self.history)
+
+    def start(self):
+        """Begin the match and send both clients the first state."""
+        self.engine.reset_game()
+        self.history = {self.engine.tick: self.engine.snapshot()}
+        self.started_at = time.perf_counter()
+        self.send_states()
+
+    def tick(self):
+        """Advance the match one tick with each client's input for it, then send the states."""
+        engine = self.engine
+        tick = engine.tick + 1
+        for player in self.players.values():
+            paddle = engine.left_paddle if player.side == "left" else engine.right_paddle
+            paddle.dy = self._speeds[player.next_code(tick)]
+        engine.update()
+        self.ticks += 1
+        self.history[tick] = engine.snapshot()
+        self.history.pop(tick - HISTORY_TICKS, None)
+        self.send_states()
+
+    def send_states(self):
+        engine = self.engine
+        tick = engine.tick
+        snapshot = self.history[tick]
+        if self.spectators is not None:
+            self.spectators.publish(snapshot)
+        for player in self.players.values():
+            baseline = player.baseline(self.history, self.delta)
+            if baseline is None:
+                age, (mask, payload) = 0, encode_state(snapshot)
+            else:
+                age, (mask, payload) = tick - baseline, encode_state(snapshot, self.history[baseline])
+            self.send(player, player.state_packet(tick, age, mask, payload))
+
+    async def play(self, max_ticks=None):
+        """Wait for two clients, play until game over or max_ticks, and return stats()."""
+        await self.joined.wait()
+        self.start()
+
+        def tick():
+            self.tick()
+            return self.engine.game_state == "playing" and (max_ticks is None or self.ticks < max_ticks)
+
+        await _run_ticks(self.engine.TICK_RATE, tick)
+        self.finished_at = time.perf_counter()
+
+        # Repeat the final state for a while so it gets through on a lossy link
+        bye = bye_packet(self.engine.snapshot())
+        for _ in range(max(1, round(self.linger * self.engine.TICK_RATE))):
+            for player in self.players.values():
+                self.send(player, bye)
+            await asyncio.sleep(1 / self.engine.TICK_RATE)
+        return self.stats()
+
+    def stats(self):
+        """Return traffic and input counts for the match; bytes are payload, without UDP or TCP headers."""
+        end = self.finished_at or time.perf_counter()
+        seconds = end - self.started_at if self.started_at else 0.0
+        sent = sum(player.bytes_sent for player in self.players.values())
+        received = sum(player.bytes_received for player in self.players.values())
+        return {
+            "ticks": self.ticks,
+            "seconds": seconds,
+            "bytes_sent": sent,
+            "bytes_received": received,
+            "bytes_per_second": (sent + received) / seconds if seconds else 0.0,
+            "missed_inputs": {player.side: player.missed_inputs for player in self.players.values()},
+        }
+
+
+class MatchClient:
+    """One player's side of a networked match, predicting ahead of the server.
+
+    controller is anything with control(world, side) returning a paddle
+    speed, such as a pongularity.controllers.Controller; without one the
+    paddle stays still. The engine is created by engine_factory(tick_rate,
+    swept) once the server says which to use. lead is how many ticks to run
+    ahead of the latest state; by default the round trip plus margin.
+    on_tick(engine) is called after every predicted tick. room picks a room
+    on a RoomServer, 0 for any.
+    """
+
+    def __init__(self, controller=None, margin=2, lead=None, shim=None, engine_factory=None, on_tick=None,
+                 room=0, clock=time.perf_counter):
+        self.controller = controller
+        self.room = room
+        self.margin = margin
+        self.lead = lead
+        self.shim = shim
+        self.engine_factory = engine_factory or (lambda tick_rate, swept: PongularityEngine(tick_rate, swept))
+        self.on_tick = on_tick
+        self.clock = clock
+        self.write = None
+        self.side = None
+        self.engine = None
+        self.rtt = None
+
+        self.authoritative = None
+        self.received = {}
+        self.inputs = {}
+        self.predicted = {}
+        self.remote_code = 0
+        self.input_ack = 0
+        self.cooldown = 0
+        self.pending_latency = deque()
+        self.latencies = []
+
+        self.welcomed = asyncio.Event()
+        self.started = asyncio.Event()
+        self.finished = False
+        self.ticks = 0
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.resyncs = 0
+        self.adjustments = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self._closers = []
+
+    async def connect(self, host, port, transport="udp", timeout=5.0):
+        """Join the server at host:port and wait to be told which side to play."""
+        loop = asyncio.get_running_loop()
+        write, ordered, close = await open_connection(host, port, transport, self.receive)
+        self._closers.append(close)
+        self.write = self.shim.wrap(write, ordered) if self.shim is not None else write
+
+        deadline = loop.time() + timeout
+        while not self.welcomed.is_set():
+            if loop.time() > deadline:
+                raise TimeoutError(f"No answer from {host}:{port}")
+            self.hello()
+            try:
+                await asyncio.wait_for(self.welcomed.wait(), 0.25)
+            except asyncio.TimeoutError:
+                pass
+
+    def send(self, data):
+        self.bytes_sent += len(data)
+        self.write(data)
+
+    def hello(self):
+        self.send(_HELLO.pack(HELLO, self.clock(), self.room))
+
+    def receive(self, data):
+        """Handle one packet from the server."""
+        self.bytes_received += len(data)
+        kind = packet_type(data)
+        if kind == WELCOME and not self.welcomed.is_set():
+            _, side, sent, tick_rate, swept = _WELCOME.unpack_from(data)
+            if side >= len(SIDES) or not tick_rate:
+                return
+            self.side = SIDES[side]
+            self.rtt = self.clock() - sent
+            self.engine = self.engine_factory(tick_rate, swept)
+            if self.lead is None:
+                self.lead = math.ceil(self.rtt * tick_rate) + self.margin
+            self.welcomed.set()
+        elif kind == STATE and self.engine is not None:
+            _, tick, age, input_ack, mask = _STATE.unpack_from(data)
+            baseline = None
+            if age:
+                baseline = self.received.get(tick - age)
+                if baseline is None:
+                    return
+            snapshot = decode_state(tick, mask, data[_STATE.size:], baseline)
+            if snapshot is not None:
+                self.on_state(snapshot, input_ack)
+        elif kind == BYE and self.engine is not None and not self.finished:
+            try:
+                snapshot = unpack_snapshot(data[1:1 + SNAPSHOT_SIZE])
+            except IndexError:
+                # Not a game state
+                return
+            self.finished = True
+            self.authoritative = snapshot
+            self.engine.restore(self.authoritative)
+            self.started.set()
+
+    def on_state(self, snapshot, input_ack):
+        """Reconcile the prediction with the server's state for one tick."""
+        tick = snapshot[_TICK]
+        if self.authoritative is not None and tick <= self.authoritative[_TICK] or self.finished:
+            return
+        self.authoritative = snapshot
+        self.received[tick] = snapshot
+        # States are lost or skipped, so prune everything too old as a baseline
+        for old in [t for t in self.received if t <= tick - HISTORY_TICKS]:
+            del self.received[old]
+        self.input_ack = input_ack
+        opponent = "right_dy" if self.side == "left" else "left_dy"
+        self.remote_code = input_code(snapshot[SNAPSHOT_FIELDS.index(opponent)])
+
+        now = self.clock()
+        pending = self.pending_latency
+        while pending and pending[0][0] <= tick:
+            self.latencies.append(now - pending.popleft()[1])
+
+        engine = self.engine
+        if not self.started.is_set():
+            engine.restore(snapshot)
+            self.started.set()
+            for _ in range(self.lead):
+                self.tick()
+        elif tick > engine.tick:
+            # The server got ahead of the prediction: start again from its state
+            self.resyncs += 1
+            engine.restore(snapshot)
+            self.predicted.clear()
+            for _ in range(self.lead):
+                self.tick()
+        elif self.predicted.get(tick) != snapshot:
+            self.rollbacks += 1
+            end = engine.tick
+            engine.restore(snapshot)
+            for replayed in range(tick + 1, end + 1):
+                self.simulate(self.inputs.get(replayed, 0))
+                self.resimulated += 1
+        for old in [t for t in self.predicted if t <= tick]:
+            del self.predicted[old]
+        for old in [t for t in self.inputs if t <= tick - INPUT_REDUNDANCY]:
+            del self.inputs[old]
+        if snapshot[_GAME_STATE] != "playing":
+            self.finished = True
+
+    def simulate(self, code):
+        """Run one predicted tick with code for the local paddle."""
+        engine = self.engine
+        speed = engine.PADDLE_SPEED
+        own, other = engine.left_paddle, engine.right_paddle
+        if self.side == "right":
+            own, other = other, own
+        own.dy = (0, -speed, speed)[code]
+        other.dy = (0, -speed, speed)[self.remote_code]
+        engine.update()
+        self.predicted[engine.tick] = engine.snapshot()
+
+    def tick(self):
+        """Decide, predict and send this client's input for the next tick."""
+        engine = self.engine
+        code = 0
+        if self.controller is not None and engine.game_state == "playing":
+            code = input_code(self.controller.control(engine, self.side))
+        tick = engine.tick + 1
+        self.inputs[tick] = code
+        self.simulate(code)
+        self.ticks += 1
+        self.pending_latency.append((tick, self.clock()))
+
+        first = max(tick - INPUT_REDUNDANCY + 1, self.input_ack + 1)
+        codes = [self.inputs.get(t, 0) for t in range(first, tick + 1)]
+        ack = self.authoritative[_TICK] if self.authoritative is not None else 0
+        self.send(_INPUT.pack(INPUT, tick, ack, len(codes)) + pack_codes(codes))
+        if self.on_tick is not None:
+            self.on_tick(engine)
+
+    def clock_tick(self):
+        """One tick of the client's clock: usually one predicted tick, sometimes two or none.
+
+        The server reports how many ticks early the inputs arrive. Running
+        an extra tick or skipping one moves that back towards margin; after
+        each change, wait a round trip for it to show before the next.
+        """
+        if self.finished:
+            return False
+        slack = self.input_ack - self.authoritative[_TICK]
+        if self.cooldown > 0:
+            self.cooldown -= 1
+        elif self.input_ack and (slack < 1 or slack > 2 * self.margin + 1):
+            self.adjustments += 1
+            self.cooldown = self.lead + self.margin
+            if slack < 1:
+                self.tick()
+            else:
+                return True
+        self.tick()
+        return True
+
+    async def play(self):
+        """Play until the server ends the match, and return stats()."""
+        await self.started.wait()
+        await _run_ticks(self.engine.TICK_RATE, self.clock_tick)
+        return self.stats()
+
+    def close(self):
+        for close in self._closers:
+            close()
+
+    def stats(self):
+        """Return prediction counts, traffic and the input latency in seconds.
+
+        Input latency runs from deciding an input to receiving the first
+        server state that includes it.
+        """
+        latencies = sorted(self.latencies)
+        return {
+            "side": self.side,
+            "ticks": self.ticks,
+            "lead": self.lead,
+            "rtt": self.rtt,
+            "rollbacks": self.rollbacks,
+            "resimulated": self.resimulated,
+            "resyncs": self.resyncs,
+            "adjustments": self.adjustments,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "input_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+            "input_latency_p95": latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+        }
+
+
+class _KeyboardController:
+    """Reads W/S or the arrow keys for a networked human player."""
+
+    def control(self, game, side):
+        import pygame
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_UP] or keys[pygame.K_w]:
+            return -game.PADDLE_SPEED
+        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+            return game.PADDLE_SPEED
+        return 0
+
+
+async def _serve(args, shim):
+    spectators = None
+    if args.spectator_port is not None:
+        from .spectate import SpectatorFeed, SpectatorServer
+        spectators = SpectatorServer(SpectatorFeed(keyframe_interval=args.tick_rate))
+        await spectators.listen(args.host, args.spectator_port, args.transport)
+        print(f"spectators can watch on {args.host}:{args.spectator_port} (python -m pongularity.spectate)")
+    server = MatchServer(args.tick_rate, args.swept, shim=shim, spectators=spectators)
+    host, port = await server.listen(args.host, args.port, args.transport)
+    print(f"waiting for two players on {host}:{port} ({args.transport})")
+    stats = await server.play()
+    server.close()
+    if spectators is not None:
+        spectators.close()
+    engine = server.engine
+    print(f"score {engine.score['left']}-{engine.score['right']} after {stats['ticks']} ticks")
+    print(f"traffic {stats['bytes_per_second'] / 1000:.1f} kB/s, missed inputs {stats['missed_inputs']}")
+
+
+async def _join(args, shim):
+    from .controllers import make_controller
+    client = MatchClient(shim=shim)
+    if args.player == "human":
+        from .game import PongularityGame
+        client.controller = _KeyboardController()
+
+        def on_tick(game):
+            if not game.handle_input():
+                client.finished = True
+            game.render()
+
+        client.engine_factory = lambda tick_rate, swept: PongularityGame(tick_rate, max_fps=0, swept=swept)
+        client.on_tick = on_tick
+    else:
+        client.controller = make_controller(args.player, difficulty=args.difficulty)
+    await client.connect(args.host, args.port, args.transport)
+    print(f"playing {client.side} against the server, round trip {client.rtt * 1000:.1f} ms")
+    stats = await client.play()
+    client.close()
+    engine = client.engine
+    print(f"score {engine.score['left']}-{engine.score['right']}, rollbacks {stats['rollbacks']}, "
+          f"input latency {stats['input_latency'] * 1000:.1f} ms")
+
+
+def main(argv=None):
+    """Command line entry point: host a match or join one."""
+    parser = argparse.ArgumentParser(description="Play Pongularity over the network.")
+    parser.add_argument("mode", choices=["serve", "join"])
+    parser.add_argument("host", nargs="?", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--transport", choices=["udp", "tcp"], default="udp")
+    parser.add_argument("--tick-rate", type=int, default=PongularityEngine.BASE_TICK_RATE,
+                        help="physics ticks per second, set by the server (default: %(default)s)")
+    parser.add_argument("--swept", action="store_true", help="server uses swept collisions")
+    parser.add_argument("--player", default="human",
+                        help="human, or a controller from pongularity.controllers (default: %(default)s)")
+    parser.add_argument("--difficulty", default="normal", help="difficulty of a CPU player")
+    parser.add_argument("--latency", type=float, default=0.0, help="extra one-way delay in ms for what is sent")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra delay in ms")
+    parser.add_argument("--loss", type=float, default=0.0, help="fraction of packets to drop")
+    parser.add_argument("--spectator-port", type=int, help="serve a spectator feed on this port")
+    args = parser.parse_args(argv)
+
+    shim = None
+    if args.latency or args.jitter or args.loss:
+        shim = NetworkShim(args.latency / 1000, args.jitter / 1000, args.loss)
+    asyncio.run((_serve if args.mode == "serve" else _join)(args, shim))
+
+
+if __name__ == "__main__":
+    main()
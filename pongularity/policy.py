@@ -0,0 +1,166 @@
+"""
+Linear and MLP paddle policies evaluated with NumPy, one row per game.
+
+A policy maps an (n, len(FEATURES)) matrix of observations to n outputs in
+[-1, 1], which a controller turns into up, down or still. The features are
+mirrored for the left paddle, so one set of weights plays either side.
+PolicyController drives one PongularityEngine; BatchPolicyController decides
+for every match of a BatchPong with a single matrix product per layer.
+"""
+import numpy as np
+from .controllers import Controller, EngineController
+
+FEATURES = (
+    "distance",   # from the ball to the paddle face, in widths of the field
+    "approach",   # horizontal speed towards the paddle, in MAX_BALL_SPEEDs
+    "offset",     # ball center below paddle center, in heights of the field
+    "dy",         # vertical ball speed, in MAX_BALL_SPEEDs
+    "paddle",     # paddle center relative to the middle of the field
+    "serving",    # 1 while the ball waits to be served
+)
+
+
+def fill_features(out, world, side, ball_x, ball_y, ball_dx, ball_dy, resetting, paddle_y, aim=0.0):
+    """Write FEATURES for scalars or arrays of ball and paddle state into the columns of out."""
+    grid = world.GRID
+    if side == "left":
+        np.multiply(np.subtract(ball_x, world.GRID * 3), 1 / world.WIDTH, out=out[:, 0])
+        np.multiply(ball_dx, -1 / world.MAX_BALL_SPEED, out=out[:, 1])
+    else:
+        np.multiply(np.subtract(world.WIDTH - world.GRID * 4, ball_x), 1 / world.WIDTH, out=out[:, 0])
+        np.multiply(ball_dx, 1 / world.MAX_BALL_SPEED, out=out[:, 1])
+    center = np.add(paddle_y, world.PADDLE_HEIGHT / 2)
+    np.multiply(np.subtract(np.add(ball_y, grid / 2 + aim), center), 1 / world.HEIGHT, out=out[:, 2])
+    np.multiply(ball_dy, 1 / world.MAX_BALL_SPEED, out=out[:, 3])
+    np.multiply(np.subtract(center, world.HEIGHT / 2), 1 / world.HEIGHT, out=out[:, 4])
+    out[:, 5] = resetting
+    return out
+
+
+def quantize(actions, threshold=0.5):
+    """Map policy outputs to -1, 0 or 1, staying still inside the threshold."""
+    return np.sign(actions) * (np.abs(actions) > threshold)
+
+
+class LinearPolicy:
+    """tanh(features @ weights + bias)."""
+
+    def __init__(self, weights, bias=0.0):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        if self.weights.shape != (len(FEATURES),):
+            raise ValueError(f"LinearPolicy needs {len(FEATURES)} weights")
+        self.bias = float(bias)
+
+    @classmethod
+    def tracker(cls, gain=25.0):
+        """A policy that follows the ball's height."""
+        weights = np.zeros(len(FEATURES))
+        weights[FEATURES.index("offset")] = gain
+        return cls(weights)
+
+    def act(self, features):
+        return np.tanh(features @ self.weights + self.bias)
+
+
+class MLPPolicy:
+    """Fully connected tanh network with a single output."""
+
+    def __init__(self, layers):
+        self.layers = [(np.asarray(w, dtype=np.float64), np.asarray(b, dtype=np.float64)) for w, b in layers]
+        if self.layers[0][0].shape[0] != len(FEATURES) or self.layers[-1][0].shape[1] != 1:
+            raise ValueError(f"MLPPolicy needs {len(FEATURES)} inputs and 1 output")
+
+    @classmethod
+    def random(cls, hidden=(16,), seed=0):
+        """A randomly initialized network, as a starting point for training."""
+        rng = np.random.default_rng(seed)
+        sizes = (len(FEATURES),) + tuple(hidden) + (1,)
+        return cls([(rng.normal(0, 1 / np.sqrt(m), (m, n)), np.zeros(n)) for m, n in zip(sizes, sizes[1:])])
+
+    @classmethod
+    def load(cls, path):
+        """Read weights saved with save()."""
+        with np.load(path) as data:
+            return cls([(data[f"w{i}"], data[f"b{i}"]) for i in range(len(data.files) // 2)])
+
+    def save(self, path):
+        """Write the weights to an .npz file."""
+        arrays = {}
+        for i, (w, b) in enumerate(self.layers):
+            arrays[f"w{i}"] = w
+            arrays[f"b{i}"] = b
+        np.savez(path, **arrays)
+
+    def act(self, features):
+        h = features
+        for w, b in self.layers[:-1]:
+            h = np.tanh(h @ w + b)
+        w, b = self.layers[-1]
+        return np.tanh(h @ w + b)[:, 0]
+
+
+class PolicyController(EngineController):
+    """Plays one engine with a NumPy policy (a tracking LinearPolicy by default)."""
+
+    def __init__(self, policy=None, threshold=0.5, **options):
+        super().__init__(**options)
+        self.policy = LinearPolicy.tracker() if policy is None else policy
+        self.threshold = threshold
+        self._features = np.zeros((1, len(FEATURES)))
+
+    def decide(self, engine, side, ball):
+        paddle = engine.left_paddle if side == "left" else engine.right_paddle
+        features = fill_features(self._features, engine, side, ball.x, ball.y, ball.dx, ball.dy,
+                                 ball.resetting, paddle.y, self.offset)
+        return int(quantize(self.policy.act(features), self.threshold)[0])
+
+
+class BatchPolicyController(Controller):
+    """Decides for every match of a BatchPong at once with a NumPy policy."""
+
+    _STATE = ("ball_x", "ball_y", "ball_dx", "ball_dy", "resetting")
+
+    def __init__(self, policy=None, threshold=0.5, **options):
+        super().__init__(**options)
+        self.policy = LinearPolicy.tracker() if policy is None else policy
+        self.threshold = threshold
+        self._history = None
+
+    def observe(self, batch, side):
+        if self._history is None:
+            delay = round(self.reaction_time * batch.TICK_RATE)
+            self._history = np.empty((delay + 1, len(self._STATE), batch.n))
+            for i, name in enumerate(self._STATE):
+                self._history[:, i] = getattr(batch, name)
+            self._slot = 0
+            self._view = self._history[0].copy()
+            self._offsets = np.zeros(batch.n)
+            self._features = np.zeros((batch.n, len(FEATURES)))
+            self._generator = np.random.default_rng(self.rng.getrandbits(64))
+
+        # The ring buffer slot about to be overwritten holds the oldest state
+        history = self._history
+        for i, name in enumerate(self._STATE):
+            history[self._slot, i] = getattr(batch, name)
+        self._slot = (self._slot + 1) % len(history)
+        previous = self._view
+        view = history[self._slot]
+
+        # Aim somewhere new for every serve and every return
+        changed = (view[2] > 0) != (previous[2] > 0)
+        changed |= (previous[4] > 0) & (view[4] == 0)
+        count = np.count_nonzero(changed)
+        if count:
+            self._offsets[changed] = self._generator.uniform(-self.error, self.error, count)
+        previous[:] = view
+
+        paddle_y = batch.left_y if side == "left" else batch.right_y
+        return fill_features(self._features, batch, side, view[0], view[1], view[2], view[3], view[4],
+                             paddle_y, self._offsets)
+
+    def tick_budget(self, batch):
+        # The budget is per match, and one decision covers all of them
+        return self.budget * batch.n
+
+    def decide(self, batch, side, features):
+        return quantize(self.policy.act(features), self.threshold)
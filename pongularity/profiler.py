@@ -0,0 +1,117 @@
+"""
+Frame-time profiler for the game loop.
+
+FrameProfiler records how long each phase of a frame took into fixed-size
+ring buffers, so memory stays constant however long the game runs. Phases
+must be marked in PHASES order; the gaps between marks are what get timed.
+"""
+import csv
+import json
+import math
+import time
+from array import array
+
+PHASES = ("input", "update", "render", "sleep")
+
+
+class FrameProfiler:
+    """Ring buffer of per-phase frame timings with percentile summaries."""
+
+    def __init__(self, capacity=1024, budget=1 / 60, clock=time.perf_counter):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.budget = budget
+        self.clock = clock
+        self.samples = {phase: array("d", bytes(8 * capacity)) for phase in PHASES}
+        self.frame_times = array("d", bytes(8 * capacity))
+        self.frame_starts = array("d", bytes(8 * capacity))
+        self.index = 0
+        self.count = 0
+        self.frames = 0
+        self.dropped_frames = 0
+        self._frame_start = self._last = clock()
+
+    def begin_frame(self):
+        """Start timing a new frame."""
+        self._frame_start = self._last = self.clock()
+
+    def mark(self, phase):
+        """Record the time since the previous mark as the duration of phase."""
+        now = self.clock()
+        self.samples[phase][self.index] = now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """Finish the frame and count the display refreshes it missed."""
+        frame = self._last - self._frame_start
+        self.frame_times[self.index] = frame
+        self.frame_starts[self.index] = self._frame_start
+        if frame > self.budget:
+            self.dropped_frames += int(frame / self.budget)
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frames += 1
+
+    def _ordered(self, buffer):
+        """Buffered values from oldest to newest."""
+        start = (self.index - self.count) % self.capacity
+        return [buffer[(start + i) % self.capacity] for i in range(self.count)]
+
+    def stats(self, phase=None):
+        """Return p50, p99 and max in seconds for a phase, or for whole frames."""
+        buffer = self.frame_times if phase is None else self.samples[phase]
+        values = sorted(self._ordered(buffer))
+        if not values:
+            return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+
+        def percentile(q):
+            return values[max(0, math.ceil(q * len(values)) - 1)]
+
+        return {"p50": percentile(0.50), "p99": percentile(0.99), "max": values[-1]}
+
+    def summary(self):
+        """Return stats for every phase and for whole frames."""
+        summary = {phase: self.stats(phase) for phase in PHASES}
+        summary["frame"] = self.stats()
+        return summary
+
+    def write_csv(self, path):
+        """Write one row per buffered frame with phase durations in milliseconds."""
+        columns = [self._ordered(self.samples[phase]) for phase in PHASES]
+        columns.append(self._ordered(self.frame_times))
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([f"{phase}_ms" for phase in PHASES] + ["frame_ms"])
+            for row in zip(*columns):
+                writer.writerow([f"{value * 1000:.4f}" for value in row])
+
+    def write_chrome_trace(self, path):
+        """Write the buffered frames as Chrome trace events (chrome://tracing, Perfetto)."""
+        events = []
+        starts = self._ordered(self.frame_starts)
+        durations = [self._ordered(self.samples[phase]) for phase in PHASES]
+        for i, start in enumerate(starts):
+            ts = start
+            for phase, phase_durations in zip(PHASES, durations):
+                events.append({"name": phase, "ph": "X", "pid": 1, "tid": 1,
+                               "ts": ts * 1e6, "dur": phase_durations[i] * 1e6})
+                ts += phase_durations[i]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export(self, path):
+        """Write a Chrome trace for .json paths and CSV otherwise."""
+        if path.endswith(".json"):
+            self.write_chrome_trace(path)
+        else:
+            self.write_csv(path)
+
+    def overlay_lines(self):
+        """Human-readable summary lines for the on-screen overlay."""
+        lines = []
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<7} p50 {stats['p50'] * 1000:6.2f}  p99 {stats['p99'] * 1000:6.2f}"
+                         f"  max {stats['max'] * 1000:6.2f} ms")
+        lines.append(f"dropped frames {self.dropped_frames} of {self.frames}")
+        return lines
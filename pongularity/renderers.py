@@ -0,0 +1,206 @@
+"""
+Renderer backends for PongularityGame.
+
+A renderer draws the game's current state and shows it, through
+render(alpha). Two backends are available:
+
+- SurfaceRenderer draws with pygame.draw and blits onto the display surface.
+  It works everywhere and is the fallback. A window size other than the
+  playfield size scales every frame in software.
+- TextureRenderer uses SDL's 2D renderer (pygame._sdl2.video), which
+  draws with the GPU where one is available. Paddle, ball, border, digit
+  and static-screen textures are uploaded once and then only positioned, and
+  the playfield is scaled to any window size with its aspect ratio kept.
+
+Both draw the same pixels at the playfield's own size. Text is rasterized
+with pygame.font onto surfaces either way, then uploaded as a texture the
+first time it is shown.
+"""
+import warnings
+
+import pygame
+
+from .text import DigitGlyphs
+
+
+class SurfaceRenderer:
+    """Software rendering onto a pygame Surface, the window's or an offscreen one."""
+
+    name = "surface"
+
+    def __init__(self, game, surface=None, window_size=None, fullscreen=False):
+        self.game = game
+        self.window = None
+        self.viewport = None
+        game.offscreen = surface is not None
+        if game.offscreen:
+            game.screen = surface
+            return
+
+        logical = (game.WIDTH, game.HEIGHT)
+        if fullscreen:
+            self.window = pygame.display.set_mode(window_size or (0, 0), pygame.FULLSCREEN)
+        else:
+            self.window = pygame.display.set_mode(window_size or logical)
+        pygame.display.set_caption("Pongularity")
+        if window_size is None and not fullscreen:
+            game.screen = self.window
+            return
+
+        # Draw at the playfield size, then scale into the largest centered
+        # rectangle with the playfield's aspect ratio
+        width, height = self.window.get_size()
+        scale = min(width / game.WIDTH, height / game.HEIGHT)
+        size = (round(game.WIDTH * scale), round(game.HEIGHT * scale))
+        self.window.fill((0, 0, 0))
+        self.viewport = self.window.subsurface(pygame.Rect((0, 0), size).move(
+            (width - size[0]) // 2, (height - size[1]) // 2))
+        game.screen = pygame.Surface(logical, 0, self.window)
+
+    def render(self, alpha=1.0):
+        """Draw a frame onto the game's screen and show it."""
+        dirty = self.game.draw_frame(alpha)
+        if self.window is None:
+            return
+        if self.viewport is not None:
+            pygame.transform.scale(self.game.screen, self.viewport.get_size(), self.viewport)
+            pygame.display.flip()
+        elif dirty is not None:
+            pygame.display.update(dirty)
+        else:
+            pygame.display.flip()
+
+
+class TextureRenderer:
+    """SDL 2D renderer drawing pre-uploaded textures, scaled to the window."""
+
+    name = "texture"
+
+    def __init__(self, game, window_size=None, fullscreen=False, vsync=False):
+        # A private pygame module; an ImportError here makes make_renderer()
+        # fall back to SurfaceRenderer
+        from pygame._sdl2.video import Renderer, Texture, Window
+
+        self.game = game
+        self.Texture = Texture
+        logical = (game.WIDTH, game.HEIGHT)
+        if fullscreen:
+            self.window = Window("Pongularity", fullscreen_desktop=True)
+        else:
+            self.window = Window("Pongularity", size=window_size or logical, resizable=True)
+        self.renderer = Renderer(self.window, vsync=vsync)
+        # SDL scales the playfield to the window and letterboxes the rest,
+        # also after the window is resized
+        self.renderer.logical_size = logical
+
+        # Text and static screens are still composed on surfaces, in this
+        # format, before they are uploaded
+        game.offscreen = True
+        game.screen = pygame.Surface(logical)
+
+        self.paddle = self.solid((game.left_paddle.width, game.left_paddle.height), game.WHITE)
+        self.ball = self.solid((game.ball.width, game.ball.height), game.WHITE)
+        self.border = self.solid((game.WIDTH, game.GRID), game.LIGHT_GREY)
+        self.obstacles = [(self.solid((obstacle.width, obstacle.height), game.LIGHT_GREY), obstacle.rect())
+                          for obstacle in game.obstacles]
+        self.digits = None
+        self.static_screens = {}
+        self.overlay = (None, [])
+
+    def solid(self, size, color):
+        """Upload a texture of size filled with color."""
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        return self.Texture.from_surface(self.renderer, surface)
+
+    def static_screen(self, name, winner=None):
+        """Return the texture of a static screen, uploading it on first use."""
+        key = (name, winner)
+        texture = self.static_screens.get(key)
+        if texture is None:
+            texture = self.Texture.from_surface(self.renderer, self.game.static_screen(name, winner))
+            self.static_screens[key] = texture
+        return texture
+
+    def draw_number(self, value, position):
+        """Draw a non-negative integer from digit textures, like DigitGlyphs.draw()."""
+        if self.digits is None:
+            glyphs = DigitGlyphs(self.game.text_cache, self.game.score_font, self.game.WHITE)
+            self.digits = {digit: (self.Texture.from_surface(self.renderer, glyph), glyph.get_size())
+                           for digit, glyph in glyphs.glyphs.items()}
+        x, y = position
+        for digit in str(value):
+            texture, (width, height) = self.digits[digit]
+            texture.draw(dstrect=(x, y, width, height))
+            x += width
+
+    def draw_profiler_overlay(self):
+        """Draw the frame-time overlay, uploading its lines only when they change."""
+        lines = self.game.profiler_overlay()
+        if self.overlay[0] is not lines:
+            textures = [(self.Texture.from_surface(self.renderer, text), text.get_rect(topleft=position))
+                        for text, position in lines]
+            self.overlay = (lines, textures)
+        self.renderer.draw_color = (*self.game.BLACK, 255)
+        for texture, rect in self.overlay[1]:
+            self.renderer.fill_rect(rect)
+            texture.draw(dstrect=rect)
+
+    def render(self, alpha=1.0):
+        """Draw a frame from textures and present it."""
+        game = self.game
+        renderer = self.renderer
+        renderer.draw_color = (*game.BLACK, 255)
+        renderer.clear()
+
+        if game.game_state == "start_screen":
+            self.static_screen("start_screen").draw()
+        elif game.game_state == "playing":
+            left_y, right_y, ball_x, ball_y = game.interpolated_positions(alpha)
+            paddle = game.left_paddle
+            self.paddle.draw(dstrect=(paddle.x, left_y, paddle.width, paddle.height))
+            paddle = game.right_paddle
+            self.paddle.draw(dstrect=(paddle.x, right_y, paddle.width, paddle.height))
+            self.ball.draw(dstrect=(ball_x, ball_y, game.ball.width, game.ball.height))
+            if game.arena is not None:
+                width, height = game.ball.width, game.ball.height
+                for x, y in game.interpolated_balls(alpha):
+                    self.ball.draw(dstrect=(x, y, width, height))
+                for texture, rect in self.obstacles:
+                    texture.draw(dstrect=rect)
+            self.border.draw(dstrect=(0, 0, game.WIDTH, game.GRID))
+            self.border.draw(dstrect=(0, game.HEIGHT - game.GRID, game.WIDTH, game.GRID))
+            self.draw_number(game.score["left"], (game.WIDTH // 4, game.GRID * 4))
+            self.draw_number(game.score["right"], (3 * game.WIDTH // 4, game.GRID * 4))
+        elif game.game_state == "game_over":
+            # The same rule render_game_over() uses to name the winner
+            winner = "LEFT" if game.score["left"] >= game.MAX_SCORE else "RIGHT"
+            self.static_screen("game_over", winner).draw()
+
+        if game.show_profiler:
+            self.draw_profiler_overlay()
+        renderer.present()
+
+    def read_pixels(self):
+        """Return a copy of the window's pixels as a surface, at the window's size."""
+        size = self.window.size
+        return self.renderer.to_surface(pygame.Surface(size, 0, 32), pygame.Rect((0, 0), size))
+
+
+RENDERERS = {"surface": SurfaceRenderer, "texture": TextureRenderer}
+
+
+def make_renderer(name, game, surface=None, window_size=None, fullscreen=False):
+    """Create the renderer called name for game, falling back to SurfaceRenderer.
+
+    Drawing onto a given surface always uses SurfaceRenderer, as there is no
+    window for SDL's renderer.
+    """
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown renderer {name!r}, expected one of {sorted(RENDERERS)}")
+    if name == "texture" and surface is None:
+        try:
+            return TextureRenderer(game, window_size=window_size, fullscreen=fullscreen)
+        except (ImportError, pygame.error) as error:
+            warnings.warn(f"Texture renderer unavailable ({error}), using the surface renderer")
+    return SurfaceRenderer(game, surface=surface, window_size=window_size, fullscreen=fullscreen)
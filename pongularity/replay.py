@@ -0,0 +1,254 @@
+"""
+Compact input recordings and a headless replay engine.
+
+A recording stores only what the simulation cannot work out for itself: the
+paddle input on every tick (2 bits per paddle), the ticks at which a new
+match was started, and the seed and config of the session. Inputs are
+run-length encoded as LEB128 varints and zlib-compressed, so a long session
+of held keys fits in a few kilobytes.
+
+File layout (little endian)::
+
+    b"PONGREC" version:u8 seed:u64 config_length:u16 config:JSON body:zlib
+
+Each body symbol is varint((run_length << 4) | code). Bits 0-1 of the code
+are the left paddle input and bits 2-3 the right paddle input (0 = still,
+1 = up, 2 = down). Code START marks a reset_game() before the next tick and
+does not take up a tick itself.
+"""
+import argparse
+import json
+import struct
+import time
+import zlib
+from .config import DEFAULT_CONFIG, GameConfig
+from .engine import PongularityEngine
+
+MAGIC = b"PONGREC"
+VERSION = 1
+START = 3
+
+_HEADER = struct.Struct("<BQH")
+
+
+def input_code(dy):
+    """Map a paddle speed to its 2-bit input code."""
+    if dy < 0:
+        return 1
+    if dy > 0:
+        return 2
+    return 0
+
+
+def _write_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varints(data):
+    value = 0
+    shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = 0
+            shift = 0
+    if shift:
+        raise ValueError("Truncated replay body")
+
+
+class InputRecorder:
+    """Collects per-tick paddle inputs as run-length encoded symbols."""
+
+    def __init__(self, seed=0, config=None):
+        self.seed = seed
+        self.config = dict(config or {})
+        self.ticks = 0
+        self._runs = []
+
+    @classmethod
+    def for_engine(cls, engine, seed=0):
+        """Create a recorder whose config lets a replay rebuild engine."""
+        config = {"tick_rate": engine.TICK_RATE, "swept": engine.SWEPT}
+        if engine.config != DEFAULT_CONFIG:
+            config["rules"] = engine.config.to_dict()
+        return cls(seed, config)
+
+    def _append(self, code):
+        runs = self._runs
+        if runs and runs[-1][0] == code and code != START:
+            runs[-1][1] += 1
+        else:
+            runs.append([code, 1])
+
+    def record(self, left_dy, right_dy):
+        """Record the paddle inputs used for one tick."""
+        self._append(input_code(left_dy) | input_code(right_dy) << 2)
+        self.ticks += 1
+
+    def record_start(self):
+        """Record that reset_game() was called before the next tick."""
+        self._append(START)
+
+    def to_bytes(self):
+        """Encode the recording."""
+        body = bytearray()
+        for code, length in self._runs:
+            _write_varint(body, length << 4 | code)
+        config = json.dumps(self.config, sort_keys=True).encode()
+        return (MAGIC + _HEADER.pack(VERSION, self.seed, len(config)) + config +
+                zlib.compress(bytes(body), 9))
+
+    def save(self, path):
+        """Write the recording to path."""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+class Replay:
+    """A decoded recording: per-tick input codes plus the ticks where matches start."""
+
+    def __init__(self, seed, config, inputs, starts):
+        self.seed = seed
+        self.config = config
+        self.inputs = inputs
+        self.starts = starts
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decode a recording produced by InputRecorder.to_bytes()."""
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a Pongularity recording")
+        offset = len(MAGIC)
+        version, seed, config_length = _HEADER.unpack_from(data, offset)
+        if version != VERSION:
+            raise ValueError(f"Unsupported recording version {version}")
+        offset += _HEADER.size
+        config = json.loads(data[offset:offset + config_length])
+        body = zlib.decompress(data[offset + config_length:])
+
+        inputs = bytearray()
+        starts = set()
+        for symbol in _read_varints(body):
+            code, length = symbol & 0xF, symbol >> 4
+            if code == START:
+                starts.add(len(inputs))
+            else:
+                inputs += bytes((code,)) * length
+        return cls(seed, config, inputs, starts)
+
+    @classmethod
+    def load(cls, path):
+        """Read and decode a recording file."""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def engine_options(self):
+        """Return the keyword arguments that build an engine like the recorded one."""
+        config = self.config
+        return {
+            "tick_rate": config.get("tick_rate", PongularityEngine.BASE_TICK_RATE),
+            "swept": config.get("swept", False),
+            "config": GameConfig.from_dict(config.get("rules", {})),
+        }
+
+
+class ReplayPlayer:
+    """Re-simulates a Replay headless, with keyframes for fast seeking.
+
+    engine defaults to a new PongularityEngine built from the replay's
+    config; pass a PongularityGame (with the same config) to draw the replay.
+    """
+
+    def __init__(self, replay, keyframe_interval=600, engine=None):
+        self.replay = replay
+        self.keyframe_interval = keyframe_interval
+        self.engine = engine or PongularityEngine(**replay.engine_options())
+        self.position = 0
+        self.keyframes = {0: self.keyframe()}
+        speed = self.engine.PADDLE_SPEED
+        self._speeds = (0, -speed, speed)
+
+    def step(self, ticks=1):
+        """Advance the replay by up to ticks ticks and return how many were played."""
+        engine = self.engine
+        inputs = self.replay.inputs
+        starts = self.replay.starts
+        speeds = self._speeds
+        interval = self.keyframe_interval
+        keyframes = self.keyframes
+        left_paddle = engine.left_paddle
+        right_paddle = engine.right_paddle
+
+        position = self.position
+        end = min(position + ticks, len(inputs))
+        while position < end:
+            if position in starts:
+                engine.reset_game()
+            code = inputs[position]
+            left_paddle.dy = speeds[code & 3]
+            right_paddle.dy = speeds[code >> 2]
+            engine.update()
+            position += 1
+            if position % interval == 0 and position not in keyframes:
+                keyframes[position] = self.keyframe()
+
+        played = position - self.position
+        self.position = position
+        return played
+
+    def keyframe(self):
+        """Return the engine state to seek back to, including every arena ball."""
+        arena = self.engine.arena
+        return self.engine.snapshot(), arena.snapshot() if arena is not None else None
+
+    def run(self):
+        """Play the rest of the replay as fast as possible."""
+        return self.step(len(self.replay.inputs) - self.position)
+
+    def seek(self, tick):
+        """Jump to the state after tick ticks, starting from the nearest keyframe."""
+        tick = max(0, min(tick, len(self.replay.inputs)))
+        keyframe = max(t for t in self.keyframes if t <= tick)
+        if not keyframe <= self.position <= tick:
+            snapshot, arena = self.keyframes[keyframe]
+            self.engine.restore(snapshot)
+            if arena is not None:
+                self.engine.arena.restore(arena)
+            self.position = keyframe
+        self.step(tick - self.position)
+
+
+def main(argv=None):
+    """Command line entry point: replay a recording headless and summarize it."""
+    parser = argparse.ArgumentParser(description="Replay a Pongularity recording headless.")
+    parser.add_argument("path")
+    parser.add_argument("--seek", type=int, default=None, help="stop after this many ticks")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.path)
+    player = ReplayPlayer(replay)
+    started = time.perf_counter()
+    if args.seek is None:
+        player.run()
+    else:
+        player.seek(args.seek)
+    elapsed = time.perf_counter() - started
+
+    engine = player.engine
+    game_seconds = player.position / engine.TICK_RATE
+    print(f"ticks:      {player.position} of {len(replay)} ({game_seconds:.1f} s of game time)")
+    print(f"state:      {engine.game_state}, score {engine.score['left']}-{engine.score['right']}")
+    print(f"replayed in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+"""
+Headless server hosting many networked matches in one process.
+
+RoomServer speaks the pongularity.net protocol, so MatchClient joins it
+unchanged. Every room is a lane of one BatchPong, and a single scheduler
+advances them all with one vectorized step per tick; only applying inputs
+and encoding states is done room by room. Clients are paired by the room
+number in their HELLO, or into the next open room when they ask for 0.
+Rooms still waiting for a second player after wait_timeout seconds are
+closed, and so are connections that never get a seat.
+
+serve_sharded() runs a RoomServer in each of several worker processes,
+worker i listening on port + i; shard_port() says which worker hosts a room.
+
+stats() reports how late the scheduler starts each tick (tick lag), the CPU
+time per tick split into the shared batch step and per-room work, and from
+those the number of rooms one core could keep up with at the tick rate.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+from collections import deque
+from itertools import repeat
+import numpy as np
+from .batch import BatchPong, START_SCREEN
+from .engine import GAME_STATES, SNAPSHOT_FIELDS, PongularityEngine
+from .net import (HELLO, HISTORY_TICKS, INPUT, SIDES, Player, ServerEndpoint, bye_packet, encode_state,
+                  packet_type, parse_hello, welcome_packet)
+
+# Room numbers handed out to clients that ask for any room; clients can ask
+# for the numbers below
+AUTO_ROOMS = 1 << 31
+
+# Seconds a room waits for its second player, and an unseated peer for a seat
+WAIT_TIMEOUT = 30.0
+
+# Recent ticks kept for percentiles
+WINDOW = 1024
+
+_GAME_STATE = SNAPSHOT_FIELDS.index("game_state")
+
+
+class Room:
+    """One match on a RoomServer: a lane of its BatchPong and up to two players."""
+
+    def __init__(self, number, lane, opened=0):
+        self.number = number
+        self.lane = lane
+        self.opened = opened
+        self.players = {}
+        self.history = {}
+        self.final = None
+        self.closing = 0
+        self.ticks = 0
+        self.cpu_time = 0.0
+
+
+class RoomServer(ServerEndpoint):
+    """Plays up to capacity matches at once on one shared scheduler."""
+
+    def __init__(self, capacity=256, tick_rate=PongularityEngine.BASE_TICK_RATE, delta=True, shim=None,
+                 linger=0.25, wait_timeout=WAIT_TIMEOUT):
+        super().__init__(shim)
+        self.batch = BatchPong(capacity, tick_rate)
+        self.delta = delta
+        self.linger_ticks = max(1, round(linger * tick_rate))
+        self.wait_ticks = max(1, round(wait_timeout * tick_rate))
+        self._expire_every = max(1, round(tick_rate))
+        self.free_lanes = list(range(capacity - 1, -1, -1))
+        self.rooms = {}
+        self.active = []
+        self.seats = {}
+        self.unseated = {}
+        self.waiting = None
+        self.stopping = False
+        self._next_auto = AUTO_ROOMS
+        self._lanes = np.empty(0, dtype=np.intp)
+        speed = self.batch.PADDLE_SPEED
+        self._speeds = (0.0, -speed, speed)
+
+        self.ticks = 0
+        self.finished_rooms = 0
+        self.expired_rooms = 0
+        self.rejected = 0
+        self.room_ticks = 0
+        self.tick_time = 0.0
+        self.step_time = 0.0
+        self.receive_time = 0.0
+        self.room_time = 0.0
+        self.max_lag = 0.0
+        self.lags = deque(maxlen=WINDOW)
+        self.tick_times = deque(maxlen=WINDOW)
+        self.started_at = None
+
+    def open_room(self, number):
+        """Reserve a lane for room number; None when the server is full."""
+        if not self.free_lanes:
+            self.rejected += 1
+            return None
+        room = self.rooms[number] = Room(number, self.free_lanes.pop(), self.ticks)
+        return room
+
+    def find_room(self, number):
+        """Return the room a new client asking for number joins, or None."""
+        if number >= AUTO_ROOMS:
+            # Reserved for rooms handed out by the server
+            self.rejected += 1
+            return None
+        if number:
+            room = self.rooms.get(number)
+            if room is None:
+                return self.open_room(number)
+            return room if len(room.players) < len(SIDES) else None
+        room = self.waiting
+        if room is None or len(room.players) == len(SIDES) or room.number not in self.rooms:
+            while self._next_auto in self.rooms:
+                self._next_auto += 1
+            room = self.waiting = self.open_room(self._next_auto)
+            self._next_auto += 1
+        return room
+
+    def add_peer(self, peer, write, ordered=False):
+        super().add_peer(peer, write, ordered)
+        self.unseated[peer] = self.ticks
+
+    def receive(self, data, peer):
+        started = time.perf_counter()
+        kind = packet_type(data)
+        seat = self.seats.get(peer)
+        if kind == HELLO and not self.stopping:
+            sent, number = parse_hello(data)
+            if seat is None:
+                write = self.peers.get(peer)
+                if write is None:
+                    # Expired before it was seated
+                    return
+                room = self.find_room(number)
+                if room is None:
+                    return
+                player = Player(SIDES[len(room.players)], write)
+                room.players[peer] = player
+                seat = self.seats[peer] = (room, player)
+                self.unseated.pop(peer, None)
+                if len(room.players) == len(SIDES):
+                    self.start_room(room)
+            room, player = seat
+            player.bytes_received += len(data)
+            self.send(player, welcome_packet(player.side, sent, self.batch.TICK_RATE))
+        elif kind == INPUT and seat is not None:
+            room, player = seat
+            player.bytes_received += len(data)
+            player.receive_input(data, self.batch.tick, room.history)
+        else:
+            return
+        elapsed = time.perf_counter() - started
+        room.cpu_time += elapsed
+        self.receive_time += elapsed
+        self.room_time += elapsed
+
+    def start_room(self, room):
+        """Begin the match in a full room and send its players the first state."""
+        mask = np.zeros(self.batch.n, dtype=bool)
+        mask[room.lane] = True
+        self.batch.reset_game(mask)
+        self.active.append(room)
+        self._lanes = np.array([r.lane for r in self.active], dtype=np.intp)
+        snapshot, = self.snapshots(self._lanes[-1:])
+        room.history[snapshot[-2]] = snapshot
+        self.send_states(room, snapshot)
+
+    def close_room(self, room):
+        """Free a finished room's lane and forget its players."""
+        self.active.remove(room)
+        self._lanes = np.array([r.lane for r in self.active], dtype=np.intp)
+        del self.rooms[room.number]
+        for peer in room.players:
+            del self.seats[peer]
+            del self.peers[peer]
+        self.free_lanes.append(room.lane)
+        self.finished_rooms += 1
+
+    def expire(self):
+        """Close rooms still waiting for a second player, and forget peers never seated, after wait_ticks."""
+        cutoff = self.ticks - self.wait_ticks
+        active = set(map(id, self.active))
+        for room in [room for room in self.rooms.values() if id(room) not in active and room.opened < cutoff]:
+            del self.rooms[room.number]
+            for peer in room.players:
+                del self.seats[peer]
+                self.peers.pop(peer, None)
+            self.free_lanes.append(room.lane)
+            if self.waiting is room:
+                self.waiting = None
+            self.expired_rooms += 1
+        for peer in [peer for peer, seen in self.unseated.items() if seen < cutoff]:
+            del self.unseated[peer]
+            self.peers.pop(peer, None)
+
+    def snapshots(self, lanes):
+        """Return engine snapshots of the given lanes, converted a column at a time."""
+        batch = self.batch
+        columns = [array[lanes].tolist() for array in (
+            batch.left_y, batch.left_dy, batch.right_y, batch.right_dy, batch.ball_x, batch.ball_y,
+            batch.ball_dx, batch.ball_dy, batch.resetting, batch.left_score, batch.right_score)]
+        states = [GAME_STATES[state] for state in batch.game_state[lanes].tolist()]
+        return list(zip(*columns, states, repeat(batch.tick), batch.reset_timer[lanes].tolist()))
+
+    def send_states(self, room, snapshot):
+        """Send a room's players the state, encoding once per distinct baseline."""
+        tick = snapshot[-2]
+        history = room.history
+        encoded = {}
+        for player in room.players.values():
+            baseline = player.baseline(history, self.delta)
+            state = encoded.get(baseline)
+            if state is None:
+                state = encoded[baseline] = encode_state(snapshot, history.get(baseline))
+            self.send(player, player.state_packet(tick, tick - baseline if baseline is not None else 0, *state))
+
+    def finish(self, room, snapshot):
+        """End a room's match: idle its lane and repeat the final state for the linger time."""
+        room.final = bye_packet(snapshot)
+        room.closing = self.linger_ticks
+        self.batch.game_state[room.lane] = START_SCREEN
+
+    def stop(self):
+        """Stop taking players and end every match in progress."""
+        self.stopping = True
+        for room in self.active:
+            if not room.closing:
+                self.finish(room, self.snapshots(np.array([room.lane]))[0])
+
+    def tick(self):
+        """Advance every room by one tick with one batch step."""
+        started = clock = time.perf_counter()
+        batch = self.batch
+        tick = batch.tick + 1
+        speeds = self._speeds
+        left_dy = batch.left_dy
+        right_dy = batch.right_dy
+        for room in self.active:
+            if not room.closing:
+                for player in room.players.values():
+                    dy = left_dy if player.side == "left" else right_dy
+                    dy[room.lane] = speeds[player.next_code(tick)]
+                now = time.perf_counter()
+                room.cpu_time += now - clock
+                clock = now
+
+        batch.step()
+        now = time.perf_counter()
+        step_time = now - clock
+        self.step_time += step_time
+        clock = now
+        snapshots = self.snapshots(self._lanes)
+        if snapshots:
+            # Converting the lanes is shared out evenly
+            now = time.perf_counter()
+            share = (now - clock) / len(snapshots)
+            for room in self.active:
+                room.cpu_time += share
+            clock = now
+
+        for room, snapshot in zip(list(self.active), snapshots):
+            if room.closing:
+                for player in room.players.values():
+                    self.send(player, room.final)
+                room.closing -= 1
+                if not room.closing:
+                    self.close_room(room)
+            else:
+                room.ticks += 1
+                room.history[tick] = snapshot
+                room.history.pop(tick - HISTORY_TICKS, None)
+                self.send_states(room, snapshot)
+                if snapshot[_GAME_STATE] != "playing":
+                    self.finish(room, snapshot)
+            now = time.perf_counter()
+            room.cpu_time += now - clock
+            clock = now
+
+        self.ticks += 1
+        if self.ticks % self._expire_every == 0:
+            self.expire()
+            clock = time.perf_counter()
+        elapsed = clock - started
+        self.tick_time += elapsed
+        self.tick_times.append(elapsed)
+        if snapshots:
+            self.room_ticks += len(snapshots)
+            self.room_time += elapsed - step_time
+
+    async def run(self, max_ticks=None, report_every=None, report=print):
+        """Tick every room on one schedule until stop() or max_ticks, and return stats().
+
+        Every report_every seconds, report() is called with a summary line.
+        """
+        loop = asyncio.get_running_loop()
+        period = 1 / self.batch.TICK_RATE
+        deadline = loop.time()
+        next_report = deadline + report_every if report_every else None
+        self.started_at = time.perf_counter()
+        while not (self.stopping and not self.active):
+            lag = max(loop.time() - deadline, 0.0)
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            self.tick()
+            if max_ticks is not None and self.ticks >= max_ticks and not self.stopping:
+                self.stop()
+            if next_report is not None and loop.time() >= next_report:
+                report(self.summary())
+                next_report += report_every
+
+            deadline += period
+            delay = deadline - loop.time()
+            if delay < -8 * period:
+                # Fall behind gracefully instead of spiralling after a long stall
+                deadline = loop.time()
+            await asyncio.sleep(max(delay, 0))
+        return self.stats()
+
+    def stats(self):
+        """Return room counts, tick lag and CPU time in seconds, and the estimated per-core capacity.
+
+        room_cpu is the CPU time per room per tick outside the batch step,
+        whose cost (step_time) depends on the capacity, not on how many
+        rooms are playing. capacity is how many rooms one core could tick at
+        the tick rate: what is left of a tick after the step, over room_cpu.
+        """
+        ticks = self.ticks or 1
+        lags = sorted(self.lags) or [0.0]
+        tick_times = sorted(self.tick_times) or [0.0]
+        busy = self.tick_time + self.receive_time
+        room_cpu = self.room_time / self.room_ticks if self.room_ticks else 0.0
+        spare = 1 / self.batch.TICK_RATE - self.step_time / ticks
+        players = list(self.seats.values())
+        return {
+            "rooms": len(self.active),
+            "waiting_rooms": len(self.rooms) - len(self.active),
+            "finished_rooms": self.finished_rooms,
+            "expired_rooms": self.expired_rooms,
+            "rejected": self.rejected,
+            "ticks": self.ticks,
+            "tick_lag": sum(lags) / len(lags),
+            "tick_lag_p99": lags[int(len(lags) * 0.99)],
+            "tick_lag_max": self.max_lag,
+            "tick_time": self.tick_time / ticks,
+            "tick_time_p99": tick_times[int(len(tick_times) * 0.99)],
+            "step_time": self.step_time / ticks,
+            "room_cpu": room_cpu,
+            "utilization": busy / ticks * self.batch.TICK_RATE,
+            "capacity": max(0, int(spare / room_cpu)) if room_cpu else None,
+            "bytes_sent": sum(player.bytes_sent for _, player in players),
+            "bytes_received": sum(player.bytes_received for _, player in players),
+        }
+
+    def room_stats(self):
+        """Return each active room's ticks played and CPU seconds per tick."""
+        return {room.number: {"ticks": room.ticks, "cpu": room.cpu_time / max(room.ticks, 1)}
+                for room in self.active}
+
+    def summary(self):
+        stats = self.stats()
+        return (f"rooms {stats['rooms']} (+{stats['waiting_rooms']} waiting), "
+                f"lag {stats['tick_lag'] * 1000:.2f}/{stats['tick_lag_p99'] * 1000:.2f} ms mean/p99, "
+                f"{stats['room_cpu'] * 1e6:.1f} us/room/tick, load {stats['utilization']:.0%}, "
+                f"capacity ~{stats['capacity'] or '?'} rooms/core")
+
+
+def shard_port(port, room, workers):
+    """Port of the worker hosting room when serve_sharded() listens from port."""
+    return port + room % workers
+
+
+def _worker(index, host, port, max_ticks, report_every, options, results):
+    async def serve():
+        server = RoomServer(**options)
+        await server.listen(host, port)
+        stats = await server.run(max_ticks, report_every, lambda line: print(f"[worker {index}] {line}",
+                                                                             flush=True))
+        server.close()
+        return stats
+
+    results.put((index, asyncio.run(serve())))
+
+
+def serve_sharded(workers, host="127.0.0.1", port=7777, max_ticks=None, report_every=None, **options):
+    """Run a RoomServer in each of workers processes, worker i on port + i; return their stats().
+
+    Blocks until every worker has finished, which without max_ticks is
+    when the process is interrupted. options go to RoomServer.
+    """
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    processes = [context.Process(target=_worker, daemon=True,
+                                 args=(i, host, port + i, max_ticks, report_every, options, results))
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    stats = dict(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return [stats[i] for i in range(workers)]
+
+
+def main(argv=None):
+    """Command line entry point: host rooms until interrupted."""
+    parser = argparse.ArgumentParser(description="Host many Pongularity matches for pongularity.net clients.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777, help="first port; worker i listens on port + i")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: %(default)s)")
+    parser.add_argument("--capacity", type=int, default=256, help="rooms per worker (default: %(default)s)")
+    parser.add_argument("--tick-rate", type=int, default=PongularityEngine.BASE_TICK_RATE)
+    parser.add_argument("--report-every", type=float, default=5.0, metavar="SECONDS",
+                        help="print load and capacity this often (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    print(f"hosting up to {args.capacity} rooms on each of ports {args.port}-{args.port + args.workers - 1}")
+    try:
+        serve_sharded(args.workers, args.host, args.port, report_every=args.report_every,
+                      capacity=args.capacity, tick_rate=args.tick_rate)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Live spectator feed: a compact broadcast of a match's state for viewers.
+
+SpectatorFeed turns the engine snapshot of every tick into one frame of at
+most a few bytes and hands the same bytes to every subscriber, so the cost
+of encoding does not grow with the audience. Viewers draw the frames with
+PongularityGame.render() like a local match.
+
+Positions are quantized to a quarter pixel. A keyframe with every field
+starts each second (keyframe_interval ticks); the frames in between are
+deltas from the previous frame, in which a position that moved by less
+than 32 pixels costs one byte. New subscribers are sent the frames since
+the last keyframe straight away, and a viewer that misses a frame waits
+for the next keyframe.
+
+Frames (little endian), all starting with a type byte::
+
+    KEY    seq:u16 tick:u32 ball_x ball_y left_y right_y:i16 scores:2*u8 state:u8
+    DELTA  seq:u16 mask:u16 changes
+
+Bits 2i and 2i+1 of the delta mask say how position i changed: not at all,
+by a signed byte, or to a new i16 value. Bit 8 means the two scores
+follow and bit 9 the game state. SpectatorServer accepts viewers over UDP
+or TCP; viewers send WATCH every second to keep receiving.
+"""
+import argparse
+import asyncio
+import struct
+import time
+from .engine import GAME_STATES, SNAPSHOT_FIELDS
+from .net import ServerEndpoint, open_connection
+
+KEY, DELTA, WATCH = range(1, 4)
+
+# Quantization steps per pixel
+SCALE = 4
+
+# Seconds after its last WATCH that a viewer is dropped
+VIEWER_TIMEOUT = 5.0
+
+_KEY = struct.Struct("<BHIhhhhBBB")
+_DELTA = struct.Struct("<BHH")
+_BYTE = struct.Struct("<b")
+_SHORT = struct.Struct("<h")
+_SCORES = struct.Struct("<BB")
+
+# Range of a quantized position (i16) and of a score (u8)
+_POSITION_MIN, _POSITION_MAX = -(1 << 15), (1 << 15) - 1
+_SCORE_MAX = 255
+
+_FIELDS = [SNAPSHOT_FIELDS.index(name) for name in (
+    "ball_x", "ball_y", "left_y", "right_y", "left_score", "right_score", "game_state", "tick")]
+_POSITIONS = 4
+_SCORE_BIT = 1 << 8
+_STATE_BIT = 1 << 9
+
+
+def quantize(snapshot):
+    """Return the spectator view of an engine snapshot as a tuple of integers.
+
+    The order is ball_x, ball_y, left_y, right_y, left_score, right_score,
+    game_state (as an index into GAME_STATES), tick; positions are in
+    1 / SCALE pixels. Positions beyond what a 16-bit frame field holds, such
+    as a fast ball that has just left a large field, and scores over 255 are
+    clamped.
+    """
+    bx, by, ly, ry, left, right, state, tick = (snapshot[i] for i in _FIELDS)
+    return (_position(bx), _position(by), _position(ly), _position(ry), min(left, _SCORE_MAX),
+            min(right, _SCORE_MAX), GAME_STATES.index(state), tick)
+
+
+def _position(value):
+    return min(max(round(value * SCALE), _POSITION_MIN), _POSITION_MAX)
+
+
+def encode_delta(seq, view, previous):
+    """Encode the change from the previous view."""
+    mask = 0
+    payload = bytearray()
+    for i in range(_POSITIONS):
+        change = view[i] - previous[i]
+        if change:
+            if -128 <= change <= 127:
+                mask |= 1 << (2 * i)
+                payload += _BYTE.pack(change)
+            else:
+                mask |= 2 << (2 * i)
+                payload += _SHORT.pack(view[i])
+    if view[4:6] != previous[4:6]:
+        mask |= _SCORE_BIT
+        payload += _SCORES.pack(view[4], view[5])
+    if view[6] != previous[6]:
+        mask |= _STATE_BIT
+        payload.append(view[6])
+    return _DELTA.pack(DELTA, seq, mask) + payload
+
+
+def encode_key(seq, view):
+    return _KEY.pack(KEY, seq, view[7], *view[:7])
+
+
+def frame_size(data):
+    """Return the length a KEY or DELTA frame should have, from its header, or None if it has none."""
+    if data[:1] == bytes((KEY,)):
+        return _KEY.size
+    if data[:1] != bytes((DELTA,)) or len(data) < _DELTA.size:
+        return None
+    _, _, mask = _DELTA.unpack_from(data)
+    size = _DELTA.size
+    for i in range(_POSITIONS):
+        size += (0, 1, 2, 0)[mask >> (2 * i) & 3]
+    if mask & _SCORE_BIT:
+        size += _SCORES.size
+    if mask & _STATE_BIT:
+        size += 1
+    return size
+
+
+def decode_frame(data, previous):
+    """Return (seq, view) for a frame; deltas need the previous view."""
+    if data[0] == KEY:
+        _, seq, tick, *fields = _KEY.unpack(data)
+        return seq, tuple(fields) + (tick,)
+    _, seq, mask = _DELTA.unpack_from(data)
+    view = list(previous)
+    offset = _DELTA.size
+    for i in range(_POSITIONS):
+        kind = mask >> (2 * i) & 3
+        if kind == 1:
+            view[i] += _BYTE.unpack_from(data, offset)[0]
+            offset += 1
+        elif kind == 2:
+            view[i], = _SHORT.unpack_from(data, offset)
+            offset += 2
+    if mask & _SCORE_BIT:
+        view[4], view[5] = _SCORES.unpack_from(data, offset)
+        offset += 2
+    if mask & _STATE_BIT:
+        view[6] = data[offset]
+    view[7] += 1
+    return seq, tuple(view)
+
+
+class SpectatorFeed:
+    """Encodes each tick once and sends the frame to every subscriber."""
+
+    def __init__(self, keyframe_interval=60, clock=time.perf_counter):
+        self.keyframe_interval = keyframe_interval
+        self.clock = clock
+        self.subscribers = {}
+        self.backlog = []
+        self.view = None
+        self.seq = 0
+        self.frames = 0
+        self.frame_bytes = 0
+        self.bytes_sent = 0
+        self.encode_time = 0.0
+        self.fanout_time = 0.0
+
+    def subscribe(self, key, write):
+        """Start sending frames to write, beginning with those since the last keyframe."""
+        self.subscribers[key] = write
+        for frame in self.backlog:
+            write(frame)
+            self.bytes_sent += len(frame)
+
+    def unsubscribe(self, key):
+        self.subscribers.pop(key, None)
+
+    def publish(self, snapshot):
+        """Encode one tick's snapshot and send it to every subscriber."""
+        started = self.clock()
+        view = quantize(snapshot)
+        seq = self.seq = (self.seq + 1) & 0xFFFF
+        if self.view is None or self.frames % self.keyframe_interval == 0:
+            frame = encode_key(seq, view)
+            self.backlog = [frame]
+        else:
+            frame = encode_delta(seq, view, self.view)
+            self.backlog.append(frame)
+        self.view = view
+        self.frames += 1
+        self.frame_bytes += len(frame)
+        encoded = self.clock()
+
+        subscribers = self.subscribers.values()
+        for write in subscribers:
+            write(frame)
+        self.bytes_sent += len(frame) * len(subscribers)
+        self.encode_time += encoded - started
+        self.fanout_time += self.clock() - encoded
+        return frame
+
+    def stats(self):
+        """Return frame counts, bytes and the encode and fan-out time per frame in seconds."""
+        frames = self.frames or 1
+        return {
+            "subscribers": len(self.subscribers),
+            "frames": self.frames,
+            "bytes_per_frame": self.frame_bytes / frames,
+            "bytes_sent": self.bytes_sent,
+            "encode_time": self.encode_time / frames,
+            "fanout_time": self.fanout_time / frames,
+        }
+
+
+class SpectatorServer(ServerEndpoint):
+    """Serves a SpectatorFeed to viewers that send WATCH; pass it to MatchServer(spectators=...)."""
+
+    def __init__(self, feed=None, timeout=VIEWER_TIMEOUT, shim=None, clock=time.monotonic):
+        super().__init__(shim)
+        self.feed = feed or SpectatorFeed()
+        self.timeout = timeout
+        self.clock = clock
+        self.last_seen = {}
+        self._next_expiry = 0.0
+
+    def receive(self, data, peer):
+        if data[:1] == bytes((WATCH,)):
+            if peer not in self.last_seen:
+                self.feed.subscribe(peer, self.peers[peer])
+            self.last_seen[peer] = self.clock()
+
+    def expire(self):
+        """Drop viewers that have not sent WATCH within the timeout."""
+        cutoff = self.clock() - self.timeout
+        for peer in [peer for peer, seen in self.last_seen.items() if seen < cutoff]:
+            del self.last_seen[peer]
+            self.peers.pop(peer, None)
+            self.feed.unsubscribe(peer)
+
+    def publish(self, snapshot):
+        now = self.clock()
+        if now >= self._next_expiry:
+            self._next_expiry = now + 1.0
+            self.expire()
+        return self.feed.publish(snapshot)
+
+
+class SpectatorClient:
+    """Follows a spectator feed and applies it to a PongularityEngine (or PongularityGame)."""
+
+    def __init__(self):
+        self.view = None
+        self.seq = None
+        self.frames = 0
+        self.gaps = 0
+        self.bytes_received = 0
+        self._closers = []
+
+    def receive(self, data):
+        """Decode one frame; return True when it changed the view."""
+        self.bytes_received += len(data)
+        if len(data) != frame_size(data):
+            # Truncated, padded or not a frame
+            return False
+        kind = data[0]
+        if kind == DELTA:
+            seq, = struct.unpack_from("<H", data, 1)
+            if self.view is None or seq != (self.seq + 1) & 0xFFFF:
+                if self.view is not None:
+                    # Missed a frame: wait for the next keyframe
+                    self.gaps += 1
+                    self.view = None
+                return False
+        elif kind != KEY:
+            return False
+        seq, view = decode_frame(data, self.view)
+        if view[6] >= len(GAME_STATES):
+            return False
+        self.seq, self.view = seq, view
+        self.frames += 1
+        return True
+
+    def apply(self, engine):
+        """Move the engine's paddles, ball, score and game state to the latest view."""
+        bx, by, ly, ry, left, right, state, tick = self.view
+        engine.ball.x = bx / SCALE
+        engine.ball.y = by / SCALE
+        engine.left_paddle.y = ly / SCALE
+        engine.right_paddle.y = ry / SCALE
+        engine.score["left"] = left
+        engine.score["right"] = right
+        engine.game_state = GAME_STATES[state]
+        engine.tick = tick
+
+    async def watch(self, host, port, transport="udp", interval=1.0):
+        """Subscribe to host:port and keep the subscription alive until close()."""
+        write, _, close = await open_connection(host, port, transport, self.receive)
+        self._closers.append(close)
+        watch = bytes((WATCH,))
+        try:
+            while True:
+                write(watch)
+                await asyncio.sleep(interval)
+        finally:
+            self.close()
+
+    def close(self):
+        for close in self._closers:
+            close()
+        self._closers.clear()
+
+
+async def _view(args):
+    import pygame
+    from .game import PongularityGame
+    game = PongularityGame(max_fps=0)
+    pygame.display.set_caption("Pongularity (spectating)")
+    client = SpectatorClient()
+    watching = asyncio.get_running_loop().create_task(client.watch(args.host, args.port, args.transport))
+    try:
+        while not any(event.type == pygame.QUIT for event in pygame.event.get()):
+            if client.view is not None:
+                client.apply(game)
+            game.render()
+            await asyncio.sleep(1 / game.TICK_RATE)
+    finally:
+        watching.cancel()
+        pygame.quit()
+
+
+def main(argv=None):
+    """Command line entry point: watch a match served with --spectator-port."""
+    parser = argparse.ArgumentParser(description="Watch a networked Pongularity match.")
+    parser.add_argument("host", nargs="?", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7778)
+    parser.add_argument("--transport", choices=["udp", "tcp"], default="udp")
+    args = parser.parse_args(argv)
+    asyncio.run(_view(args))
+
+
+if __name__ == "__main__":
+    main()
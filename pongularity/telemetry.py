@@ -0,0 +1,263 @@
+"""
+Match telemetry: engine events streamed to disk and summarized as they arrive.
+
+Telemetry.attach(engine) sets the engine's on_event hook. Each event is
+appended to a bounded in-memory queue and nothing else happens on the game
+thread: when the queue is full the event is counted as dropped rather than
+waiting. A writer thread wakes every flush_interval seconds, writes what
+has queued up in one batch, and folds it into running aggregates:
+
+- rally length: paddle hits from a serve to the point that ends it
+- time to point: seconds from a serve to the point
+- paddle hit positions: a histogram of where the ball met the paddle
+- ball speed at each paddle hit, after the speed-up
+- points and match wins per side
+
+Batches go to CSV (one row per event, with the union of all event fields as
+columns) or SQLite (one table per event type), chosen by the path's
+extension. Without a path, only the aggregates are kept.
+"""
+import collections
+import csv
+import math
+import os
+import sqlite3
+import threading
+from .engine import GameOver, PaddleHit, Point, Serve, WallBounce
+
+EVENT_TYPES = (Serve, PaddleHit, WallBounce, Point, GameOver)
+
+# Columns of the CSV output: the match, the event type, then every event field
+CSV_FIELDS = ("match", "event") + tuple(dict.fromkeys(field for kind in EVENT_TYPES for field in kind._fields))
+
+# Buckets of the paddle hit position histogram, from the top edge to the bottom
+OFFSET_BUCKETS = 10
+
+
+class Running:
+    """Count, mean, min and max of a stream of numbers."""
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0, "mean": 0.0, "min": 0.0, "max": 0.0}
+        return {"count": self.count, "mean": self.total / self.count, "min": self.min, "max": self.max}
+
+
+class MatchAggregates:
+    """Running statistics over the events of any number of matches."""
+
+    def __init__(self):
+        self.rally_length = Running()
+        self.time_to_point = Running()
+        self.hit_speed = Running()
+        self.hit_offsets = [0] * OFFSET_BUCKETS
+        self.wall_bounces = 0
+        self.points = {"left": 0, "right": 0}
+        self.wins = {"left": 0, "right": 0}
+        self.matches = 0
+        self.events = 0
+        # Per match: (tick of the last serve, paddle hits since)
+        self._rallies = {}
+
+    def add(self, match, event, tick_rate):
+        self.events += 1
+        kind = type(event)
+        if kind is PaddleHit:
+            self.hit_speed.add(event.speed)
+            bucket = int((event.offset + 1) / 2 * OFFSET_BUCKETS)
+            self.hit_offsets[min(bucket, OFFSET_BUCKETS - 1)] += 1
+            serve, hits = self._rallies.get(match, (event.tick, 0))
+            self._rallies[match] = (serve, hits + 1)
+        elif kind is WallBounce:
+            self.wall_bounces += 1
+        elif kind is Serve:
+            self._rallies[match] = (event.tick, 0)
+        elif kind is Point:
+            self.points[event.scorer] += 1
+            rally = self._rallies.pop(match, None)
+            if rally is not None:
+                serve, hits = rally
+                self.rally_length.add(hits)
+                self.time_to_point.add((event.tick - serve) / tick_rate)
+        elif kind is GameOver:
+            self.wins[event.winner] += 1
+            self.matches += 1
+
+    def summary(self):
+        return {
+            "events": self.events,
+            "matches": self.matches,
+            "wins": dict(self.wins),
+            "points": dict(self.points),
+            "rally_length": self.rally_length.summary(),
+            "time_to_point": self.time_to_point.summary(),
+            "hit_speed": self.hit_speed.summary(),
+            "hit_offsets": list(self.hit_offsets),
+            "wall_bounces": self.wall_bounces,
+        }
+
+
+class CsvEventWriter:
+    """Appends events to a CSV file, one row each."""
+
+    def __init__(self, path):
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "a", newline="")
+        self.writer = csv.writer(self.file)
+        if new:
+            self.writer.writerow(CSV_FIELDS)
+        self._columns = {kind: [CSV_FIELDS.index(field) for field in kind._fields] for kind in EVENT_TYPES}
+
+    def write(self, batch):
+        rows = []
+        width = len(CSV_FIELDS)
+        for match, event in batch:
+            row = [""] * width
+            row[0] = match
+            row[1] = type(event).__name__
+            for column, value in zip(self._columns[type(event)], event):
+                row[column] = value
+            rows.append(row)
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class SqliteEventWriter:
+    """Inserts events into one SQLite table per event type, a transaction per batch."""
+
+    def __init__(self, path):
+        # Opened here but only used on the writer thread
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self._inserts = {}
+        for kind in EVENT_TYPES:
+            columns = ", ".join(("match",) + kind._fields)
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS {kind.__name__} ({columns})")
+            marks = ", ".join("?" * (len(kind._fields) + 1))
+            self._inserts[kind] = f"INSERT INTO {kind.__name__} VALUES ({marks})"
+        self.connection.commit()
+
+    def write(self, batch):
+        rows = collections.defaultdict(list)
+        for match, event in batch:
+            rows[type(event)].append((match,) + tuple(event))
+        with self.connection:
+            for kind, values in rows.items():
+                self.connection.executemany(self._inserts[kind], values)
+
+    def close(self):
+        self.connection.close()
+
+
+def open_event_writer(path):
+    """Return the event writer for path: SQLite for .db, .sqlite and .sqlite3, otherwise CSV."""
+    if os.path.splitext(path)[1].lower() in (".db", ".sqlite", ".sqlite3"):
+        return SqliteEventWriter(path)
+    return CsvEventWriter(path)
+
+
+class Telemetry:
+    """Collects engine events without blocking and writes them on a background thread."""
+
+    def __init__(self, path=None, capacity=65536, flush_interval=0.25):
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.aggregates = MatchAggregates()
+        self.dropped = 0
+        self.written = 0
+        self.error = None
+        # deque.append and popleft are atomic, so the game thread never takes a lock
+        self._queue = collections.deque()
+        self._tick_rates = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._writer = open_event_writer(path) if path else None
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    def attach(self, engine, match=0):
+        """Start collecting engine's events, tagged with match."""
+        self._tick_rates[match] = engine.TICK_RATE
+        queue = self._queue
+        capacity = self.capacity
+
+        def on_event(event):
+            if len(queue) < capacity:
+                queue.append((match, event))
+            else:
+                self.dropped += 1
+
+        engine.on_event = on_event
+        return on_event
+
+    def _drain(self):
+        queue = self._queue
+        batch = [queue.popleft() for _ in range(len(queue))]
+        if not batch:
+            return
+        accepted = self._writer is None
+        if self._writer is not None and self.error is None:
+            try:
+                self._writer.write(batch)
+                accepted = True
+            except Exception as error:
+                self.error = error
+        tick_rates = self._tick_rates
+        with self._lock:
+            add = self.aggregates.add
+            for match, event in batch:
+                add(match, event, tick_rates[match])
+            if accepted:
+                self.written += len(batch)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self._drain()
+        self._drain()
+        if self._writer is not None:
+            self._writer.close()
+
+    def summary(self):
+        """Return the aggregates so far, plus how many events were written and dropped.
+
+        Without a path, written counts the events aggregated; after a write
+        error, only the events written before it.
+        """
+        with self._lock:
+            summary = self.aggregates.summary()
+        summary["written"] = self.written
+        summary["dropped"] = self.dropped
+        return summary
+
+    def close(self):
+        """Write what is still queued, stop the writer thread and return summary()."""
+        self._stop.set()
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.summary()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
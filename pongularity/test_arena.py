@@ -0,0 +1,160 @@
+import unittest
+import pygame
+from .arena import UniformGrid, obstacle_layout
+from .batch import BatchPong
+from .config import PRESETS, GameConfig
+from .controllers import make_controller
+from .engine import GameOver, PongularityEngine, Serve
+from .entities import Paddle
+from .game import PongularityGame
+from .replay import InputRecorder, Replay, ReplayPlayer
+
+def contact_ids(contacts):
+    solids, pairs = contacts
+    return ({(id(ball), id(solid)) for ball, solid in solids},
+            {frozenset((id(a), id(b))) for a, b in pairs})
+
+class TestUniformGrid(unittest.TestCase):
+
+    def test_insert_and_query(self):
+        """Test that a rectangle is found from every cell it overlaps and nowhere else"""
+        grid = UniformGrid(10)
+        grid.insert("wall", 5, 5, 20, 3)
+        self.assertEqual(len(grid.cells), 3)
+        self.assertEqual(grid.query(22, 0, 1, 1), ["wall"])
+        self.assertEqual(grid.query(0, 12, 30, 5), [])
+        grid.insert("post", 15, 0, 2, 2)
+        self.assertEqual(grid.query(0, 0, 30, 9), ["wall", "post"])
+        grid.clear()
+        self.assertEqual(grid.query(0, 0, 30, 30), [])
+        with self.assertRaises(ValueError):
+            UniformGrid(0)
+
+    def test_obstacle_layout(self):
+        """Test that obstacles sit between the paddle zones without touching"""
+        rects = obstacle_layout(12, 1200, 675, 15)
+        self.assertEqual(len(rects), 12)
+        for i, (x, y, width, height) in enumerate(rects):
+            self.assertTrue(1200 / 4 <= x and x + width <= 1200 * 3 / 4)
+            for other in rects[i + 1:]:
+                self.assertFalse(x < other[0] + other[2] and other[0] < x + width and
+                                 y < other[1] + other[3] and other[1] < y + height)
+        with self.assertRaises(ValueError):
+            obstacle_layout(500, 750, 585, 15)
+
+class TestArena(unittest.TestCase):
+
+    def make_engine(self, **fields):
+        engine = PongularityEngine(config=PRESETS["party"].replace(**fields))
+        engine.reset_game()
+        return engine
+
+    def test_classic_match_has_no_arena(self):
+        """Test that one ball and no obstacles keep the classic physics"""
+        engine = PongularityEngine()
+        self.assertIsNone(engine.arena)
+        self.assertEqual(engine.balls, [engine.ball])
+        self.assertEqual(engine.paddles, [engine.left_paddle, engine.right_paddle])
+        with self.assertRaises(ValueError):
+            GameConfig(balls=0)
+        with self.assertRaises(ValueError):
+            BatchPong(2, config=PRESETS["party"])
+
+    def test_grid_finds_every_contact(self):
+        """Test that the broadphase finds the same contacts as testing every pair"""
+        engine = self.make_engine(balls=300, obstacles=12, max_score=255)
+        arena = engine.arena
+        contacts = 0
+        for _ in range(150):
+            engine.update()
+            found = arena.contacts()
+            self.assertEqual(contact_ids(found), contact_ids(arena.contacts_brute_force()))
+            contacts += len(found[0]) + len(found[1])
+        self.assertGreater(contacts, 150)
+
+    def test_balls_stay_in_play(self):
+        """Test that balls stay between the walls, score when they leave and are served again"""
+        engine = self.make_engine(balls=200, max_score=255)
+        for _ in range(400):
+            engine.update()
+            for ball in engine.balls:
+                if not ball.resetting:
+                    self.assertTrue(engine.GRID <= ball.y <= engine.HEIGHT - engine.GRID * 2)
+        points = engine.score["left"] + engine.score["right"]
+        self.assertGreater(points, 200)
+        self.assertLess(sum(ball.resetting for ball in engine.balls), 200)
+
+    def test_bounces(self):
+        """Test that balls bounce off obstacles and any paddle, speeding up only off paddles"""
+        engine = self.make_engine(balls=2, obstacles=1)
+        ball, other = engine.balls
+        other.resetting = True
+        engine.arena.reset_ticks[1] = 10 ** 9
+        obstacle, = engine.obstacles
+        ball.x, ball.y = obstacle.x - ball.width - 2, obstacle.y + 20
+        ball.dx, ball.dy = 5, 0
+        engine.update()
+        self.assertEqual((ball.x, ball.dx), (obstacle.x - ball.width, -5))
+
+        extra = Paddle(obstacle.x - 100, obstacle.y, engine.GRID, engine.PADDLE_HEIGHT)
+        engine.paddles.append(extra)
+        ball.x, ball.y = extra.x + extra.width + 2, extra.y + 20
+        engine.update()
+        self.assertEqual(ball.x, extra.x + extra.width)
+        self.assertEqual(ball.dx, 5 + engine.BALL_ACCELERATION)
+
+    def test_game_over(self):
+        """Test that the match ends exactly once, at the winning score, with many balls scoring"""
+        events = []
+        engine = PongularityEngine(config=PRESETS["party"].replace(balls=200, max_score=3))
+        engine.on_event = events.append
+        engine.reset_game()
+        # Every ball is served once at the start of the match
+        self.assertEqual(len(events), 200)
+        self.assertTrue(all(isinstance(event, Serve) for event in events))
+        for _ in range(5000):
+            if engine.game_state != "playing":
+                break
+            engine.update()
+        self.assertEqual(engine.game_state, "game_over")
+        self.assertEqual(max(engine.score.values()), 3)
+        game_overs = [event for event in events if isinstance(event, GameOver)]
+        game_over, = game_overs
+        self.assertEqual((game_over.left_score, game_over.right_score), (engine.score["left"], engine.score["right"]))
+        self.assertEqual(engine.score[game_over.winner], 3)
+
+    def test_replay_seeks_every_ball(self):
+        """Test that arena recordings replay and seek exactly"""
+        config = PRESETS["party"].replace(balls=40)
+        engine = PongularityEngine(config=config)
+        recorder = InputRecorder.for_engine(engine)
+        left, right = make_controller("tracker", seed=0), make_controller("tracker", seed=1)
+        engine.reset_game()
+        recorder.record_start()
+        for _ in range(1500):
+            engine.left_paddle.dy = left.control(engine, "left")
+            engine.right_paddle.dy = right.control(engine, "right")
+            recorder.record(engine.left_paddle.dy, engine.right_paddle.dy)
+            engine.update()
+        player = ReplayPlayer(Replay.from_bytes(recorder.to_bytes()), keyframe_interval=500)
+        player.run()
+        self.assertEqual(player.engine.arena.snapshot(), engine.arena.snapshot())
+        player.seek(700)
+        player.seek(1500)
+        self.assertEqual(player.engine.arena.snapshot(), engine.arena.snapshot())
+        self.assertEqual(player.engine.snapshot(), engine.snapshot())
+
+    def test_game_draws_every_ball(self):
+        """Test that the game draws all balls and obstacles"""
+        pygame.font.init()
+        game = PongularityGame(surface=pygame.Surface((1200, 675)), dirty_rects=True,
+                               config=PRESETS["party"].replace(balls=25, obstacles=4))
+        game.reset_game()
+        game.step()
+        self.assertIsNone(game.draw_frame(0.5))
+        self.assertEqual(len(game.drawn_rects), 2 + 25 + 4)
+        obstacle = game.obstacles[0]
+        self.assertEqual(game.screen.get_at((int(obstacle.x) + 1, int(obstacle.y) + 1))[:3], game.LIGHT_GREY)
+
+if __name__ == '__main__':
+    unittest.main()
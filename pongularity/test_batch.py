@@ -0,0 +1,118 @@
+import unittest
+import random
+import numpy as np
+from .batch import BatchPong, START_SCREEN, PLAYING, GAME_OVER
+from .config import DEFAULT_CONFIG
+from .engine import PongularityEngine
+
+STATE_CODES = {"start_screen": START_SCREEN, "playing": PLAYING, "game_over": GAME_OVER}
+
+class TestBatchPong(unittest.TestCase):
+
+    def assertMatchesEngines(self, batch, engines):
+        for i, engine in enumerate(engines):
+            self.assertEqual(batch.game_state[i], STATE_CODES[engine.game_state])
+            self.assertEqual(batch.left_y[i], engine.left_paddle["y"])
+            self.assertEqual(batch.right_y[i], engine.right_paddle["y"])
+            self.assertEqual(batch.ball_x[i], engine.ball["x"])
+            self.assertEqual(batch.ball_y[i], engine.ball["y"])
+            self.assertEqual(batch.ball_dx[i], engine.ball["dx"])
+            self.assertEqual(batch.ball_dy[i], engine.ball["dy"])
+            self.assertEqual(batch.resetting[i], engine.ball["resetting"])
+            self.assertEqual(batch.left_score[i], engine.score["left"])
+            self.assertEqual(batch.right_score[i], engine.score["right"])
+
+    def test_initial_state_matches_engine(self):
+        """Test that a new batch mirrors a freshly created engine"""
+        batch = BatchPong(4)
+        self.assertMatchesEngines(batch, [PongularityEngine() for _ in range(4)])
+
+    def test_rejects_empty_batch(self):
+        """Test that a batch needs at least one match"""
+        with self.assertRaises(ValueError):
+            BatchPong(0)
+
+    def test_step_matches_engine_exactly(self):
+        """Test that every lane reproduces PongularityEngine.update() bit for bit"""
+        n = 48
+        rng = random.Random(1234)
+        batch = BatchPong(n)
+        engines = [PongularityEngine() for _ in range(n)]
+
+        # Leave a few lanes on the start screen, start the rest
+        started = np.array([i % 8 != 0 for i in range(n)])
+        batch.reset_game(started)
+        for engine, start in zip(engines, started):
+            if start:
+                engine.reset_game()
+
+        speed = batch.PADDLE_SPEED
+        left = np.zeros(n)
+        right = np.zeros(n)
+        for tick in range(6000):
+            # Paddles hold a direction for a while, like a player would
+            if tick % 5 == 0:
+                for i in range(n):
+                    left[i] = rng.choice((-speed, 0, speed))
+                    right[i] = rng.choice((-speed, 0, speed))
+            for i, engine in enumerate(engines):
+                engine.left_paddle["dy"] = left[i]
+                engine.right_paddle["dy"] = right[i]
+                engine.update()
+            batch.step(left, right)
+            if tick % 250 == 0:
+                self.assertMatchesEngines(batch, engines)
+
+        self.assertMatchesEngines(batch, engines)
+        # The run must have exercised scoring and the serve delay
+        self.assertTrue((batch.left_score + batch.right_score).sum() > 0)
+
+    def test_lanes_with_different_rules(self):
+        """Test that lanes given their own configs each follow an engine built from that config"""
+        configs = [DEFAULT_CONFIG.replace(ball_speed=4 + i % 4, paddle_height=45 + 15 * (i % 3),
+                                          max_score=1 + i % 5, serve_delay=0.1 * (i % 4))
+                   for i in range(24)]
+        batch = BatchPong(len(configs), config=configs)
+        engines = [PongularityEngine(config=config) for config in configs]
+        self.assertIsInstance(batch.BALL_SPEED, np.ndarray)
+        self.assertEqual(batch.WIDTH, 750)
+        self.assertMatchesEngines(batch, engines)
+
+        batch.reset_game()
+        for engine in engines:
+            engine.reset_game()
+        rng = random.Random(7)
+        for tick in range(3000):
+            if tick % 5 == 0:
+                left = [rng.choice((-6, 0, 6)) for _ in engines]
+                right = [rng.choice((-6, 0, 6)) for _ in engines]
+            for i, engine in enumerate(engines):
+                engine.left_paddle.dy = left[i]
+                engine.right_paddle.dy = right[i]
+                engine.update()
+            batch.step(left, right)
+        self.assertMatchesEngines(batch, engines)
+        self.assertIn(GAME_OVER, batch.game_state)
+
+    def test_finished_matches_are_frozen(self):
+        """Test that lanes in game_over stop moving"""
+        batch = BatchPong(2)
+        batch.reset_game()
+        batch.game_state[1] = GAME_OVER
+        x = batch.ball_x[1]
+        for _ in range(10):
+            batch.step()
+        self.assertEqual(batch.ball_x[1], x)
+        self.assertNotEqual(batch.ball_x[0], x)
+
+    def test_accelerate_ball_caps_speed(self):
+        """Test that repeated paddle hits never exceed MAX_BALL_SPEED"""
+        batch = BatchPong(3)
+        batch.ball_dx[:] = [5, -14.9, 15]
+        batch.ball_dy[:] = [-5, 14.9, -15]
+        batch._accelerate_ball(np.ones(3, dtype=bool))
+        np.testing.assert_array_equal(batch.ball_dx, [5.25, -15, 15])
+        np.testing.assert_array_equal(batch.ball_dy, [-5.25, 15, -15])
+
+if __name__ == '__main__':
+    unittest.main()
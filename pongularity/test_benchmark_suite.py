@@ -0,0 +1,76 @@
+import unittest
+import argparse
+import importlib.util
+import json
+import os
+import tempfile
+
+SUITE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "suite.py")
+
+def load_suite():
+    spec = importlib.util.spec_from_file_location("benchmark_suite", SUITE)
+    suite = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(suite)
+    return suite
+
+def result(value, better):
+    return {"value": value, "unit": "x", "better": better}
+
+@unittest.skipUnless(os.path.exists(SUITE), "benchmarks/suite.py is not in this checkout")
+class TestBenchmarkSuite(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.suite = load_suite()
+
+    def test_higher_is_better(self):
+        """Test that a drop in a higher-is-better metric past the threshold is a regression"""
+        baseline = {"steps": result(100.0, "higher")}
+        self.assertEqual(self.suite.compare(baseline, {"steps": result(85.0, "higher")}, 0.2), [])
+        self.assertEqual(self.suite.compare(baseline, {"steps": result(150.0, "higher")}, 0.2), [])
+        (name, before, value, change), = self.suite.compare(baseline, {"steps": result(75.0, "higher")}, 0.2)
+        self.assertEqual((name, before, value), ("steps", 100.0, 75.0))
+        self.assertAlmostEqual(change, 0.25)
+
+    def test_lower_is_better(self):
+        """Test that a rise in a lower-is-better metric past the threshold is a regression"""
+        baseline = {"render": result(100.0, "lower")}
+        self.assertEqual(self.suite.compare(baseline, {"render": result(115.0, "lower")}, 0.2), [])
+        self.assertEqual(self.suite.compare(baseline, {"render": result(50.0, "lower")}, 0.2), [])
+        (name, _, _, change), = self.suite.compare(baseline, {"render": result(130.0, "lower")}, 0.2)
+        self.assertEqual(name, "render")
+        self.assertAlmostEqual(change, 0.3)
+
+    def test_per_metric_thresholds(self):
+        """Test that a metric's own threshold overrides the run's"""
+        baseline = {"a": result(100.0, "lower"), "b": result(100.0, "lower")}
+        results = {"a": result(130.0, "lower"), "b": result(130.0, "lower")}
+        regressions = self.suite.compare(baseline, results, 0.2, {"a": 0.5})
+        self.assertEqual([name for name, *_ in regressions], ["b"])
+        self.assertEqual(self.suite.parse_threshold("0.1"), ("", 0.1))
+        self.assertEqual(self.suite.parse_threshold("render_playing_us=0.5"), ("render_playing_us", 0.5))
+        for option in ("nope=0.5", "-0.1"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                self.suite.parse_threshold(option)
+
+    def test_metrics_missing_from_baseline(self):
+        """Test that metrics the baseline does not have are never regressions"""
+        baseline = {"a": result(100.0, "higher")}
+        self.assertEqual(self.suite.compare(baseline, {"new": result(1.0, "higher")}), [])
+        self.assertEqual(self.suite.compare({}, {"a": result(1.0, "higher")}), [])
+
+    def test_save_only_merges_into_baseline(self):
+        """Test that --save --only updates its metrics and keeps the rest of the baseline"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            kept = result(123.0, "higher")
+            with open(path, "w") as f:
+                json.dump({"environment": {}, "results": {"update_steps_per_sec": kept}}, f)
+            self.suite.main(["--baseline", path, "--save", "--only", "engine_memory_bytes", "--repeat", "1"])
+            with open(path) as f:
+                results = json.load(f)["results"]
+        self.assertEqual(results["update_steps_per_sec"], kept)
+        self.assertGreater(results["engine_memory_bytes"]["value"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
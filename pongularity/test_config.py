@@ -0,0 +1,124 @@
+import unittest
+import argparse
+import io
+import json
+import os
+import pickle
+import tempfile
+from contextlib import redirect_stderr
+import pygame
+from . import __main__ as game_main
+from . import export
+from .config import (DEFAULT_CONFIG, PRESETS, GameConfig, add_config_arguments, config_from_args,
+                     get_preset)
+from .engine import PongularityEngine
+from .game import PongularityGame
+from .replay import InputRecorder, Replay, ReplayPlayer
+
+def parse(argv):
+    parser = argparse.ArgumentParser()
+    add_config_arguments(parser)
+    return config_from_args(parser.parse_args(argv))
+
+class TestGameConfig(unittest.TestCase):
+
+    def test_defaults_match_the_classic_game(self):
+        """Test that the default config builds the same engine as before configs existed"""
+        engine = PongularityEngine()
+        self.assertEqual((engine.WIDTH, engine.HEIGHT, engine.GRID), (750, 585, 15))
+        self.assertEqual(engine.PADDLE_HEIGHT, 75)
+        self.assertEqual(engine.MAX_PADDLE_Y, 585 - 15 - 75)
+        self.assertEqual((engine.PADDLE_SPEED, engine.BALL_SPEED), (6, 5))
+        self.assertEqual(engine.MAX_SCORE, 10)
+        self.assertEqual(PongularityEngine(tick_rate=120).RESET_DELAY_TICKS, 48)
+        self.assertIs(engine.config, DEFAULT_CONFIG)
+
+    def test_immutable(self):
+        """Test that fields cannot be changed in place"""
+        with self.assertRaises(AttributeError):
+            DEFAULT_CONFIG.max_score = 3
+        changed = DEFAULT_CONFIG.replace(max_score=3)
+        self.assertEqual((changed.max_score, DEFAULT_CONFIG.max_score), (3, 10))
+
+    def test_validation(self):
+        """Test that impossible rules are rejected on creation and in replace()"""
+        for fields in ({"width": 0}, {"grid": 2.5}, {"ball_speed": -1}, {"max_score": True},
+                       {"paddle_height": 600}, {"max_ball_speed": 2}, {"accent": (1, 2)},
+                       {"background": (0, 0, 256)}, {"gravity": 9.8}):
+            with self.assertRaises(ValueError, msg=fields):
+                DEFAULT_CONFIG.replace(**fields)
+        self.assertEqual(GameConfig(ball_speed=7).ball_speed, 7.0)
+        self.assertEqual(GameConfig(accent=[1, 2, 3]).accent, (1, 2, 3))
+
+    def test_constants_are_shared(self):
+        """Test that engines with equal rules share one set of derived constants"""
+        config = GameConfig(grid=10, paddle_height=40)
+        self.assertIs(config.constants(60), GameConfig(grid=10, paddle_height=40).constants(60))
+        self.assertEqual(PongularityEngine(config=config).MAX_PADDLE_Y, 585 - 10 - 40)
+        self.assertEqual(PongularityEngine(tick_rate=120, config=config).PADDLE_SPEED, 3)
+
+    def test_pickle(self):
+        """Test that configs survive pickling, as process pools need"""
+        config = PRESETS["fast"]
+        self.assertEqual(pickle.loads(pickle.dumps(config)), config)
+
+    def test_load_files(self):
+        """Test that TOML and JSON files build on a preset and fill in defaults"""
+        with tempfile.TemporaryDirectory() as directory:
+            toml_path = os.path.join(directory, "rules.toml")
+            with open(toml_path, "w") as f:
+                f.write('preset = "fast"\nmax_score = 5\nbackground = [0, 0, 64]\n')
+            json_path = os.path.join(directory, "rules.json")
+            with open(json_path, "w") as f:
+                json.dump({"grid": 10, "paddle_height": 50}, f)
+
+            config = GameConfig.load(toml_path)
+            self.assertEqual(config, get_preset("fast").replace(max_score=5, background=(0, 0, 64)))
+            self.assertEqual(GameConfig.load(json_path), DEFAULT_CONFIG.replace(grid=10, paddle_height=50))
+            self.assertEqual(GameConfig.load(json_path, base=PRESETS["marathon"]).max_score, 21)
+            with self.assertRaises(ValueError):
+                GameConfig.load(os.path.join(directory, "rules.yaml"))
+
+    def test_command_line(self):
+        """Test that --preset, --config and --set apply in that order"""
+        self.assertIs(parse([]), DEFAULT_CONFIG)
+        self.assertEqual(parse(["--preset", "marathon", "--set", "ball_speed=6", "--set", "accent=[9,9,9]"]),
+                         PRESETS["marathon"].replace(ball_speed=6, accent=(9, 9, 9)))
+        with self.assertRaises(ValueError):
+            parse(["--set", "speed=6"])
+
+    def test_tick_rate_must_be_positive(self):
+        """Test that a zero or negative --tick-rate is a usage error rather than a crash"""
+        for main in (game_main.main, lambda argv: export.main(["clip.mp4"] + argv)):
+            for rate in ("0", "-60"):
+                with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()) as stderr:
+                    main(["--tick-rate", rate])
+                self.assertIn("--tick-rate must be at least 1", stderr.getvalue())
+
+    def test_start_screen_names_the_winning_score(self):
+        """Test that the start screen tells the winning score of the config"""
+        pygame.font.init()
+        for max_score, line in ((21, "First to 21 points wins!"), (1, "First to 1 point wins!")):
+            config = DEFAULT_CONFIG.replace(max_score=max_score)
+            game = PongularityGame(surface=pygame.Surface((config.width, config.height)), config=config)
+            game.static_screen("start_screen")
+            self.assertIn(line, [text for _, text, _, _ in game.text_cache._surfaces])
+
+    def test_recordings_keep_their_rules(self):
+        """Test that a replay rebuilds the engine with the rules it was recorded with"""
+        config = PRESETS["sudden_death"]
+        engine = PongularityEngine(config=config)
+        recorder = InputRecorder.for_engine(engine)
+        engine.reset_game()
+        recorder.record_start()
+        while engine.game_state == "playing":
+            recorder.record(0, 0)
+            engine.update()
+        player = ReplayPlayer(Replay.from_bytes(recorder.to_bytes()))
+        player.run()
+        self.assertEqual(player.engine.config, config)
+        self.assertEqual(player.engine.snapshot(), engine.snapshot())
+        self.assertNotIn("rules", InputRecorder.for_engine(PongularityEngine()).config)
+
+if __name__ == '__main__':
+    unittest.main()
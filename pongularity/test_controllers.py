@@ -0,0 +1,113 @@
+import unittest
+from .controllers import (Controller, PredictiveController, TrackerController, make_controller)
+from .engine import PongularityEngine
+
+class SlowClock:
+    """Clock that advances by step seconds on every read."""
+
+    def __init__(self, step):
+        self.step = step
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+def play(left, right, ticks=36000):
+    engine = PongularityEngine()
+    engine.reset_game()
+    while engine.game_state == "playing" and engine.tick < ticks:
+        engine.left_paddle.dy = left.control(engine, "left")
+        engine.right_paddle.dy = right.control(engine, "right")
+        engine.update()
+    return engine
+
+class TestControllers(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = PongularityEngine()
+        self.engine.reset_game()
+
+    def test_keyboard_speeds_only(self):
+        """Test that controllers answer up, down or still at paddle speed"""
+        controller = TrackerController(difficulty="perfect")
+        speed = self.engine.PADDLE_SPEED
+        self.engine.ball.y = 30
+        self.assertEqual(controller.control(self.engine, "left"), -speed)
+        self.engine.ball.y = 500
+        self.assertEqual(controller.control(self.engine, "left"), speed)
+
+    def test_reaction_delay(self):
+        """Test that a controller sees the ball as it was reaction_time ago"""
+        controller = TrackerController(reaction_time=0.1, error=0)
+        speed = self.engine.PADDLE_SPEED
+        self.engine.ball.y = 500
+        self.assertEqual(controller.control(self.engine, "left"), speed)
+        # The ball jumps, but for the next 6 ticks the controller still sees it low
+        self.engine.ball.y = 30
+        for _ in range(6):
+            self.assertEqual(controller.control(self.engine, "left"), speed)
+        self.assertEqual(controller.control(self.engine, "left"), -speed)
+
+    def test_budget_overrun_is_counted_and_played(self):
+        """Test that a decision taking longer than the budget is counted but still played"""
+        controller = TrackerController(difficulty="perfect", budget=0.001, clock=SlowClock(0.002))
+        self.engine.ball.y = 500
+        self.assertEqual(controller.control(self.engine, "left"), self.engine.PADDLE_SPEED)
+        self.engine.ball.y = 30
+        self.assertEqual(controller.control(self.engine, "left"), -self.engine.PADDLE_SPEED)
+        self.assertEqual(controller.stats()["overruns"], 2)
+
+    def test_drop_late_keeps_last_direction(self):
+        """Test that with drop_late a decision taking longer than the budget is dropped"""
+        controller = TrackerController(difficulty="perfect", budget=0.001, drop_late=True,
+                                       clock=SlowClock(0.0005))
+        self.engine.ball.y = 30
+        speed = controller.control(self.engine, "left")
+        self.assertEqual(speed, -self.engine.PADDLE_SPEED)
+
+        controller.clock.step = 0.002
+        self.engine.ball.y = 500
+        self.assertEqual(controller.control(self.engine, "left"), speed)
+        stats = controller.stats()
+        self.assertEqual(stats["ticks"], 2)
+        self.assertEqual(stats["overruns"], 1)
+        self.assertEqual(stats["max"], 0.002)
+
+    def test_no_budget(self):
+        """Test that budget=None never drops a decision"""
+        controller = TrackerController(difficulty="perfect", budget=None, drop_late=True, clock=SlowClock(1.0))
+        self.engine.ball.y = 500
+        self.assertEqual(controller.control(self.engine, "left"), self.engine.PADDLE_SPEED)
+        self.assertEqual(controller.overruns, 0)
+
+    def test_predictor_beats_tracker(self):
+        """Test that predicting the ball's arrival wins against following it"""
+        engine = play(TrackerController(seed=1), PredictiveController(seed=2))
+        self.assertEqual(engine.game_state, "game_over")
+        self.assertEqual(engine.score["right"], engine.MAX_SCORE)
+
+    def test_controllers_are_deterministic(self):
+        """Test that seeded controllers play the same match twice"""
+        first = play(TrackerController(seed=5), TrackerController(seed=6), ticks=5000)
+        second = play(TrackerController(seed=5), TrackerController(seed=6), ticks=5000)
+        self.assertEqual(first.ball, second.ball)
+        self.assertEqual(first.score, second.score)
+
+    def test_make_controller(self):
+        """Test creating controllers by name"""
+        controller = make_controller("predictor", difficulty="hard")
+        self.assertIsInstance(controller, PredictiveController)
+        self.assertEqual(controller.reaction_time, 0.05)
+        with self.assertRaises(ValueError):
+            make_controller("oracle")
+        with self.assertRaises(ValueError):
+            make_controller("tracker", difficulty="impossible")
+
+    def test_base_controller_is_abstract(self):
+        """Test that the base class leaves observing and deciding to subclasses"""
+        with self.assertRaises(NotImplementedError):
+            Controller().control(self.engine, "left")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+import unittest
+import subprocess
+import sys
+import pickle
+from .engine import (SNAPSHOT_FIELDS, SNAPSHOT_SIZE, PongularityEngine, pack_snapshot,
+                     unpack_snapshot)
+
+class TestPongularityEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = PongularityEngine()
+        self.engine.reset_game()
+
+    def test_engine_does_not_import_pygame(self):
+        """Test that the simulation core can be imported without SDL"""
+        code = "import sys, pongularity.engine; sys.exit('pygame' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code])
+        self.assertEqual(result.returncode, 0)
+
+    def test_initial_state(self):
+        """Test that a fresh engine waits on the start screen"""
+        engine = PongularityEngine()
+        self.assertEqual(engine.game_state, "start_screen")
+        self.assertEqual(engine.tick, 0)
+        engine.update()
+        self.assertEqual(engine.ball["x"], engine.WIDTH / 2)
+        self.assertEqual(engine.tick, 1)
+
+    def test_serve_delay_in_ticks(self):
+        """Test that the ball is served RESET_DELAY_TICKS after a point"""
+        self.engine.ball["x"] = -10
+        self.engine.update()
+        self.assertTrue(self.engine.ball["resetting"])
+        self.assertEqual(self.engine.score["right"], 1)
+
+        for _ in range(self.engine.RESET_DELAY_TICKS - 1):
+            self.engine.update()
+        self.assertTrue(self.engine.ball["resetting"])
+
+        self.engine.update()
+        self.assertFalse(self.engine.ball["resetting"])
+        self.assertEqual(self.engine.ball["x"], self.engine.WIDTH / 2)
+        self.assertEqual(self.engine.ball["y"], self.engine.HEIGHT / 2)
+
+    def test_match_runs_to_game_over(self):
+        """Test that an unattended match ends once a side reaches MAX_SCORE"""
+        for _ in range(100000):
+            if self.engine.game_state == "game_over":
+                break
+            self.engine.update()
+
+        self.assertEqual(self.engine.game_state, "game_over")
+        self.assertEqual(max(self.engine.score.values()), self.engine.MAX_SCORE)
+
+    def test_update_is_deterministic(self):
+        """Test that two engines fed the same inputs stay identical"""
+        other = PongularityEngine()
+        other.reset_game()
+        for i in range(2000):
+            dy = self.engine.PADDLE_SPEED if (i // 37) % 2 else -self.engine.PADDLE_SPEED
+            for engine in (self.engine, other):
+                engine.left_paddle["dy"] = dy
+                engine.right_paddle["dy"] = -dy
+                engine.update()
+        self.assertEqual(self.engine.ball, other.ball)
+        self.assertEqual(self.engine.score, other.score)
+
+    def test_tick_rate_scales_speeds(self):
+        """Test that game time runs at the same pace for any tick rate"""
+        fast = PongularityEngine(tick_rate=120)
+        fast.reset_game()
+        self.assertEqual(fast.RESET_DELAY_TICKS, 48)
+        for _ in range(20):
+            self.engine.update()
+        for _ in range(40):
+            fast.update()
+        self.assertAlmostEqual(fast.ball.x, self.engine.ball.x)
+        self.assertAlmostEqual(fast.ball.y, self.engine.ball.y)
+
+    def test_invalid_tick_rate(self):
+        """Test that the tick rate must be positive"""
+        with self.assertRaises(ValueError):
+            PongularityEngine(tick_rate=0)
+
+class TestSweptCollision(unittest.TestCase):
+
+    def make_engine(self, tick_rate, swept):
+        engine = PongularityEngine(tick_rate=tick_rate, swept=swept)
+        engine.reset_game()
+        return engine
+
+    def aim_at_left_paddle(self, engine):
+        """Put the ball one pixel right of the left paddle, moving left at full speed."""
+        paddle = engine.left_paddle
+        engine.ball.x = paddle.x + paddle.width + 1
+        engine.ball.y = paddle.y + paddle.height / 2
+        engine.ball.dx = -engine.MAX_BALL_SPEED
+        engine.ball.dy = 0.0
+
+    def test_discrete_ball_tunnels_at_low_tick_rate(self):
+        """Test that overlap checks miss a paddle the ball jumps over in one tick"""
+        engine = self.make_engine(20, swept=False)
+        self.aim_at_left_paddle(engine)
+        engine.update()
+        self.assertLess(engine.ball.dx, 0)
+        self.assertLess(engine.ball.x + engine.ball.width, engine.left_paddle.x)
+
+    def test_swept_ball_bounces_at_low_tick_rate(self):
+        """Test that the swept path bounces off a paddle it would otherwise skip"""
+        engine = self.make_engine(20, swept=True)
+        self.aim_at_left_paddle(engine)
+        face = engine.left_paddle.x + engine.left_paddle.width
+        engine.update()
+        self.assertGreater(engine.ball.dx, 0)
+        # 1 px to the face, then the remaining 44/45 of the tick at the new speed
+        self.assertAlmostEqual(engine.ball.x, face + engine.ball.dx * 44 / 45)
+
+    def test_swept_wall_bounce_is_exact(self):
+        """Test that the ball reflects off a wall without losing distance"""
+        engine = self.make_engine(60, swept=True)
+        engine.ball.x = engine.WIDTH / 2
+        engine.ball.y = engine.GRID + 2
+        engine.ball.dx = 0.0
+        engine.ball.dy = -5.0
+        engine.update()
+        self.assertEqual(engine.ball.y, engine.GRID + 3)
+        self.assertEqual(engine.ball.dy, 5.0)
+
+    def test_swept_misses_paddle_out_of_reach(self):
+        """Test that a ball passing above the paddle still scores"""
+        engine = self.make_engine(20, swept=True)
+        self.aim_at_left_paddle(engine)
+        engine.ball.y = engine.left_paddle.y - engine.ball.height - 1
+        for _ in range(5):
+            engine.update()
+        self.assertEqual(engine.score["right"], 1)
+
+    def test_swept_result_independent_of_tick_rate(self):
+        """Test that swept physics gives the same trajectory at 15 and 240 ticks per second"""
+        coarse = self.make_engine(15, swept=True)
+        fine = self.make_engine(240, swept=True)
+        for engine in (coarse, fine):
+            engine.ball.dx = engine.MAX_BALL_SPEED * 0.8
+            engine.ball.dy = engine.MAX_BALL_SPEED * 0.9
+            engine.right_paddle.y = 400
+        # Half a second of game time covers a wall bounce and a paddle hit
+        for _ in range(8):
+            coarse.update()
+        for _ in range(128):
+            fine.update()
+        self.assertAlmostEqual(coarse.ball.x, fine.ball.x, places=6)
+        self.assertAlmostEqual(coarse.ball.y, fine.ball.y, places=6)
+        self.assertAlmostEqual(coarse.ball.dx, fine.ball.dx * 16, places=6)
+
+class TestSnapshots(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = PongularityEngine()
+        self.engine.reset_game()
+
+    def play(self, engine, ticks, seed):
+        for tick in range(ticks):
+            direction = (seed * 7 + tick // 11) % 3 - 1
+            engine.left_paddle.dy = direction * engine.PADDLE_SPEED
+            engine.right_paddle.dy = -direction * engine.PADDLE_SPEED
+            engine.update()
+
+    def test_snapshot_layout(self):
+        """Test that a snapshot is a flat tuple of SNAPSHOT_FIELDS"""
+        snapshot = self.engine.snapshot()
+        self.assertIsInstance(snapshot, tuple)
+        self.assertEqual(len(snapshot), len(SNAPSHOT_FIELDS))
+        self.assertEqual(snapshot[SNAPSHOT_FIELDS.index("game_state")], "playing")
+        self.assertEqual(snapshot[SNAPSHOT_FIELDS.index("ball_x")], self.engine.WIDTH / 2)
+
+    def test_restore_resumes_deterministically(self):
+        """Test that updates after a restore repeat the original run exactly"""
+        self.play(self.engine, 700, seed=1)
+        saved = self.engine.snapshot()
+        self.play(self.engine, 3000, seed=2)
+        expected = self.engine.snapshot()
+
+        self.play(self.engine, 500, seed=3)
+        self.engine.restore(saved)
+        self.assertEqual(self.engine.snapshot(), saved)
+        self.play(self.engine, 3000, seed=2)
+        self.assertEqual(self.engine.snapshot(), expected)
+
+    def test_restore_into_another_engine(self):
+        """Test that a snapshot carries the serve delay across engines"""
+        self.engine.ball.x = -10
+        self.engine.update()
+        other = PongularityEngine()
+        other.restore(self.engine.snapshot())
+        for _ in range(self.engine.RESET_DELAY_TICKS):
+            self.engine.update()
+            other.update()
+            self.assertEqual(other.ball.resetting, self.engine.ball.resetting)
+        self.assertFalse(other.ball.resetting)
+        self.assertEqual(other.snapshot(), self.engine.snapshot())
+
+    def test_serialization(self):
+        """Test that snapshots pack to a fixed size and pickle"""
+        self.play(self.engine, 400, seed=4)
+        snapshot = self.engine.snapshot()
+        data = pack_snapshot(snapshot)
+        self.assertEqual(len(data), SNAPSHOT_SIZE)
+        self.assertEqual(unpack_snapshot(data), snapshot)
+        self.assertEqual(pickle.loads(pickle.dumps(snapshot)), snapshot)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import copy
+from .entities import Ball, Paddle
+
+class TestEntities(unittest.TestCase):
+
+    def setUp(self):
+        self.paddle = Paddle(30, 255, 15, 75)
+        self.ball = Ball(375, 292.5, 15, 15, 5, -5)
+
+    def test_slots(self):
+        """Test that entities carry no per-instance __dict__"""
+        self.assertFalse(hasattr(self.paddle, "__dict__"))
+        self.assertFalse(hasattr(self.ball, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.ball.colour = "white"
+
+    def test_dict_compatible_view(self):
+        """Test that entities can still be read and written like the old dicts"""
+        self.assertEqual(self.ball["x"], 375)
+        self.ball["x"] = 100
+        self.assertEqual(self.ball.x, 100)
+        self.assertIn("resetting", self.ball)
+        self.assertEqual(dict(self.paddle), {"x": 30, "y": 255, "width": 15, "height": 75, "dy": 0})
+        self.assertEqual(self.paddle, {"x": 30, "y": 255, "width": 15, "height": 75, "dy": 0})
+
+    def test_unknown_key(self):
+        """Test that unknown keys raise KeyError like a dict"""
+        with self.assertRaises(KeyError):
+            self.ball["colour"]
+        with self.assertRaises(KeyError):
+            self.ball["colour"] = "white"
+
+    def test_copy_is_independent(self):
+        """Test that copies do not share state with the original"""
+        clone = copy.copy(self.ball)
+        self.assertEqual(clone, self.ball)
+        clone.dx = -5
+        self.assertEqual(self.ball.dx, 5)
+        self.assertEqual(self.paddle.copy(), self.paddle)
+
+    def test_state_round_trip(self):
+        """Test that state() and load_state() restore every field"""
+        state = self.ball.state()
+        self.ball.x = 0
+        self.ball.resetting = True
+        self.ball.load_state(state)
+        self.assertEqual(self.ball, Ball(375, 292.5, 15, 15, 5, -5))
+        self.assertEqual(len(self.paddle.state()), len(self.paddle))
+
+    def test_collides(self):
+        """Test rectangle overlap between entities"""
+        self.assertFalse(self.ball.collides(self.paddle))
+        self.ball.x = 40
+        self.ball.y = 260
+        self.assertTrue(self.ball.collides(self.paddle))
+        self.assertTrue(self.paddle.collides(self.ball))
+
+    def test_rect(self):
+        """Test the drawing rectangle"""
+        self.assertEqual(self.paddle.rect(), (30, 255, 15, 75))
+
+    def test_time_of_impact(self):
+        """Test when a moving rectangle first overlaps a still one"""
+        ball = Ball(60, 270, 15, 15, -20, 0)
+        self.assertEqual(ball.time_of_impact(self.paddle, -20, 0), 0.75)
+        self.assertIsNone(ball.time_of_impact(self.paddle, -10, 0))
+        self.assertIsNone(ball.time_of_impact(self.paddle, 20, 0))
+        # Passing over the top of the paddle never touches it
+        ball.y = 239
+        self.assertIsNone(ball.time_of_impact(self.paddle, -20, 0))
+        # Sliding down onto the top edge from behind the face
+        ball.x, ball.y = 35, 235
+        self.assertEqual(ball.time_of_impact(self.paddle, 0, 10), 0.5)
+        ball.y = 250
+        self.assertEqual(ball.time_of_impact(self.paddle, 5, 5), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
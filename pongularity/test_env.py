@@ -0,0 +1,148 @@
+import unittest
+import time
+import numpy as np
+from .env import OBSERVATION_FIELDS, PongEnv, VectorPongEnv
+from .policy import LinearPolicy
+
+class SlowPolicy:
+    """Tracking policy that takes longer than a controller's default budget to decide."""
+
+    def __init__(self, delay=0.005):
+        self.delay = delay
+        self.policy = LinearPolicy.tracker()
+
+    def act(self, features):
+        time.sleep(self.delay)
+        return self.policy.act(features)
+
+class TestPongEnv(unittest.TestCase):
+
+    def test_vector_reset_and_step(self):
+        """Test the reset/step contract with vector observations"""
+        env = PongEnv(max_steps=50)
+        observation, info = env.reset(seed=1)
+        self.assertEqual(observation.shape, (len(OBSERVATION_FIELDS),))
+        self.assertEqual(observation.dtype, np.float32)
+        self.assertEqual(info["score"], {"left": 0, "right": 0})
+        self.assertTrue(np.all(np.abs(observation) <= 1))
+
+        for step in range(50):
+            observation, reward, terminated, truncated, info = env.step(step % 3)
+        self.assertFalse(terminated)
+        self.assertTrue(truncated)
+
+    def test_rewards_follow_the_score(self):
+        """Test that an idle agent loses points and the match"""
+        env = PongEnv(difficulty="perfect")
+        env.reset(seed=2)
+        total = 0.0
+        terminated = False
+        while not terminated:
+            _, reward, terminated, _, info = env.step(0)
+            total += reward
+        self.assertEqual(total, -info["score"]["right"])
+        self.assertEqual(info["score"]["right"], env.game.MAX_SCORE)
+
+    def test_reset_is_seeded(self):
+        """Test that the same seed replays the same episode"""
+        runs = []
+        for _ in range(2):
+            env = PongEnv()
+            observations, rewards = [env.reset(seed=7)[0]], []
+            for step in range(300):
+                observation, reward = env.step(step % 3)[:2]
+                observations.append(observation)
+                rewards.append(reward)
+            runs.append((np.array(observations), rewards))
+        np.testing.assert_array_equal(runs[0][0], runs[1][0])
+        self.assertEqual(runs[0][1], runs[1][1])
+        self.assertIsNone(env.opponent.budget)
+
+    def test_pixels_are_a_live_view(self):
+        """Test that pixel observations share memory with the surface and are redrawn in place"""
+        env = PongEnv(observation="pixels")
+        first, _ = env.reset(seed=3)
+        self.assertEqual(first.shape, (585, 750))
+        self.assertEqual(first.dtype, np.uint8)
+        self.assertFalse(first.flags["OWNDATA"])
+        before = first.copy()
+        observation = env.step(1)[0]
+        self.assertIs(observation, first)
+        self.assertFalse(np.array_equal(before, observation))
+
+        # Erasing only what moved gives the same frame as a full redraw
+        expected = observation.copy()
+        env.game.draw_playfield(1.0)
+        np.testing.assert_array_equal(observation, expected)
+
+        ball = env.game.ball
+        self.assertEqual(observation[int(ball.y) + 1, int(ball.x) + 1], 255)
+        self.assertEqual(observation[5, 5], 211)
+        self.assertEqual(observation[300, 100], 0)
+
+    def test_downsampled_pixels(self):
+        """Test that downsampling strides the view instead of copying it"""
+        env = PongEnv(observation="pixels", downsample=3)
+        observation, _ = env.reset(seed=4)
+        self.assertEqual(observation.shape, (195, 250))
+        self.assertEqual(env.observation_shape, (195, 250))
+        self.assertFalse(observation.flags["OWNDATA"])
+
+    def test_unknown_observation_type(self):
+        """Test that only vector and pixel observations exist"""
+        with self.assertRaises(ValueError):
+            PongEnv(observation="ram")
+
+class TestVectorPongEnv(unittest.TestCase):
+
+    def test_batched_step(self):
+        """Test the array shapes of a batched step"""
+        env = VectorPongEnv(8)
+        observations, _ = env.reset(seed=0)
+        self.assertEqual(observations.shape, (8, len(OBSERVATION_FIELDS)))
+        observations, rewards, terminated, truncated, info = env.step(np.zeros(8, dtype=int))
+        self.assertEqual(rewards.shape, (8,))
+        self.assertEqual(terminated.dtype, bool)
+        self.assertFalse(truncated.any())
+
+    def test_matches_single_environment_state(self):
+        """Test that observations describe the BatchPong state of each match"""
+        env = VectorPongEnv(4)
+        env.reset(seed=1)
+        observations = env.step(np.array([0, 1, 2, 1]))[0]
+        batch = env.batch
+        np.testing.assert_allclose(observations[:, 0], batch.ball_x * 2 / batch.WIDTH - 1, rtol=1e-6)
+        np.testing.assert_allclose(observations[:, 4], batch.left_y * 2 / batch.HEIGHT - 1, rtol=1e-6)
+
+    def test_reset_is_seeded(self):
+        """Test that the same seed replays the same episodes with an opponent slower than any budget"""
+        runs = []
+        for _ in range(2):
+            env = VectorPongEnv(4, opponent_policy=SlowPolicy())
+            observations, rewards = [env.reset(seed=3)[0]], []
+            for step in range(60):
+                observation, reward = env.step(np.full(4, step % 3))[:2]
+                observations.append(observation)
+                rewards.append(reward)
+            runs.append((np.array(observations), np.array(rewards)))
+        np.testing.assert_array_equal(runs[0][0], runs[1][0])
+        np.testing.assert_array_equal(runs[0][1], runs[1][1])
+        # The opponent moved, rather than freezing on dropped decisions
+        self.assertFalse(np.all(runs[0][0][:, :, 5] == runs[0][0][0, :, 5]))
+
+    def test_autoreset(self):
+        """Test that finished matches restart and report their final observation"""
+        env = VectorPongEnv(4, max_steps=10)
+        env.reset(seed=2)
+        for _ in range(9):
+            _, _, _, truncated, info = env.step(np.zeros(4, dtype=int))
+            self.assertFalse(truncated.any())
+        observations, _, _, truncated, info = env.step(np.zeros(4, dtype=int))
+        self.assertTrue(truncated.all())
+        self.assertIn("final_observation", info)
+        np.testing.assert_array_equal(env.steps, 0)
+        # Restarted matches serve from the center
+        np.testing.assert_allclose(observations[:, 0], 0, atol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
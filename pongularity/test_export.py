@@ -0,0 +1,127 @@
+import unittest
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stderr
+import pygame
+from .export import FFmpegSink, FrameWriter, PngSequenceSink, export, frame_surface, main
+from .game import PongularityGame
+from .replay import Replay, ReplayPlayer
+from .test_replay import record_session
+
+# Stands in for ffmpeg: copies its input to the output path given last
+FAKE_FFMPEG = """#!{python}
+import shutil, sys
+with open(sys.argv[-1], "wb") as out:
+    shutil.copyfileobj(sys.stdin.buffer, out)
+"""
+
+class Sink:
+    def __init__(self, fail_at=None):
+        self.frames = []
+        self.closed = False
+        self.fail_at = fail_at
+
+    def write(self, data):
+        if len(self.frames) == self.fail_at:
+            raise OSError("disk full")
+        self.frames.append(data)
+
+    def close(self):
+        self.closed = True
+
+def offscreen_game():
+    game = PongularityGame(max_fps=0, dirty_rects=True, surface=frame_surface())
+    game.reset_game()
+    return game
+
+def advance(game):
+    game.left_paddle.dy = game.PADDLE_SPEED if game.tick % 80 < 40 else -game.PADDLE_SPEED
+    game.step()
+    return True
+
+class TestExport(unittest.TestCase):
+
+    def test_png_sequence(self):
+        """Test that PNG frames decode to exactly what was rendered"""
+        game = offscreen_game()
+        with tempfile.TemporaryDirectory() as directory:
+            pattern = os.path.join(directory, "frames", "%03d.png")
+            sink = PngSequenceSink(pattern, (game.WIDTH, game.HEIGHT))
+            stats = export(game, lambda: advance(game), sink, ticks=30)
+            self.assertEqual(stats["frames"], 31)
+            self.assertEqual(len(os.listdir(os.path.dirname(pattern))), 31)
+            frame = pygame.image.load(pattern % 30)
+            self.assertEqual(pygame.image.tobytes(frame, "RGB"), pygame.image.tobytes(game.screen, "RGB"))
+
+    def test_fps_skips_ticks(self):
+        """Test that a lower fps writes one frame per tick_rate / fps ticks"""
+        game = offscreen_game()
+        sink = Sink()
+        stats = export(game, lambda: advance(game), sink, ticks=60, fps=20)
+        self.assertEqual(stats["ticks"], 60)
+        self.assertEqual(len(sink.frames), 21)
+        self.assertTrue(sink.closed)
+
+    def test_fps_above_tick_rate(self):
+        """Test that fps outside 1 to the tick rate is rejected, in export() and on the command line"""
+        game = offscreen_game()
+        for fps in (-1, 120):
+            with self.assertRaises(ValueError):
+                export(game, lambda: advance(game), Sink(), ticks=10, fps=fps)
+            with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()):
+                main(["clip.mp4", "--fps", str(fps)])
+
+    def test_stops_when_play_ends(self):
+        """Test that export ends with the frame after advance() reports the end"""
+        game = offscreen_game()
+        sink = Sink()
+        stats = export(game, lambda: game.tick < 10 and advance(game), sink, ticks=100)
+        self.assertEqual(stats["ticks"], 11)
+        self.assertEqual(len(sink.frames), 12)
+
+    def test_writer_errors_reach_the_caller(self):
+        """Test that a failing sink raises from write() or close() instead of blocking"""
+        game = offscreen_game()
+        writer = FrameWriter(Sink(fail_at=2), queue_size=1)
+        with self.assertRaises(OSError):
+            for _ in range(100):
+                writer.write(game.screen)
+            writer.close()
+
+    def test_ffmpeg_pipe(self):
+        """Test that raw frames are piped to the encoder process in order"""
+        game = offscreen_game()
+        with tempfile.TemporaryDirectory() as directory:
+            ffmpeg = os.path.join(directory, "ffmpeg")
+            with open(ffmpeg, "w") as f:
+                f.write(FAKE_FFMPEG.format(python=sys.executable))
+            os.chmod(ffmpeg, 0o755)
+            output = os.path.join(directory, "clip.mp4")
+            sink = FFmpegSink(output, (game.WIDTH, game.HEIGHT), 60, ffmpeg=ffmpeg)
+            self.assertIn("yuv420p", sink.command)
+            export(game, lambda: advance(game), sink, ticks=5)
+            with open(output, "rb") as f:
+                data = f.read()
+        frame_size = game.WIDTH * game.HEIGHT * 4
+        self.assertEqual(len(data), 6 * frame_size)
+        self.assertEqual(data[-frame_size:], game.screen.get_buffer().raw)
+
+    def test_missing_ffmpeg(self):
+        """Test that a missing encoder is reported before anything is rendered"""
+        with self.assertRaises(RuntimeError):
+            FFmpegSink("clip.mp4", (10, 10), 60, ffmpeg="no-such-ffmpeg")
+
+    def test_replay_export(self):
+        """Test that exporting a recording plays it exactly as the headless replay does"""
+        recorder, states = record_session(600, seed=3)
+        replay = Replay.from_bytes(recorder.to_bytes())
+        game = PongularityGame(max_fps=0, dirty_rects=True, surface=frame_surface())
+        player = ReplayPlayer(replay, engine=game)
+        player.seek(300)
+        export(game, lambda: player.step(1), Sink(), ticks=len(replay) - 300)
+        self.assertEqual(game.snapshot(), states[600])
+
+if __name__ == '__main__':
+    unittest.main()
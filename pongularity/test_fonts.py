@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+import os
+import tempfile
+import pygame
+from .fonts import FontLoader, LazyFont, resolve_font_file
+
+class TestFontResolution(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmp.name, "pongularity", "fonts.json")
+        self.font_file = os.path.join(self.tmp.name, "arial.ttf")
+        open(self.font_file, "w").close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan_once_then_cached(self):
+        """Test that system fonts are scanned once and the path reused"""
+        with patch('pygame.font.match_font', return_value=self.font_file) as match_font:
+            self.assertEqual(resolve_font_file("Arial", self.cache_file), self.font_file)
+            self.assertEqual(resolve_font_file("Arial", self.cache_file), self.font_file)
+        self.assertEqual(match_font.call_count, 1)
+        with open(self.cache_file) as f:
+            self.assertEqual(json.load(f), {"Arial": self.font_file})
+
+    def test_missing_font_is_cached(self):
+        """Test that 'no such font' is remembered as the default font"""
+        with patch('pygame.font.match_font', return_value=None) as match_font:
+            self.assertIsNone(resolve_font_file("Arial", self.cache_file))
+            self.assertIsNone(resolve_font_file("Arial", self.cache_file))
+        self.assertEqual(match_font.call_count, 1)
+
+    def test_stale_path_is_rescanned(self):
+        """Test that a cached path that no longer exists triggers a new scan"""
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, "w") as f:
+            json.dump({"Arial": os.path.join(self.tmp.name, "gone.ttf")}, f)
+        with patch('pygame.font.match_font', return_value=self.font_file) as match_font:
+            self.assertEqual(resolve_font_file("Arial", self.cache_file), self.font_file)
+        self.assertEqual(match_font.call_count, 1)
+
+    def test_corrupt_cache_is_ignored(self):
+        """Test that an unreadable cache file falls back to scanning"""
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, "w") as f:
+            f.write("not json")
+        with patch('pygame.font.match_font', return_value=self.font_file):
+            self.assertEqual(resolve_font_file("Arial", self.cache_file), self.font_file)
+
+class TestLazyFonts(unittest.TestCase):
+
+    class Screen:
+        big_font = LazyFont(40)
+        small_font = LazyFont(10)
+
+        def __init__(self, fonts):
+            self.fonts = fonts
+
+    def test_sizes_load_on_first_use(self):
+        """Test that each size is opened only when first read"""
+        fonts = MagicMock()
+        screen = self.Screen(fonts)
+        fonts.load.assert_not_called()
+        self.assertIs(screen.big_font, fonts.load.return_value)
+        self.assertIs(screen.big_font, fonts.load.return_value)
+        fonts.load.assert_called_once_with(40)
+
+    def test_assignment_overrides(self):
+        """Test that a font can still be assigned directly"""
+        screen = self.Screen(MagicMock())
+        replacement = object()
+        screen.small_font = replacement
+        self.assertIs(screen.small_font, replacement)
+        screen.fonts.load.assert_not_called()
+
+    def test_loader_opens_each_size_once(self):
+        """Test that FontLoader caches fonts per size"""
+        pygame.font.init()
+        loader = FontLoader(None)
+        self.assertIsNone(loader.path)
+        self.assertIs(loader.load(20), loader.load(20))
+        self.assertIsNot(loader.load(20), loader.load(21))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,10 @@ import unittest
 from unittest.mock import patch, MagicMock
 import pygame
 import sys
+from .controllers import TrackerController
+from .fonts import FontLoader
 from .game import PongularityGame
+from .replay import InputRecorder, Replay
 
 class TestPongularityGame(unittest.TestCase):
     
@@ -14,6 +17,8 @@ class TestPongularityGame(unittest.TestCase):
         self.pygame_font_mock = MagicMock()
         
         with patch('pygame.init'), \
+             patch('pygame.display.init'), \
+             patch('pygame.font.init'), \
              patch('pygame.display.set_mode', return_value=MagicMock()), \
              patch('pygame.display.set_caption'), \
              patch('pygame.time.Clock', return_value=MagicMock()), \
@@ -253,5 +258,168 @@ class TestPongularityGame(unittest.TestCase):
         
         self.assertTrue(self.game.game_over)
 
+    def test_step_records_previous_positions(self):
+        """Test that step() keeps the pre-tick positions for interpolation"""
+        self.game.reset_game()
+        before = self.game.positions()
+        self.game.step()
+        self.assertEqual(self.game.previous_positions, before)
+        self.assertNotEqual(self.game.positions(), before)
+
+    def test_step_records_inputs(self):
+        """Test that each physics tick is recorded when recording is on"""
+        self.game.recorder = InputRecorder.for_engine(self.game)
+        self.game.reset_game()
+        self.game.left_paddle["dy"] = -self.game.PADDLE_SPEED
+        self.game.right_paddle["dy"] = self.game.PADDLE_SPEED
+        self.game.step()
+        self.game.step()
+        replay = Replay.from_bytes(self.game.recorder.to_bytes())
+        self.assertEqual(list(replay.inputs), [1 | 2 << 2, 1 | 2 << 2])
+
+    def test_step_asks_controllers(self):
+        """Test that a CPU controller moves its paddle and the recording shows it"""
+        self.game.controllers["right"] = TrackerController(difficulty="perfect")
+        self.game.recorder = InputRecorder.for_engine(self.game)
+        self.game.reset_game()
+        self.game.ball["y"] = 30
+        self.game.left_paddle["dy"] = self.game.PADDLE_SPEED
+        self.game.right_paddle["dy"] = self.game.PADDLE_SPEED
+        self.game.step()
+        self.assertEqual(self.game.left_paddle["dy"], self.game.PADDLE_SPEED)
+        self.assertEqual(self.game.right_paddle["dy"], -self.game.PADDLE_SPEED)
+        replay = Replay.from_bytes(self.game.recorder.to_bytes())
+        self.assertEqual(list(replay.inputs), [2 | 1 << 2])
+
+    def test_interpolated_positions(self):
+        """Test render interpolation between the previous and current tick"""
+        self.game.previous_positions = (100, 200, 300, 400)
+        self.game.left_paddle["y"] = 110
+        self.game.right_paddle["y"] = 200
+        self.game.ball["x"] = 310
+        self.game.ball["y"] = 390
+        self.assertEqual(self.game.interpolated_positions(0.5), (105, 200, 305, 395))
+        self.assertEqual(self.game.interpolated_positions(1.0), (110, 200, 310, 390))
+
+        # A re-served ball jumps straight to the center
+        self.game.ball["x"] = self.game.WIDTH / 2
+        self.game.previous_positions = (110, 200, -10, 400)
+        self.assertEqual(self.game.interpolated_positions(0.5)[2], self.game.WIDTH / 2)
+
+class TestDirtyRectRendering(unittest.TestCase):
+    
+    def make_game(self, dirty_rects):
+        with patch('pygame.init'), \
+             patch('pygame.display.set_mode', return_value=MagicMock()), \
+             patch('pygame.display.set_caption'), \
+             patch('pygame.time.Clock', return_value=MagicMock()), \
+             patch('pygame.font.SysFont', return_value=MagicMock()):
+            game = PongularityGame(dirty_rects=dirty_rects)
+        game.screen = pygame.Surface((game.WIDTH, game.HEIGHT))
+        game.score_font = pygame.font.Font(None, 32)
+        game.reset_game()
+        return game
+    
+    def setUp(self):
+        pygame.font.init()
+        self.dirty = self.make_game(dirty_rects=True)
+        self.full = self.make_game(dirty_rects=False)
+    
+    def render_both(self, alpha=1.0):
+        with patch('pygame.display.flip'), patch('pygame.display.update') as update:
+            self.dirty.render(alpha)
+            self.full.render(alpha)
+        self.assertEqual(pygame.image.tobytes(self.dirty.screen, "RGB"),
+                         pygame.image.tobytes(self.full.screen, "RGB"))
+        return update.call_args
+    
+    def test_first_frame_is_full(self):
+        """Test that dirty-rect mode draws the first playing frame in full"""
+        self.assertIsNone(self.render_both())
+        self.assertIsNotNone(self.dirty.drawn_rects)
+    
+    def test_dirty_frames_match_full_redraw(self):
+        """Test that partial redraws leave the same pixels as a full redraw"""
+        self.render_both()
+        for tick in range(400):
+            for game in (self.dirty, self.full):
+                game.left_paddle["dy"] = game.PADDLE_SPEED if (tick // 50) % 2 else -game.PADDLE_SPEED
+                game.step()
+            call = self.render_both(alpha=0.5)
+            rects = call[0][0]
+            area = sum(rect.width * rect.height for rect in rects)
+            self.assertLess(area, self.dirty.WIDTH * self.dirty.HEIGHT // 10)
+    
+    def test_ball_over_score_and_score_change(self):
+        """Test that scores are redrawn when the ball crosses them or they change"""
+        self.render_both()
+        for game in (self.dirty, self.full):
+            game.ball["x"] = game.WIDTH // 4
+            game.ball["y"] = game.GRID * 4
+            game.ball["dx"] = 1
+            game.ball["dy"] = 1
+        for _ in range(30):
+            for game in (self.dirty, self.full):
+                game.step()
+            self.render_both()
+        for game in (self.dirty, self.full):
+            game.score["left"] = 7
+        self.render_both()
+
+class TestStaticScreens(unittest.TestCase):
+    
+    def setUp(self):
+        pygame.font.init()
+        with patch('pygame.display.init'), \
+             patch('pygame.display.set_mode', return_value=pygame.Surface((750, 585))), \
+             patch('pygame.display.set_caption'), \
+             patch('pygame.time.Clock', return_value=MagicMock()):
+            self.game = PongularityGame()
+        # Use pygame's built-in font rather than scanning system fonts
+        self.game.fonts = FontLoader(None)
+    
+    def test_static_screens_are_composed_once(self):
+        """Test that start and game over screens rasterize their text only once"""
+        with patch('pygame.display.flip'):
+            self.game.render()
+            misses = self.game.text_cache.misses
+            self.game.render()
+            self.assertEqual(self.game.text_cache.misses, misses)
+            
+            self.game.game_state = "game_over"
+            self.game.score["left"] = self.game.MAX_SCORE
+            self.game.render()
+            self.game.render()
+        self.assertEqual(len(self.game.static_screens), 2)
+        self.assertEqual(self.game.screen.get_at((0, 0))[:3], self.game.BLACK)
+    
+    def test_profiler_overlay(self):
+        """Test that the frame-time overlay draws over the playfield"""
+        self.game.reset_game()
+        self.game.enable_profiler()
+        self.game.show_profiler = True
+        for _ in range(3):
+            self.game.profiler.begin_frame()
+            for phase in ("input", "update", "render", "sleep"):
+                self.game.profiler.mark(phase)
+            self.game.profiler.end_frame()
+        with patch('pygame.display.flip'):
+            self.game.render()
+        self.assertEqual(len(self.game.profiler_lines), 6)
+        self.assertIsNone(self.game.drawn_rects)
+        overlay = self.game.screen.subsurface((self.game.GRID, self.game.GRID * 2, 300, 20))
+        self.assertNotEqual(pygame.transform.average_color(overlay)[:3], (0, 0, 0))
+    
+    def test_scores_do_not_rasterize_per_frame(self):
+        """Test that playing frames draw scores from cached digit glyphs"""
+        self.game.reset_game()
+        with patch('pygame.display.flip'):
+            self.game.render()
+            misses = self.game.text_cache.misses
+            self.game.score["left"] = 9
+            self.game.score["right"] = 10
+            self.game.render()
+        self.assertEqual(self.game.text_cache.misses, misses)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,187 @@
+import unittest
+import asyncio
+from collections import deque
+from .controllers import make_controller
+from .engine import PongularityEngine
+from .net import (HELLO, HISTORY_TICKS, INPUT, STATE, WELCOME, MatchClient, MatchServer, NetworkShim,
+                  decode_state, encode_state, pack_codes, unpack_codes)
+
+class Link:
+    """In-memory packets delivered a fixed number of ticks after they are sent."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.queue = deque()
+        self.now = 0
+
+    def sender(self, receive):
+        return lambda data: self.queue.append((self.now + self.delay, receive, data))
+
+    def advance(self):
+        self.now += 1
+        while self.queue and self.queue[0][0] <= self.now:
+            _, receive, data = self.queue.popleft()
+            receive(data)
+
+def connect_in_memory(server, link, **options):
+    """Join a client to server over link without sockets."""
+    client = MatchClient(**options)
+    peer = object()
+    server.add_peer(peer, link.sender(client.receive))
+    client.write = link.sender(lambda data: server.receive(data, peer))
+    client.hello()
+    return client
+
+class TestEncoding(unittest.TestCase):
+
+    def test_delta_round_trip(self):
+        """Test that a delta carries only changed fields and decodes exactly"""
+        engine = PongularityEngine()
+        engine.reset_game()
+        baseline = engine.snapshot()
+        for _ in range(5):
+            engine.update()
+        snapshot = engine.snapshot()
+
+        mask, payload = encode_state(snapshot, baseline)
+        self.assertEqual(len(payload), 16)  # ball x and y
+        self.assertEqual(decode_state(engine.tick, mask, payload, baseline), snapshot)
+
+        mask, payload = encode_state(snapshot)
+        self.assertEqual(decode_state(engine.tick, mask, payload), snapshot)
+
+    def test_input_codes(self):
+        """Test that input codes pack four to a byte and unpack unchanged"""
+        codes = [0, 1, 2, 1, 2, 2, 0]
+        data = pack_codes(codes)
+        self.assertEqual(len(data), 2)
+        self.assertEqual(unpack_codes(data, len(codes)), codes)
+
+class TestPrediction(unittest.TestCase):
+
+    def play(self, delay=3, lead=8, ticks=600, server=None):
+        """Play ticks server ticks over an in-memory link and return (server, clients)."""
+        server = server or MatchServer()
+        link = Link(delay)
+        clients = [connect_in_memory(server, link, lead=lead,
+                                     controller=make_controller("tracker", difficulty="hard", seed=side))
+                   for side in range(2)]
+        for _ in range(delay):
+            link.advance()
+        server.start()
+        for _ in range(ticks):
+            server.tick()
+            for client in clients:
+                if client.started.is_set():
+                    client.clock_tick()
+            link.advance()
+        return server, clients
+
+    def test_clients_agree_with_server(self):
+        """Test that every prediction the server has confirmed matches its state"""
+        server, clients = self.play()
+        self.assertEqual([client.side for client in clients], ["left", "right"])
+        for client in clients:
+            tick = client.authoritative[-2]
+            self.assertEqual(client.authoritative, server.history[tick])
+            self.assertGreater(client.engine.tick, tick)
+            self.assertEqual(client.resyncs, 0)
+
+    def test_rollback_corrects_opponent(self):
+        """Test that opponent moves the client did not predict are rolled back"""
+        server, clients = self.play()
+        for client in clients:
+            self.assertGreater(client.rollbacks, 0)
+            self.assertGreater(client.resimulated, client.rollbacks)
+            self.assertLess(client.rollbacks, client.ticks)
+
+    def test_inputs_arrive_in_time(self):
+        """Test that with enough lead the server has every input when it needs it"""
+        server, clients = self.play()
+        stats = server.stats()
+        # Only the ticks before the first inputs could arrive are missed
+        for side in ("left", "right"):
+            self.assertLessEqual(stats["missed_inputs"][side], 10)
+
+    def test_lead_adjusts(self):
+        """Test that a client with too little lead adds ticks until its inputs are on time"""
+        server, clients = self.play(delay=4, lead=1)
+        for client in clients:
+            self.assertGreater(client.adjustments, 0)
+            self.assertGreaterEqual(client.input_ack - client.authoritative[-2], 1)
+
+    def test_delta_saves_bandwidth(self):
+        """Test that delta states are much smaller than full ones"""
+        delta, _ = self.play()
+        full, clients = self.play(server=MatchServer(delta=False))
+        self.assertEqual(clients[0].authoritative, full.history[clients[0].authoritative[-2]])
+        self.assertLess(delta.stats()["bytes_sent"], full.stats()["bytes_sent"] * 0.6)
+
+    def test_malformed_packets_are_dropped(self):
+        """Test that empty, truncated and far-future packets are ignored"""
+        server, clients = self.play(ticks=100)
+        peer, player = next(iter(server.players.items()))
+        states = [client.authoritative for client in clients]
+        for data in (b"", bytes((HELLO,)), bytes((INPUT, 0)), bytes((99,)) * 20,
+                     bytes((INPUT,)) + (1000).to_bytes(4, "little") + bytes(4) + bytes((200,))):
+            server.receive(data, peer)
+            for client in clients:
+                client.receive(data)
+        for data in (bytes((WELCOME, 0)), bytes((STATE,)) + bytes(11) + b"\x01",
+                     bytes((STATE,)) + bytes(5) + bytes(4) + b"\xff\xff"):
+            for client in clients:
+                client.receive(data)
+        self.assertEqual([client.authoritative for client in clients], states)
+
+        # Well-formed inputs too far ahead are not kept
+        tick = server.engine.tick
+        for far in (tick + HISTORY_TICKS + 100, 2 ** 32 - 1):
+            data = bytes((INPUT,)) + far.to_bytes(4, "little") + bytes(4) + bytes((200,)) + pack_codes([1] * 200)
+            player.receive_input(data, tick, server.history)
+            self.assertLessEqual(max(player.inputs), tick + HISTORY_TICKS)
+            self.assertLessEqual(player.latest_input, tick + HISTORY_TICKS)
+
+    def test_received_states_are_pruned_under_loss(self):
+        """Test that the client keeps no state older than HISTORY_TICKS when most are lost"""
+        server, clients = self.play(ticks=5)
+        client = clients[0]
+        for tick in range(10, 3000, 7):
+            snapshot = client.authoritative[:-2] + (tick,) + client.authoritative[-1:]
+            client.on_state(snapshot, tick)
+        self.assertLessEqual(len(client.received), HISTORY_TICKS // 7 + 1)
+        self.assertGreater(min(client.received), 2996 - HISTORY_TICKS)
+
+class TestLocalhost(unittest.TestCase):
+
+    async def match(self, transport, shim=None, ticks=240):
+        server = MatchServer(tick_rate=240, shim=shim, linger=0.1)
+        host, port = await server.listen(transport=transport)
+        clients = [MatchClient(make_controller("tracker", seed=side), shim=shim) for side in range(2)]
+        for client in clients:
+            await client.connect(host, port, transport)
+        results = await asyncio.gather(server.play(max_ticks=ticks), *(client.play() for client in clients))
+        server.close()
+        for client in clients:
+            client.close()
+        return server, clients, results
+
+    def test_udp_with_latency_and_loss(self):
+        """Test that a lossy, laggy UDP match ends with the clients on the server's final state"""
+        shim = NetworkShim(latency=0.01, jitter=0.005, loss=0.1, seed=1)
+        server, clients, (stats, *client_stats) = asyncio.run(self.match("udp", shim))
+        self.assertEqual(stats["ticks"], 240)
+        self.assertGreater(shim.dropped, 0)
+        for client, result in zip(clients, client_stats):
+            self.assertEqual(client.engine.snapshot(), server.engine.snapshot())
+            self.assertGreater(result["input_latency"], 0.02)
+
+    def test_tcp(self):
+        """Test that the same match runs over TCP"""
+        server, clients, (stats, *_) = asyncio.run(self.match("tcp", ticks=60))
+        self.assertEqual(stats["ticks"], 60)
+        self.assertGreater(stats["bytes_per_second"], 0)
+        for client in clients:
+            self.assertEqual(client.engine.snapshot(), server.engine.snapshot())
+
+if __name__ == '__main__':
+    unittest.main()
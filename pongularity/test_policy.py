@@ -0,0 +1,98 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from .batch import BatchPong
+from .controllers import TrackerController
+from .engine import PongularityEngine
+from .policy import (FEATURES, BatchPolicyController, LinearPolicy, MLPPolicy, PolicyController,
+                     fill_features, quantize)
+
+class TestPolicies(unittest.TestCase):
+
+    def test_features_are_mirrored(self):
+        """Test that both paddles see the same features in a mirrored position"""
+        engine = PongularityEngine()
+        left = fill_features(np.zeros((1, len(FEATURES))), engine, "left", 100.0, 200.0, -5.0, 3.0, False, 250.0)
+        right = fill_features(np.zeros((1, len(FEATURES))), engine, "right",
+                              engine.WIDTH - engine.GRID - 100.0, 200.0, 5.0, 3.0, False, 250.0)
+        np.testing.assert_allclose(left, right)
+        self.assertGreater(left[0, 1], 0)
+
+    def test_quantize(self):
+        """Test that small outputs mean standing still"""
+        np.testing.assert_array_equal(quantize(np.array([-0.9, -0.2, 0.0, 0.4, 0.7])), [-1, 0, 0, 0, 1])
+
+    def test_linear_tracker_matches_tracker_controller(self):
+        """Test that the tracking LinearPolicy wins points like the hand-written tracker"""
+        engine = PongularityEngine()
+        engine.reset_game()
+        left = PolicyController(difficulty="hard", seed=1)
+        right = TrackerController(difficulty="easy", seed=2)
+        while engine.game_state == "playing":
+            engine.left_paddle.dy = left.control(engine, "left")
+            engine.right_paddle.dy = right.control(engine, "right")
+            engine.update()
+        self.assertEqual(engine.score["left"], engine.MAX_SCORE)
+
+    def test_mlp_shapes_and_round_trip(self):
+        """Test that an MLP evaluates many rows at once and saves its weights"""
+        policy = MLPPolicy.random(hidden=(8, 8), seed=3)
+        features = np.random.default_rng(0).normal(size=(100, len(FEATURES)))
+        actions = policy.act(features)
+        self.assertEqual(actions.shape, (100,))
+        self.assertTrue(np.all(np.abs(actions) <= 1))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "policy.npz")
+            policy.save(path)
+            np.testing.assert_array_equal(MLPPolicy.load(path).act(features), actions)
+
+    def test_policy_shape_checks(self):
+        """Test that weights of the wrong size are rejected"""
+        with self.assertRaises(ValueError):
+            LinearPolicy(np.zeros(3))
+        with self.assertRaises(ValueError):
+            MLPPolicy([(np.zeros((3, 1)), np.zeros(1))])
+
+    def test_batch_controller_matches_single_controllers(self):
+        """Test that batched decisions equal one PolicyController per match"""
+        n = 16
+        policy = MLPPolicy.random(seed=4)
+        batch = BatchPong(n)
+        batch.reset_game()
+        engines = [PongularityEngine() for _ in range(n)]
+        rng = np.random.default_rng(5)
+        for i, engine in enumerate(engines):
+            engine.reset_game()
+            engine.ball.dy = batch.ball_dy[i] = rng.uniform(-5, 5)
+        batched = BatchPolicyController(policy, difficulty="normal", error=0, budget=None)
+        singles = [PolicyController(policy, difficulty="normal", error=0, budget=None) for _ in range(n)]
+        tracker = BatchPolicyController(error=0, budget=None)
+
+        for _ in range(600):
+            left = batched.control(batch, "left")
+            right = tracker.control(batch, "right")
+            for i, engine in enumerate(engines):
+                engine.left_paddle.dy = singles[i].control(engine, "left")
+                self.assertEqual(engine.left_paddle.dy, left[i])
+                engine.right_paddle.dy = right[i]
+                engine.update()
+            batch.step(left, right)
+        np.testing.assert_array_equal(batch.ball_x, [engine.ball.x for engine in engines])
+        np.testing.assert_array_equal(batch.left_y, [engine.left_paddle.y for engine in engines])
+
+    def test_batch_budget_is_per_match(self):
+        """Test that a batched decision gets the budget once for every match it covers"""
+        batch = BatchPong(100)
+        batch.reset_game()
+        clock = iter([0.0, 0.05, 1.0, 1.2])
+        controller = BatchPolicyController(budget=0.001, drop_late=True, clock=lambda: next(clock))
+        first = controller.control(batch, "left")
+        self.assertEqual(controller.overruns, 0)
+        batch.ball_y[:] = 30
+        np.testing.assert_array_equal(controller.control(batch, "left"), first)
+        self.assertEqual(controller.overruns, 1)
+
+if __name__ == '__main__':
+    unittest.main()
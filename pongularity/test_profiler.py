@@ -0,0 +1,89 @@
+import unittest
+import csv
+import json
+import os
+import tempfile
+from .profiler import FrameProfiler, PHASES
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestFrameProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.profiler = FrameProfiler(capacity=4, budget=0.010, clock=self.clock)
+
+    def frame(self, input=0.001, update=0.002, render=0.003, sleep=0.0):
+        self.profiler.begin_frame()
+        for phase, duration in zip(PHASES, (input, update, render, sleep)):
+            self.clock.now += duration
+            self.profiler.mark(phase)
+        self.profiler.end_frame()
+
+    def test_phase_timings(self):
+        """Test that each phase records the time since the previous mark"""
+        self.frame()
+        stats = self.profiler.summary()
+        self.assertAlmostEqual(stats["update"]["max"], 0.002)
+        self.assertAlmostEqual(stats["render"]["p50"], 0.003)
+        self.assertAlmostEqual(stats["frame"]["max"], 0.006)
+
+    def test_ring_buffer_keeps_latest_frames(self):
+        """Test that only the last capacity frames are kept"""
+        for update in (0.1, 0.2, 0.001, 0.002, 0.003, 0.004):
+            self.frame(update=update)
+        self.assertEqual(self.profiler.count, 4)
+        self.assertEqual(self.profiler.frames, 6)
+        self.assertAlmostEqual(self.profiler.stats("update")["max"], 0.004)
+
+    def test_percentiles(self):
+        """Test nearest-rank p50 and p99"""
+        profiler = FrameProfiler(capacity=100, clock=self.clock)
+        self.profiler = profiler
+        for i in range(1, 101):
+            self.frame(update=i / 1000)
+        stats = profiler.stats("update")
+        self.assertAlmostEqual(stats["p50"], 0.050)
+        self.assertAlmostEqual(stats["p99"], 0.099)
+        self.assertAlmostEqual(stats["max"], 0.100)
+
+    def test_dropped_frames(self):
+        """Test that frames over budget count the refreshes they missed"""
+        self.frame()
+        self.frame(render=0.012)
+        self.frame(render=0.030)
+        self.assertEqual(self.profiler.dropped_frames, 4)
+
+    def test_empty_stats(self):
+        """Test that stats are zero before any frame is recorded"""
+        self.assertEqual(self.profiler.stats("render"), {"p50": 0.0, "p99": 0.0, "max": 0.0})
+
+    def test_exports(self):
+        """Test CSV and Chrome trace export"""
+        self.frame()
+        self.frame(update=0.004)
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "frames.csv")
+            trace_path = os.path.join(tmp, "frames.json")
+            self.profiler.export(csv_path)
+            self.profiler.export(trace_path)
+
+            with open(csv_path) as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], ["input_ms", "update_ms", "render_ms", "sleep_ms", "frame_ms"])
+            self.assertEqual(rows[2][1], "4.0000")
+
+            with open(trace_path) as f:
+                events = json.load(f)["traceEvents"]
+            self.assertEqual(len(events), 8)
+            self.assertEqual([e["name"] for e in events[:4]], list(PHASES))
+            self.assertAlmostEqual(events[1]["ts"], events[0]["ts"] + events[0]["dur"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import unittest
+import os
+import warnings
+from unittest.mock import patch
+
+# SDL's dummy video driver gives the texture renderer a window without a
+# display; its software renderer draws the same pixels a GPU would
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from .config import PRESETS
+from .fonts import FontLoader
+from .game import PongularityGame
+from .renderers import SurfaceRenderer, TextureRenderer, make_renderer
+
+try:
+    import pygame._sdl2.video
+    HAVE_SDL2_VIDEO = True
+except ImportError:
+    HAVE_SDL2_VIDEO = False
+
+def make_game(**options):
+    game = PongularityGame(**options)
+    # Use pygame's built-in font rather than scanning system fonts
+    game.fonts = FontLoader(None)
+    return game
+
+def play(game, ticks):
+    game.reset_game()
+    for tick in range(ticks):
+        game.left_paddle.dy = game.PADDLE_SPEED if (tick // 40) % 2 else -game.PADDLE_SPEED
+        game.right_paddle.dy = -game.left_paddle.dy
+        game.step()
+
+@unittest.skipUnless(HAVE_SDL2_VIDEO, "pygame._sdl2.video is not available")
+class TestTextureRenderer(unittest.TestCase):
+
+    def setUp(self):
+        pygame.display.init()
+        self.texture = make_game(renderer="texture")
+        self.surface = make_game(surface=pygame.Surface((self.texture.WIDTH, self.texture.HEIGHT)))
+
+    def assert_same_frame(self, alpha=1.0):
+        self.texture.render(alpha)
+        self.surface.render(alpha)
+        drawn = pygame.image.tobytes(self.texture.renderer.read_pixels(), "RGB")
+        expected = pygame.image.tobytes(self.surface.screen, "RGB")
+        self.assertEqual(len(drawn), len(expected))
+        # SDL rounds differently when blending antialiased text, by one level at most
+        self.assertLessEqual(max(abs(a - b) for a, b in zip(drawn, expected)), 1)
+
+    def test_backend(self):
+        """Test that the texture backend is chosen and draws with SDL's renderer"""
+        self.assertIsInstance(self.texture.renderer, TextureRenderer)
+        self.assertIsInstance(self.surface.renderer, SurfaceRenderer)
+        self.assertEqual(self.texture.renderer.window.size, (self.texture.WIDTH, self.texture.HEIGHT))
+
+    def test_frames_match_surface_renderer(self):
+        """Test that every screen draws the same frame as the surface renderer"""
+        self.assert_same_frame()
+        for game in (self.texture, self.surface):
+            play(game, 300)
+            game.score["left"], game.score["right"] = 7, 10
+        self.assert_same_frame(alpha=0.5)
+        for game in (self.texture, self.surface):
+            game.game_state = "game_over"
+        self.assert_same_frame()
+
+    def test_arena_frames_match_surface_renderer(self):
+        """Test that every ball and obstacle of an arena is drawn as the surface renderer does"""
+        config = PRESETS["party"].replace(balls=40, obstacles=6)
+        self.texture = make_game(renderer="texture", config=config)
+        self.surface = make_game(surface=pygame.Surface((config.width, config.height)), config=config)
+        for game in (self.texture, self.surface):
+            play(game, 100)
+        self.assert_same_frame(alpha=0.5)
+
+    def test_textures_are_uploaded_once(self):
+        """Test that playing frames reuse the uploaded score and screen textures"""
+        renderer = self.texture.renderer
+        self.texture.render()
+        play(self.texture, 10)
+        self.texture.render()
+        digits, screens = renderer.digits, dict(renderer.static_screens)
+        misses = self.texture.text_cache.misses
+        for _ in range(20):
+            self.texture.step()
+            self.texture.score["left"] = (self.texture.score["left"] + 1) % 10
+            self.texture.render()
+        self.assertIs(renderer.digits, digits)
+        self.assertEqual(renderer.static_screens, screens)
+        self.assertEqual(self.texture.text_cache.misses, misses)
+
+    def test_scaled_window(self):
+        """Test that a larger window shows the playfield scaled to fit"""
+        game = make_game(renderer="texture", window_size=(1500, 1170))
+        play(game, 1)
+        game.render()
+        pixels = game.renderer.read_pixels()
+        self.assertEqual(pixels.get_size(), (1500, 1170))
+        paddle = game.left_paddle
+        self.assertEqual(pixels.get_at((int(paddle.x * 2) + 2, int(paddle.y * 2) + 2))[:3], game.WHITE)
+        self.assertEqual(pixels.get_at((int(paddle.x * 2) - 2, int(paddle.y * 2) + 2))[:3], game.BLACK)
+
+    def test_profiler_overlay(self):
+        """Test that the frame-time overlay is drawn over the playfield"""
+        self.texture.reset_game()
+        self.texture.enable_profiler()
+        self.texture.show_profiler = True
+        for _ in range(3):
+            self.texture.profiler.begin_frame()
+            self.texture.profiler.end_frame()
+        self.texture.render()
+        overlay = self.texture.renderer.read_pixels().subsurface(
+            (self.texture.GRID, self.texture.GRID * 2, 300, 20))
+        self.assertNotEqual(pygame.transform.average_color(overlay)[:3], (0, 0, 0))
+
+class TestSurfaceRenderer(unittest.TestCase):
+
+    def test_falls_back_to_surface(self):
+        """Test that the surface renderer is used when SDL's renderer cannot be created"""
+        pygame.display.init()
+        with patch.object(TextureRenderer, "__init__", side_effect=pygame.error("no renderer")), \
+             warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            game = make_game(renderer="texture")
+        self.assertIsInstance(game.renderer, SurfaceRenderer)
+        self.assertIn("no renderer", str(caught[0].message))
+        with self.assertRaises(ValueError):
+            make_renderer("opengl", game)
+
+    def test_offscreen_surface(self):
+        """Test that drawing onto a given surface never opens a window"""
+        surface = pygame.Surface((750, 585))
+        with patch("pygame.display.set_mode") as set_mode:
+            game = make_game(surface=surface, renderer="texture")
+        set_mode.assert_not_called()
+        self.assertIs(game.screen, surface)
+
+    def test_scaled_window(self):
+        """Test that a window of another shape shows the playfield scaled and centered"""
+        pygame.display.init()
+        game = make_game(window_size=(1920, 1080))
+        self.assertEqual(game.screen.get_size(), (game.WIDTH, game.HEIGHT))
+        self.assertEqual(game.renderer.viewport.get_abs_offset(), (267, 0))
+        self.assertEqual(game.renderer.viewport.get_size(), (1385, 1080))
+        play(game, 1)
+        game.render()
+        window = pygame.display.get_surface()
+        self.assertEqual(window.get_at((267 + 2, 2))[:3], game.LIGHT_GREY)
+        self.assertEqual(window.get_at((267 - 2, 2))[:3], (0, 0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
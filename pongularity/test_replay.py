@@ -0,0 +1,75 @@
+import unittest
+import os
+import random
+import tempfile
+from .engine import PongularityEngine
+from .replay import InputRecorder, Replay, ReplayPlayer
+
+def record_session(ticks, seed=0, hold=30, restart_every=None):
+    """Drive an engine with held random inputs and return (recorder, states by tick)."""
+    rng = random.Random(seed)
+    engine = PongularityEngine()
+    recorder = InputRecorder.for_engine(engine, seed=seed)
+    speed = engine.PADDLE_SPEED
+    states = {0: engine.snapshot()}
+    for tick in range(ticks):
+        if engine.game_state != "playing" and (restart_every is None or tick % restart_every == 0):
+            engine.reset_game()
+            recorder.record_start()
+        if tick % hold == 0:
+            left = rng.choice((-speed, 0, speed))
+            right = rng.choice((-speed, 0, speed))
+        engine.left_paddle.dy = left
+        engine.right_paddle.dy = right
+        recorder.record(left, right)
+        engine.update()
+        states[tick + 1] = engine.snapshot()
+    return recorder, states
+
+class TestReplay(unittest.TestCase):
+
+    def test_round_trip_reproduces_session(self):
+        """Test that replaying a recording ends in exactly the recorded state"""
+        recorder, states = record_session(20000, seed=3)
+        replay = Replay.from_bytes(recorder.to_bytes())
+        self.assertEqual(len(replay), 20000)
+        self.assertEqual(replay.seed, 3)
+        self.assertEqual(replay.config, {"tick_rate": 60, "swept": False})
+
+        player = ReplayPlayer(replay)
+        self.assertEqual(player.run(), 20000)
+        self.assertEqual(player.engine.snapshot(), states[20000])
+        self.assertTrue(len(replay.starts) > 1)
+
+    def test_seek_uses_keyframes(self):
+        """Test that seeking backwards and forwards lands on the recorded state"""
+        recorder, states = record_session(5000, seed=4, restart_every=700)
+        player = ReplayPlayer(Replay.from_bytes(recorder.to_bytes()), keyframe_interval=500)
+        player.run()
+        for tick in (4321, 10, 2500, 2501, 0, 5000):
+            player.seek(tick)
+            self.assertEqual(player.position, tick)
+            self.assertEqual(player.engine.snapshot(), states[tick])
+        self.assertIn(4500, player.keyframes)
+
+    def test_hour_long_session_is_small(self):
+        """Test that an hour of play at 60 Hz encodes to a few kilobytes"""
+        recorder, _ = record_session(60 * 60 * 60, seed=5, hold=45)
+        data = recorder.to_bytes()
+        self.assertLess(len(data), 16 * 1024)
+
+    def test_save_and_load(self):
+        """Test writing a recording to disk and reading it back"""
+        recorder, _ = record_session(100)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "match.pongrec")
+            recorder.save(path)
+            self.assertEqual(len(Replay.load(path)), 100)
+
+    def test_rejects_foreign_data(self):
+        """Test that files without the recording header are refused"""
+        with self.assertRaises(ValueError):
+            Replay.from_bytes(b"not a recording")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+import unittest
+import asyncio
+from collections import deque
+from .controllers import make_controller
+from .engine import PongularityEngine
+from .net import MatchClient
+from .rooms import AUTO_ROOMS, RoomServer, serve_sharded, shard_port
+
+class Link:
+    """In-memory packets delivered a fixed number of ticks after they are sent."""
+
+    def __init__(self, delay=2):
+        self.delay = delay
+        self.queue = deque()
+        self.now = 0
+
+    def sender(self, receive):
+        return lambda data: self.queue.append((self.now + self.delay, receive, data))
+
+    def advance(self):
+        self.now += 1
+        while self.queue and self.queue[0][0] <= self.now:
+            _, receive, data = self.queue.popleft()
+            receive(data)
+
+class TestRoomServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = RoomServer(capacity=4)
+        self.link = Link()
+        self.clients = []
+
+    def join(self, room=0, controller=None):
+        client = MatchClient(controller, room=room, lead=6)
+        peer = object()
+        self.server.add_peer(peer, self.link.sender(client.receive))
+        client.write = self.link.sender(lambda data: self.server.receive(data, peer))
+        client.hello()
+        self.clients.append(client)
+        return client
+
+    def run_ticks(self, ticks):
+        for _ in range(ticks):
+            self.server.tick()
+            for client in self.clients:
+                if client.started.is_set():
+                    client.clock_tick()
+            self.link.advance()
+
+    def test_pairs_clients_into_rooms(self):
+        """Test that clients asking for a room meet there and the rest are paired in order"""
+        a = self.join(room=7)
+        b = self.join()
+        c = self.join()
+        d = self.join(room=7)
+        self.run_ticks(5)
+        self.assertEqual(self.server.stats()["rooms"], 2)
+        self.assertEqual((a.side, d.side), ("left", "right"))
+        self.assertEqual((b.side, c.side), ("left", "right"))
+        rooms = {room.number: set(room.players.values()) for room in self.server.active}
+        self.assertIn(7, rooms)
+
+    def test_rooms_follow_the_engine(self):
+        """Test that each room plays exactly like a PongularityEngine with the same inputs"""
+        for i in range(3):
+            self.join(controller=make_controller("tracker", seed=i))
+            self.join(controller=make_controller("predictor", seed=i))
+        self.run_ticks(600)
+        engine = PongularityEngine()
+        for room in self.server.active:
+            players = list(room.players.values())
+            ticks = sorted(room.history)
+            engine.restore(room.history[ticks[0]])
+            for tick in ticks[1:]:
+                # The paddle speeds in each state are the inputs applied on that tick
+                state = room.history[tick]
+                engine.left_paddle.dy, engine.right_paddle.dy = state[1], state[3]
+                engine.update()
+                self.assertEqual(engine.snapshot(), state)
+            self.assertEqual(len(players), 2)
+        for client in self.clients:
+            self.assertEqual(client.resyncs, 0)
+            self.assertLess(client.rollbacks, client.ticks)
+
+    def test_malformed_packets_are_dropped(self):
+        """Test that empty and truncated packets neither seat a client nor raise"""
+        for data in (b"", bytes((1,)), bytes((2, 0, 0))):
+            self.server.receive(data, object())
+        self.assertEqual(self.server.stats()["rooms"], 0)
+        self.assertEqual(self.server.seats, {})
+
+    def test_reserved_room_numbers(self):
+        """Test that clients cannot ask for the numbers handed out automatically"""
+        reserved = [self.join(room=AUTO_ROOMS) for _ in range(2)]
+        a, b = self.join(), self.join()
+        self.run_ticks(5)
+        self.assertEqual([client.side for client in reserved], [None, None])
+        self.assertEqual((a.side, b.side), ("left", "right"))
+        self.assertEqual(list(self.server.rooms), [AUTO_ROOMS])
+        self.server.stop()
+        self.run_ticks(self.server.linger_ticks + 5)
+        self.assertEqual(self.server.stats()["finished_rooms"], 1)
+        self.assertEqual(self.server.rooms, {})
+
+    def test_automatic_numbers_skip_open_rooms(self):
+        """Test that an automatic room number already in use is skipped"""
+        taken = self.server.open_room(AUTO_ROOMS)
+        self.join(), self.join()
+        self.run_ticks(5)
+        self.assertIs(self.server.rooms[AUTO_ROOMS], taken)
+        room, = self.server.active
+        self.assertEqual(room.number, AUTO_ROOMS + 1)
+
+    def test_half_full_rooms_expire(self):
+        """Test that a room without a second player and a peer without a seat are dropped"""
+        self.server = RoomServer(capacity=4, wait_timeout=0.5)
+        self.join(room=5)
+        self.server.add_peer("silent", lambda data: None)
+        self.run_ticks(10)
+        self.assertEqual(self.server.stats()["waiting_rooms"], 1)
+        self.run_ticks(60)
+        stats = self.server.stats()
+        self.assertEqual((stats["waiting_rooms"], stats["expired_rooms"]), (0, 1))
+        self.assertEqual((self.server.seats, self.server.peers, self.server.unseated), ({}, {}, {}))
+        self.assertEqual(len(self.server.free_lanes), 4)
+
+    def test_capacity(self):
+        """Test that clients beyond capacity get no room"""
+        for _ in range(9):
+            self.join()
+        self.run_ticks(5)
+        self.assertEqual(self.server.stats()["rooms"], 4)
+        self.assertEqual(self.server.rejected, 1)
+        self.assertIsNone(self.clients[-1].side)
+
+    def test_finished_room_frees_lane(self):
+        """Test that a room that reaches game over says goodbye and its lane is reused"""
+        a, b = self.join(), self.join()
+        self.run_ticks(30)
+        room, = self.server.active
+        batch = self.server.batch
+        batch.left_score[room.lane] = batch.MAX_SCORE - 1
+        batch.ball_x[room.lane] = batch.WIDTH + 1
+        self.run_ticks(self.server.linger_ticks + 5)
+        self.assertEqual(self.server.stats()["finished_rooms"], 1)
+        self.assertEqual(self.server.stats()["rooms"], 0)
+        for client in (a, b):
+            self.assertTrue(client.finished)
+            self.assertEqual(client.engine.game_state, "game_over")
+            self.assertEqual(client.engine.score["left"], batch.MAX_SCORE)
+        self.assertEqual(len(self.server.free_lanes), 4)
+
+    def test_metrics(self):
+        """Test that tick time is split into the batch step and per-room work"""
+        for i in range(4):
+            self.join()
+            self.join()
+        self.run_ticks(120)
+        stats = self.server.stats()
+        self.assertEqual(stats["rooms"], 4)
+        self.assertGreater(stats["room_cpu"], 0)
+        self.assertGreater(stats["capacity"], 0)
+        self.assertGreaterEqual(stats["tick_time"], stats["step_time"])
+        per_room = self.server.room_stats()
+        self.assertEqual(len(per_room), 4)
+        for room in per_room.values():
+            self.assertGreater(room["cpu"], 0)
+
+class TestRoomsOverUDP(unittest.TestCase):
+
+    def test_rooms_on_localhost(self):
+        """Test that several matches share one server over UDP and end together"""
+        async def play():
+            server = RoomServer(capacity=8, tick_rate=240, linger=0.05)
+            host, port = await server.listen()
+            clients = [MatchClient(make_controller("tracker", seed=i)) for i in range(6)]
+            for client in clients:
+                await client.connect(host, port)
+            results = await asyncio.gather(server.run(max_ticks=240), *(c.play() for c in clients))
+            server.close()
+            for client in clients:
+                client.close()
+            return results[0], clients
+
+        stats, clients = asyncio.run(play())
+        self.assertEqual(stats["finished_rooms"], 3)
+        self.assertGreater(stats["ticks"], 240)
+        for client in clients:
+            self.assertTrue(client.finished)
+
+    def test_sharded(self):
+        """Test that rooms are spread over worker processes by number"""
+        port = 17900
+        async def play():
+            loop = asyncio.get_running_loop()
+            workers = loop.run_in_executor(None, lambda: serve_sharded(2, port=port, max_ticks=480,
+                                                                       tick_rate=240, linger=0.05))
+            clients = [MatchClient(room=room) for room in (1, 1, 2, 2)]
+            for client in clients:
+                await client.connect("127.0.0.1", shard_port(port, client.room, 2))
+            await asyncio.gather(*(client.play() for client in clients))
+            for client in clients:
+                client.close()
+            return await workers, clients
+
+        stats, clients = asyncio.run(play())
+        self.assertEqual([s["finished_rooms"] for s in stats], [1, 1])
+        for client in clients:
+            self.assertTrue(client.finished)
+
+if __name__ == '__main__':
+    unittest.main()
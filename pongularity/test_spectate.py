@@ -0,0 +1,169 @@
+import unittest
+import asyncio
+from .config import GameConfig
+from .controllers import make_controller
+from .engine import PongularityEngine
+from .net import MatchClient, MatchServer
+from .spectate import SCALE, SpectatorClient, SpectatorFeed, SpectatorServer, quantize
+
+def play(feed, ticks, seed=0):
+    """Publish ticks of a tracker-against-tracker match to feed and return the engine."""
+    engine = PongularityEngine()
+    engine.reset_game()
+    controllers = {side: make_controller("tracker", seed=seed + i) for i, side in enumerate(("left", "right"))}
+    feed.publish(engine.snapshot())
+    for _ in range(ticks):
+        engine.left_paddle.dy = controllers["left"].control(engine, "left")
+        engine.right_paddle.dy = controllers["right"].control(engine, "right")
+        engine.update()
+        feed.publish(engine.snapshot())
+    return engine
+
+class TestFeed(unittest.TestCase):
+
+    def test_round_trip(self):
+        """Test that a viewer's state is the server's within a quarter pixel on every tick"""
+        feed = SpectatorFeed()
+        client = SpectatorClient()
+        feed.subscribe("viewer", client.receive)
+        engine = PongularityEngine()
+        engine.reset_game()
+        viewer = PongularityEngine()
+        for _ in range(300):
+            engine.left_paddle.dy = engine.PADDLE_SPEED if engine.tick % 90 < 45 else -engine.PADDLE_SPEED
+            engine.update()
+            feed.publish(engine.snapshot())
+            client.apply(viewer)
+            self.assertEqual(client.view, quantize(engine.snapshot()))
+            for name in ("ball", "left_paddle", "right_paddle"):
+                self.assertAlmostEqual(getattr(viewer, name).y, getattr(engine, name).y, delta=0.5 / SCALE)
+            self.assertAlmostEqual(viewer.ball.x, engine.ball.x, delta=0.5 / SCALE)
+            self.assertEqual((viewer.score, viewer.game_state, viewer.tick),
+                             (engine.score, engine.game_state, engine.tick))
+        self.assertEqual(client.gaps, 0)
+
+    def test_frames_are_small(self):
+        """Test that deltas are a few bytes and keyframes come once per interval"""
+        feed = SpectatorFeed(keyframe_interval=60)
+        play(feed, 599)
+        stats = feed.stats()
+        self.assertEqual(stats["frames"], 600)
+        self.assertLess(stats["bytes_per_frame"], 10)
+        self.assertEqual(len(feed.backlog), 60)
+
+    def test_shared_encoding(self):
+        """Test that every subscriber is sent the very same frame object"""
+        feed = SpectatorFeed()
+        received = [[] for _ in range(3)]
+        for i, frames in enumerate(received):
+            feed.subscribe(i, frames.append)
+        play(feed, 10)
+        for first, *others in zip(*received):
+            for other in others:
+                self.assertIs(other, first)
+        self.assertEqual(feed.stats()["bytes_sent"], 3 * feed.frame_bytes)
+
+    def test_late_join(self):
+        """Test that a viewer joining mid-match is sent the backlog and catches up at once"""
+        feed = SpectatorFeed(keyframe_interval=60)
+        engine = play(feed, 100)
+        client = SpectatorClient()
+        feed.subscribe("late", client.receive)
+        self.assertEqual(client.view, quantize(engine.snapshot()))
+
+    def test_gap_waits_for_keyframe(self):
+        """Test that a lost frame stops the view until the next keyframe"""
+        feed = SpectatorFeed(keyframe_interval=30)
+        client = SpectatorClient()
+        frames = []
+        feed.subscribe("viewer", frames.append)
+        engine = play(feed, 70)
+        for i, frame in enumerate(frames):
+            if i != 10:
+                client.receive(frame)
+            if 11 <= i < 30:
+                self.assertIsNone(client.view)
+        self.assertEqual(client.gaps, 1)
+        self.assertEqual(client.view, quantize(engine.snapshot()))
+
+    def test_extreme_values_are_clamped(self):
+        """Test that a huge field, a very fast ball and a high score still encode"""
+        engine = PongularityEngine(config=GameConfig(width=20000, height=20000, max_ball_speed=10 ** 6,
+                                                     max_score=1000))
+        engine.reset_game()
+        feed = SpectatorFeed()
+        client = SpectatorClient()
+        feed.subscribe("viewer", client.receive)
+        feed.publish(engine.snapshot())
+        engine.ball.x, engine.ball.dx = engine.WIDTH - 1, engine.MAX_BALL_SPEED
+        engine.score["left"] = 999
+        engine.update()
+        feed.publish(engine.snapshot())
+        self.assertEqual(client.view[:2], (2 ** 15 - 1, 2 ** 15 - 1))
+        self.assertEqual(client.view[4], 255)
+        engine.ball.x = -engine.MAX_BALL_SPEED
+        feed.publish(engine.snapshot())
+        self.assertEqual(client.view[0], -2 ** 15)
+
+    def test_malformed_frames_are_ignored(self):
+        """Test that empty, truncated and unknown frames leave the view unchanged"""
+        feed = SpectatorFeed()
+        client = SpectatorClient()
+        frames = []
+        feed.subscribe("viewer", frames.append)
+        play(feed, 10)
+        for frame in frames:
+            client.receive(frame)
+        view = client.view
+        for data in (b"", bytes((1,)), bytes((2,)), frames[0][:-1], frames[-1] + b"\x00", bytes((9, 0, 0))):
+            self.assertFalse(client.receive(data))
+        self.assertEqual(client.view, view)
+
+class TestLocalhost(unittest.TestCase):
+
+    async def watch_match(self, transport):
+        spectators = SpectatorServer()
+        host, port = await spectators.listen(transport=transport)
+        client = SpectatorClient()
+        watching = asyncio.get_running_loop().create_task(client.watch(host, port, transport))
+        while not spectators.feed.subscribers:
+            await asyncio.sleep(0.01)
+
+        server = MatchServer(tick_rate=240, linger=0.1, spectators=spectators)
+        host, port = await server.listen(transport=transport)
+        players = [MatchClient(make_controller("tracker", seed=side)) for side in range(2)]
+        for player in players:
+            await player.connect(host, port, transport)
+        await asyncio.gather(server.play(max_ticks=120), *(player.play() for player in players))
+        await asyncio.sleep(0.05)
+        watching.cancel()
+        server.close()
+        spectators.close()
+        for player in players:
+            player.close()
+        return server, client
+
+    def test_udp(self):
+        """Test that a viewer over UDP follows a networked match to its last tick"""
+        server, client = asyncio.run(self.watch_match("udp"))
+        self.assertEqual(client.view, quantize(server.engine.snapshot()))
+
+    def test_tcp(self):
+        """Test that a viewer over TCP follows a networked match to its last tick"""
+        server, client = asyncio.run(self.watch_match("tcp"))
+        self.assertEqual(client.view, quantize(server.engine.snapshot()))
+
+    def test_silent_viewers_expire(self):
+        """Test that viewers that stop sending WATCH are dropped"""
+        now = [0.0]
+        spectators = SpectatorServer(timeout=5.0, clock=lambda: now[0])
+        spectators.add_peer("viewer", lambda data: None)
+        spectators.receive(bytes((3,)), "viewer")
+        self.assertEqual(len(spectators.feed.subscribers), 1)
+        now[0] = 6.0
+        spectators.publish(PongularityEngine().snapshot())
+        self.assertEqual(spectators.feed.subscribers, {})
+        self.assertNotIn("viewer", spectators.peers)
+
+if __name__ == '__main__':
+    unittest.main()
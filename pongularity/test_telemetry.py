@@ -0,0 +1,124 @@
+import unittest
+import csv
+import os
+import sqlite3
+import tempfile
+from unittest.mock import patch
+from .controllers import make_controller
+from .config import PRESETS
+from .engine import GameOver, PaddleHit, Point, PongularityEngine, Serve, WallBounce
+from .telemetry import CSV_FIELDS, Telemetry
+
+def play(engine, ticks=100000):
+    """Play a CPU match on engine to the end and return it."""
+    left, right = make_controller("tracker", seed=0), make_controller("predictor", seed=1)
+    engine.reset_game()
+    for _ in range(ticks):
+        if engine.game_state != "playing":
+            break
+        engine.left_paddle.dy = left.control(engine, "left")
+        engine.right_paddle.dy = right.control(engine, "right")
+        engine.update()
+    return engine
+
+class TestEngineEvents(unittest.TestCase):
+
+    def test_events_follow_the_match(self):
+        """Test that points, paddle hits and the result match what the engine did"""
+        for swept in (False, True):
+            engine = PongularityEngine(swept=swept, config=PRESETS["fast"].replace(max_score=3))
+            events = []
+            engine.on_event = events.append
+            play(engine)
+            points = [event for event in events if type(event) is Point]
+            self.assertEqual(len(points), engine.score["left"] + engine.score["right"])
+            self.assertEqual((points[-1].left_score, points[-1].right_score),
+                             (engine.score["left"], engine.score["right"]))
+            self.assertIsInstance(events[-1], GameOver)
+            winner = "left" if engine.score["left"] >= engine.MAX_SCORE else "right"
+            self.assertEqual(events[-1].winner, winner)
+            hits = [event for event in events if type(event) is PaddleHit]
+            self.assertTrue(hits)
+            self.assertTrue(all(-1 <= hit.offset <= 1 for hit in hits))
+            self.assertTrue(any(type(event) is WallBounce for event in events))
+            self.assertIsInstance(events[0], Serve)
+            self.assertAlmostEqual(events[0].speed, engine.BALL_SPEED * 2 ** 0.5 * engine.TICK_RATE)
+
+    def test_no_hook_no_change(self):
+        """Test that a hook only observes and does not change the match"""
+        quiet = play(PongularityEngine())
+        observed = PongularityEngine()
+        observed.on_event = lambda event: None
+        self.assertEqual(play(observed).snapshot(), quiet.snapshot())
+
+class TestTelemetry(unittest.TestCase):
+
+    def play_logged(self, path, matches=2):
+        telemetry = Telemetry(path, flush_interval=0.01)
+        engines = []
+        for match in range(matches):
+            engine = PongularityEngine(config=PRESETS["fast"].replace(max_score=2))
+            telemetry.attach(engine, match)
+            engines.append(play(engine))
+        return telemetry.close(), engines
+
+    def test_aggregates(self):
+        """Test that the summary counts every point, hit and result"""
+        summary, engines = self.play_logged(None)
+        self.assertEqual(summary["matches"], 2)
+        self.assertEqual(summary["dropped"], 0)
+        self.assertEqual(summary["written"], summary["events"])
+        self.assertEqual(sum(summary["wins"].values()), 2)
+        for side in ("left", "right"):
+            self.assertEqual(summary["points"][side], sum(engine.score[side] for engine in engines))
+        points = sum(summary["points"].values())
+        self.assertEqual(summary["rally_length"]["count"], points)
+        self.assertEqual(summary["time_to_point"]["count"], points)
+        self.assertEqual(sum(summary["hit_offsets"]), summary["hit_speed"]["count"])
+        self.assertGreater(summary["time_to_point"]["min"], 0)
+
+    def test_csv_and_sqlite(self):
+        """Test that every event is written as a row to CSV and SQLite"""
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "events.csv")
+            summary, _ = self.play_logged(csv_path)
+            with open(csv_path, newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(tuple(rows[0]), CSV_FIELDS)
+            self.assertEqual(len(rows), summary["events"])
+            self.assertEqual(sum(row["event"] == "GameOver" for row in rows), 2)
+
+            db_path = os.path.join(directory, "events.db")
+            summary, _ = self.play_logged(db_path)
+            connection = sqlite3.connect(db_path)
+            total = sum(connection.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+                        for name in ("Serve", "PaddleHit", "WallBounce", "Point", "GameOver"))
+            winners = connection.execute("SELECT match, winner FROM GameOver ORDER BY match").fetchall()
+            connection.close()
+            self.assertEqual(total, summary["events"])
+            self.assertEqual([match for match, _ in winners], [0, 1])
+
+    def test_full_queue_drops(self):
+        """Test that events past capacity are counted as dropped instead of waiting"""
+        telemetry = Telemetry(capacity=10, flush_interval=60)
+        on_event = telemetry.attach(PongularityEngine())
+        for tick in range(25):
+            on_event(WallBounce(tick, "top", 100.0))
+        summary = telemetry.close()
+        self.assertEqual((summary["written"], summary["dropped"]), (10, 15))
+
+    def test_failed_writes_are_not_counted(self):
+        """Test that events the writer failed to take are aggregated but not counted as written"""
+        with tempfile.TemporaryDirectory() as directory:
+            telemetry = Telemetry(os.path.join(directory, "events.csv"), flush_interval=60)
+            with patch.object(telemetry._writer, "write", side_effect=OSError("disk full")):
+                on_event = telemetry.attach(PongularityEngine())
+                for tick in range(25):
+                    on_event(WallBounce(tick, "top", 100.0))
+                with self.assertRaises(OSError):
+                    telemetry.close()
+        summary = telemetry.summary()
+        self.assertEqual((summary["events"], summary["written"]), (25, 0))
+
+if __name__ == '__main__':
+    unittest.main()
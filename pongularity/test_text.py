@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import MagicMock
+import pygame
+from .text import TextCache, DigitGlyphs
+
+class TestTextCache(unittest.TestCase):
+
+    def setUp(self):
+        self.font = MagicMock()
+        self.font.render.side_effect = lambda text, antialias, color: pygame.Surface((10 * len(text), 20))
+        self.cache = TextCache(max_size=2)
+
+    def test_hit_does_not_rasterize(self):
+        """Test that a cached string is rendered by the font only once"""
+        first = self.cache.render(self.font, "PONG", (255, 255, 255))
+        second = self.cache.render(self.font, "PONG", (255, 255, 255))
+        self.assertIs(first, second)
+        self.assertEqual(self.font.render.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_includes_color_and_font(self):
+        """Test that color and font are part of the cache key"""
+        self.cache.render(self.font, "PONG", (255, 255, 255))
+        self.cache.render(self.font, "PONG", (0, 0, 0))
+        self.cache.render(MagicMock(), "PONG", (0, 0, 0))
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used surface is evicted first"""
+        white = (255, 255, 255)
+        self.cache.render(self.font, "a", white)
+        self.cache.render(self.font, "b", white)
+        self.cache.render(self.font, "a", white)
+        self.cache.render(self.font, "c", white)
+        self.assertEqual(len(self.cache), 2)
+
+        self.cache.render(self.font, "a", white)
+        self.assertEqual(self.font.render.call_count, 3)
+        self.cache.render(self.font, "b", white)
+        self.assertEqual(self.font.render.call_count, 4)
+
+    def test_invalid_size(self):
+        """Test that the cache must hold at least one surface"""
+        with self.assertRaises(ValueError):
+            TextCache(max_size=0)
+
+class TestDigitGlyphs(unittest.TestCase):
+
+    def setUp(self):
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 32)
+        self.glyphs = DigitGlyphs(TextCache(), self.font, (255, 255, 255))
+
+    def test_draw_number(self):
+        """Test that numbers are drawn from glyphs and report their area"""
+        surface = pygame.Surface((200, 100))
+        rect = self.glyphs.draw(surface, 10, (20, 30))
+        self.assertEqual(rect.topleft, (20, 30))
+        self.assertEqual(rect.width, self.glyphs.width(10))
+        self.assertEqual(rect.width, self.glyphs.glyphs["1"].get_width() + self.glyphs.glyphs["0"].get_width())
+        self.assertNotEqual(pygame.transform.average_color(surface, rect)[:3], (0, 0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
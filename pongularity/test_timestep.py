@@ -0,0 +1,44 @@
+import unittest
+from .timestep import FixedTimestep, NANOSECONDS
+
+class TestFixedTimestep(unittest.TestCase):
+
+    def test_whole_ticks(self):
+        """Test that elapsed time is converted into whole ticks"""
+        timestep = FixedTimestep(60)
+        self.assertEqual(timestep.advance(NANOSECONDS // 120), 0)
+        self.assertAlmostEqual(timestep.alpha, 0.5)
+        self.assertEqual(timestep.advance(NANOSECONDS // 120), 0)
+        self.assertEqual(timestep.advance(1), 1)
+
+    def test_no_drift(self):
+        """Test that one second of uneven frames yields exactly tick_rate ticks"""
+        timestep = FixedTimestep(60)
+        frames = [7_000_001, 16_666_666, 3_333_334, 22_999_999] * 250
+        remainder = NANOSECONDS * 5 - sum(frames)
+        total = sum(timestep.advance(frame) for frame in frames + [remainder])
+        self.assertEqual(total, 300)
+        self.assertEqual(timestep.alpha, 0)
+
+    def test_frame_rate_does_not_change_tick_count(self):
+        """Test that slow and fast displays simulate the same number of ticks"""
+        slow = FixedTimestep(60)
+        fast = FixedTimestep(60)
+        slow_ticks = sum(slow.advance(NANOSECONDS // 20) for _ in range(20))
+        fast_ticks = sum(fast.advance(NANOSECONDS // 200) for _ in range(200))
+        self.assertEqual(slow_ticks, fast_ticks)
+        self.assertEqual(slow_ticks, 60)
+
+    def test_long_stall_is_clamped(self):
+        """Test that a long stall does not trigger an unbounded catch-up"""
+        timestep = FixedTimestep(60, max_ticks_per_frame=4)
+        self.assertEqual(timestep.advance(NANOSECONDS), 4)
+        self.assertEqual(timestep.dropped_ticks, 56)
+
+    def test_invalid_tick_rate(self):
+        """Test that the tick rate must be positive"""
+        with self.assertRaises(ValueError):
+            FixedTimestep(0)
+
+if __name__ == '__main__':
+    unittest.main()
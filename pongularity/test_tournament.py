@@ -0,0 +1,66 @@
+import unittest
+from .tournament import (play_match, round_robin, run_tournament, match_seed,
+                         resolve_policy, standings, tracker_policy)
+
+class TestTournament(unittest.TestCase):
+
+    def test_round_robin_pairings(self):
+        """Test that every policy plays every other on both sides"""
+        pairings = round_robin(["a", "b", "c"], rounds=2)
+        self.assertEqual(len(pairings), 12)
+        self.assertIn(("a", "b"), pairings)
+        self.assertIn(("b", "a"), pairings)
+        self.assertNotIn(("a", "a"), pairings)
+        # The same policy entered twice plays itself as two entrants
+        self.assertEqual(round_robin(["tracker", "tracker"]), [("tracker", "tracker")] * 2)
+
+    def test_unknown_policy(self):
+        """Test that unknown policy names are rejected"""
+        with self.assertRaises(ValueError):
+            resolve_policy("nope")
+        self.assertIs(resolve_policy(tracker_policy), tracker_policy)
+
+    def test_match_seed_is_stable(self):
+        """Test that match seeds depend only on tournament seed and index"""
+        self.assertEqual(match_seed(7, 3), match_seed(7, 3))
+        self.assertNotEqual(match_seed(7, 3), match_seed(7, 4))
+        self.assertNotEqual(match_seed(7, 3), match_seed(8, 3))
+
+    def test_play_match_result(self):
+        """Test that a match reports score, frames and rallies"""
+        result = play_match("tracker", "idle", seed=1)
+        self.assertEqual(result["winner"], "left")
+        self.assertEqual(result["score"]["left"], 10)
+        self.assertEqual(len(result["rallies"]), result["score"]["left"] + result["score"]["right"])
+        self.assertTrue(result["frames"] > 0)
+
+    def test_max_ticks(self):
+        """Test that matches are cut off after max_ticks"""
+        result = play_match("idle", "idle", seed=1, max_ticks=10)
+        self.assertEqual(result["frames"], 10)
+        self.assertIsNone(result["winner"])
+
+    def test_results_independent_of_worker_count(self):
+        """Test that a tournament gives the same results in-process and sharded"""
+        policies = ["tracker", "random"]
+        serial = sorted(run_tournament(policies, rounds=2, seed=5, workers=1, max_ticks=3000),
+                        key=lambda r: r["match"])
+        sharded = sorted(run_tournament(policies, rounds=2, seed=5, workers=2, max_ticks=3000),
+                         key=lambda r: r["match"])
+        self.assertEqual(serial, sharded)
+        self.assertEqual(len(serial), 4)
+
+    def test_standings(self):
+        """Test that standings tally wins per policy"""
+        results = [
+            {"left": "a", "right": "b", "winner": "left"},
+            {"left": "b", "right": "a", "winner": "left"},
+            {"left": "a", "right": "b", "winner": None},
+        ]
+        self.assertEqual(standings(results), {
+            "a": {"played": 3, "won": 1},
+            "b": {"played": 3, "won": 1},
+        })
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from .engine import PongularityEngine
+from .tournament import play_match
+from .trajectory import EventSimulator, approach, fold, predict
+
+class TestTrajectory(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = PongularityEngine(swept=True)
+        self.engine.reset_game()
+
+    def test_fold(self):
+        """Test that positions past either wall reflect back between them"""
+        self.assertEqual(fold(50, 10, 100), (50, 0))
+        self.assertEqual(fold(130, 10, 100), (70, 1))
+        self.assertEqual(fold(-20, 10, 100), (40, 1))
+        self.assertEqual(fold(230, 10, 100), (50, 2))
+
+    def test_approach(self):
+        """Test that paddles stop on their target"""
+        self.assertEqual(approach(100, 130, 6, 3), 118)
+        self.assertEqual(approach(100, 130, 6, 10), 130)
+        self.assertEqual(approach(100, 40, 6, 20), 40)
+
+    def test_predict_matches_simulation(self):
+        """Test that the predicted arrival agrees with stepping the engine"""
+        engine = self.engine
+        engine.ball.dx = -engine.MAX_BALL_SPEED * 0.7
+        engine.ball.dy = engine.MAX_BALL_SPEED
+        intercept = predict(engine, "left")
+        self.assertIsNotNone(intercept)
+
+        # Keep the paddle out of the way and watch the ball cross its face
+        engine.left_paddle.y = engine.GRID
+        engine.ball.y = engine.HEIGHT / 2
+        plane = engine.left_paddle.x + engine.left_paddle.width
+        ticks = 0
+        while engine.ball.x + engine.ball.dx > plane:
+            engine.update()
+            ticks += 1
+        remainder = (plane - engine.ball.x) / engine.ball.dx
+        self.assertAlmostEqual(intercept.ticks, ticks + remainder)
+        self.assertAlmostEqual(intercept.y, engine.ball.y + engine.ball.dy * remainder)
+
+    def test_predict_assumes_return(self):
+        """Test that a ball heading away is predicted after the other paddle returns it"""
+        engine = self.engine
+        engine.ball.dx = engine.BALL_SPEED
+        engine.ball.dy = 0.0
+        engine.ball.y = engine.right_paddle.y + 10
+        intercept = predict(engine, "left")
+        outbound = (engine.right_paddle.x - engine.ball.width - engine.ball.x) / engine.BALL_SPEED
+        inbound = (engine.right_paddle.x - engine.ball.width - intercept.x) / (engine.BALL_SPEED + engine.BALL_ACCELERATION)
+        self.assertAlmostEqual(intercept.ticks, outbound + inbound)
+        # A flat ball picks up a little upward speed from the hit, like in the engine
+        self.assertAlmostEqual(intercept.y, engine.ball.y - engine.BALL_ACCELERATION * inbound)
+
+    def test_predict_none_while_serving(self):
+        """Test that there is no prediction while the ball waits to be served"""
+        self.engine.ball.resetting = True
+        self.assertIsNone(predict(self.engine, "left"))
+
+    def test_event_simulation_matches_stepping(self):
+        """Test that skipping between events gives the same match as stepping every tick"""
+        for left, right in (("sloppy", "sloppy"), ("intercept", "sloppy"), ("hold", "sloppy")):
+            skipped = EventSimulator(left, right, seed=3)
+            stepped = EventSimulator(left, right, seed=3)
+            skipped.run(20000)
+            stepped.run(20000, skip=False)
+            self.assertEqual(skipped.engine.score, stepped.engine.score)
+            self.assertEqual(skipped.engine.tick, stepped.engine.tick)
+            self.assertEqual(skipped.events, stepped.events)
+            self.assertAlmostEqual(skipped.engine.ball.x, stepped.engine.ball.x)
+            self.assertAlmostEqual(skipped.engine.ball.y, stepped.engine.ball.y)
+            self.assertLess(skipped.steps * 10, stepped.steps)
+
+    def test_event_simulation_runs_to_game_over(self):
+        """Test that a perfect interceptor wins every point"""
+        simulator = EventSimulator("intercept", "sloppy", seed=1)
+        simulator.run(100000)
+        self.assertEqual(simulator.engine.game_state, "game_over")
+        self.assertEqual(simulator.engine.score, {"left": 10, "right": 0})
+
+    def test_intercept_policy(self):
+        """Test that the predicting tournament policy beats the tracker"""
+        result = play_match("intercept", "tracker", seed=1)
+        self.assertEqual(result["winner"], "left")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Caches that keep TrueType rasterization out of the frame loop.
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces keyed by (font, text, color)."""
+
+    def __init__(self, max_size=256):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        """Return the surface for text, rasterizing it only on a cache miss."""
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop every cached surface."""
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+class DigitGlyphs:
+    """Pre-rendered 0-9 glyphs for drawing numbers without touching the font."""
+
+    def __init__(self, text_cache, font, color):
+        self.glyphs = {digit: text_cache.render(font, digit, color) for digit in "0123456789"}
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def width(self, value):
+        """Width in pixels of value when drawn with these glyphs."""
+        return sum(self.glyphs[digit].get_width() for digit in str(value))
+
+    def draw(self, surface, value, position):
+        """Blit a non-negative integer at position and return the covered rectangle."""
+        x, y = position
+        for digit in str(value):
+            glyph = self.glyphs[digit]
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return pygame.Rect(position[0], y, x - position[0], self.height)
@@ -0,0 +1,36 @@
+"""
+Fixed-timestep accumulator that decouples physics ticks from rendered frames.
+"""
+
+NANOSECONDS = 1_000_000_000
+
+
+class FixedTimestep:
+    """Turn variable frame times into a whole number of fixed physics ticks.
+
+    Time is accumulated in integer units of nanoseconds times the tick rate,
+    so no rounding error builds up however long the game runs.
+    """
+
+    def __init__(self, tick_rate, max_ticks_per_frame=8):
+        if tick_rate <= 0:
+            raise ValueError("tick_rate must be positive")
+        self.tick_rate = tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.accumulator = 0
+        self.dropped_ticks = 0
+
+    def advance(self, elapsed_ns):
+        """Add elapsed wall time and return how many ticks to simulate now."""
+        self.accumulator += elapsed_ns * self.tick_rate
+        ticks, self.accumulator = divmod(self.accumulator, NANOSECONDS)
+        if ticks > self.max_ticks_per_frame:
+            # Fall behind gracefully instead of spiralling after a long stall
+            self.dropped_ticks += ticks - self.max_ticks_per_frame
+            ticks = self.max_ticks_per_frame
+        return ticks
+
+    @property
+    def alpha(self):
+        """Fraction of the next tick already elapsed, for render interpolation."""
+        return self.accumulator / NANOSECONDS
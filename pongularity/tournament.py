@@ -0,0 +1,198 @@
+"""
+Round-robin tournaments between paddle policies, sharded over a process pool.
+
+Matches run headless on PongularityEngine with no frame cap. Each match gets
+its own seed derived from the tournament seed and the match index, so the
+results do not depend on how many workers ran them or in which order they
+finished.
+"""
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .engine import PongularityEngine
+from .trajectory import predict
+
+# Ten minutes of game time at 60 ticks per second
+DEFAULT_MAX_TICKS = 60 * 60 * 10
+
+
+def idle_policy(engine, side, rng):
+    """Never move."""
+    return 0
+
+
+def random_policy(engine, side, rng):
+    """Move up, down or not at all, uniformly at random."""
+    return rng.choice((-1, 0, 1)) * engine.PADDLE_SPEED
+
+
+def tracker_policy(engine, side, rng):
+    """Follow the ball's center, reacting on most but not all ticks."""
+    if rng.random() < 0.25:
+        return 0
+    paddle = engine.left_paddle if side == "left" else engine.right_paddle
+    target = engine.ball.y + engine.ball.height / 2
+    center = paddle.y + paddle.height / 2
+    if target < center - engine.PADDLE_SPEED:
+        return -engine.PADDLE_SPEED
+    if target > center + engine.PADDLE_SPEED:
+        return engine.PADDLE_SPEED
+    return 0
+
+
+def intercept_policy(engine, side, rng):
+    """Head for where the ball will reach the paddle, predicted in closed form."""
+    intercept = predict(engine, side)
+    if intercept is None:
+        return 0
+    paddle = engine.left_paddle if side == "left" else engine.right_paddle
+    target = intercept.y + engine.ball.height / 2 - paddle.height / 2
+    return max(-engine.PADDLE_SPEED, min(engine.PADDLE_SPEED, target - paddle.y))
+
+
+POLICIES = {
+    "idle": idle_policy,
+    "random": random_policy,
+    "tracker": tracker_policy,
+    "intercept": intercept_policy,
+}
+
+
+def resolve_policy(policy):
+    """Return the policy function for a registered name or a callable."""
+    if callable(policy):
+        return policy
+    try:
+        return POLICIES[policy]
+    except KeyError:
+        raise ValueError(f"Unknown policy {policy!r}, expected one of {sorted(POLICIES)}") from None
+
+
+def policy_name(policy):
+    """Return a printable name for a policy."""
+    return policy if isinstance(policy, str) else policy.__name__
+
+
+def match_seed(seed, index):
+    """Derive the seed of match number index from the tournament seed."""
+    return random.Random(f"{seed}:{index}").getrandbits(64)
+
+
+def play_match(left, right, seed, max_ticks=DEFAULT_MAX_TICKS, index=0):
+    """Play one headless match as fast as possible and return its result."""
+    rng = random.Random(seed)
+    left_policy = resolve_policy(left)
+    right_policy = resolve_policy(right)
+
+    engine = PongularityEngine()
+    engine.reset_game()
+
+    rallies = []
+    hits = 0
+    points = 0
+    ball = engine.ball
+    frames = 0
+    while engine.game_state == "playing" and frames < max_ticks:
+        engine.left_paddle.dy = left_policy(engine, "left", rng)
+        engine.right_paddle.dy = right_policy(engine, "right", rng)
+
+        direction = ball.dx > 0
+        engine.update()
+        frames += 1
+
+        # Only paddle hits flip the horizontal direction
+        if (ball.dx > 0) != direction:
+            hits += 1
+        scored = engine.score["left"] + engine.score["right"]
+        if scored != points:
+            points = scored
+            rallies.append(hits)
+            hits = 0
+
+    if engine.game_state == "game_over":
+        winner = "left" if engine.score["left"] >= engine.MAX_SCORE else "right"
+    else:
+        winner = None
+
+    return {
+        "match": index,
+        "left": policy_name(left),
+        "right": policy_name(right),
+        "seed": seed,
+        "score": dict(engine.score),
+        "winner": winner,
+        "frames": frames,
+        "rallies": rallies,
+    }
+
+
+def round_robin(policies, rounds=1):
+    """List (left, right) pairings where every policy meets every other on both sides."""
+    pairings = []
+    for _ in range(rounds):
+        for i, left in enumerate(policies):
+            for j, right in enumerate(policies):
+                if i != j:
+                    pairings.append((left, right))
+    return pairings
+
+
+def run_tournament(policies, rounds=1, seed=0, workers=None, max_ticks=DEFAULT_MAX_TICKS):
+    """Play a round robin and yield each match result as soon as it finishes."""
+    pairings = round_robin(policies, rounds)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        for index, (left, right) in enumerate(pairings):
+            yield play_match(left, right, match_seed(seed, index), max_ticks, index)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(play_match, left, right, match_seed(seed, index), max_ticks, index)
+            for index, (left, right) in enumerate(pairings)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def standings(results):
+    """Tally wins per policy name from a sequence of match results."""
+    table = {}
+    for result in results:
+        for side in ("left", "right"):
+            table.setdefault(result[side], {"played": 0, "won": 0})["played"] += 1
+        if result["winner"] is not None:
+            table[result[result["winner"]]]["won"] += 1
+    return table
+
+
+def main(argv=None):
+    """Command line entry point: stream match results as JSON lines."""
+    parser = argparse.ArgumentParser(description="Run a Pongularity round-robin tournament.")
+    parser.add_argument("policies", nargs="*", default=sorted(POLICIES),
+                        help="registered policy names (default: all)")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS)
+    args = parser.parse_args(argv)
+
+    for policy in args.policies:
+        resolve_policy(policy)
+
+    results = []
+    for result in run_tournament(args.policies, args.rounds, args.seed, args.workers, args.max_ticks):
+        print(json.dumps(result), flush=True)
+        results.append(result)
+
+    for name, row in sorted(standings(results).items()):
+        print(f"{name:>10}: {row['won']}/{row['played']} won")
+
+
+if __name__ == "__main__":
+    main()
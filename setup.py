@@ -8,6 +8,9 @@ setup(
     install_requires=[
         "pygame>=2.5.2",
     ],
+    extras_require={
+        "batch": ["numpy>=1.24"],
+    },
     entry_points={
         "console_scripts": [
             "pongularity=pongularity.__main__:main",